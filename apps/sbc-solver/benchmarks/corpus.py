@@ -0,0 +1,111 @@
+"""
+SBC corpus for benchmarks
+Requirement sets typical of what users solve: daily upgrades, league and
+nation challenges, chemistry-heavy and diversity-heavy squads
+"""
+
+from typing import Dict
+from src.solver.models import (
+    ChemistryConstraint,
+    ClubConstraint,
+    CountryConstraint,
+    DiversityConstraint,
+    LeagueConstraint,
+    QualityConstraint,
+    RarityConstraint,
+    RatingConstraint,
+    SBCRequirementSet,
+)
+from .generator import POSITION_IDS
+
+# 4-4-2: GK, LB, CB, CB, RB, LM, CM, CM, RM, ST, ST
+FORMATION_442 = [
+    POSITION_IDS[p]
+    for p in ("GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "RM", "ST", "ST")
+]
+
+# 4-3-3: GK, LB, CB, CB, RB, CDM, CM, CM, LW, ST, RW
+FORMATION_433 = [
+    POSITION_IDS[p]
+    for p in ("GK", "LB", "CB", "CB", "RB", "CDM", "CM", "CM", "LW", "ST", "RW")
+]
+
+# Generator settings of cases that need a differently shaped club
+CLUB_SHAPES: Dict[str, dict] = {
+    # Most cards are extra copies of popular players (duplicate merging)
+    "duplicate_heavy": {"duplicate_rate": 0.7},
+}
+
+CORPUS: Dict[str, SBCRequirementSet] = {
+    # Dailies: cheap fodder squads without positions
+    "daily_bronze_upgrade": SBCRequirementSet(
+        squad_size=11,
+        quality=[QualityConstraint(type="min", count=11, quality="bronze")],
+    ),
+    "daily_silver_upgrade": SBCRequirementSet(
+        squad_size=11,
+        quality=[QualityConstraint(type="min", count=11, quality="silver")],
+        rarity=[RarityConstraint(type="min", count=2, rare=True)],
+    ),
+    "daily_gold_rating": SBCRequirementSet(
+        squad_size=11,
+        quality=[QualityConstraint(type="min", count=6, quality="gold")],
+        team_rating=RatingConstraint(type="min", value=74),
+    ),
+    # League and nation challenges
+    "league_nation": SBCRequirementSet(
+        squad_size=11,
+        required_positions=FORMATION_442,
+        leagues=[LeagueConstraint(type="min", count=3, league_ids=[1])],
+        countries=[CountryConstraint(type="min", count=2, country_ids=[1, 2])],
+        team_rating=RatingConstraint(type="min", value=70),
+    ),
+    "same_league_same_club": SBCRequirementSet(
+        squad_size=11,
+        required_positions=FORMATION_433,
+        leagues=[LeagueConstraint(type="min", count=5)],
+        clubs=[ClubConstraint(type="min", count=2)],
+        quality=[QualityConstraint(type="min", count=3, quality="gold")],
+    ),
+    # Chemistry-heavy
+    "chemistry_positions": SBCRequirementSet(
+        squad_size=11,
+        required_positions=FORMATION_442,
+        chemistry=ChemistryConstraint(type="min", value=24),
+        team_rating=RatingConstraint(type="min", value=70),
+    ),
+    "chemistry_high": SBCRequirementSet(
+        squad_size=11,
+        required_positions=FORMATION_433,
+        chemistry=ChemistryConstraint(type="min", value=30),
+        team_rating=RatingConstraint(type="min", value=72),
+        rarity=[RarityConstraint(type="min", count=3, rare=True)],
+    ),
+    # Club with many copies of the same players
+    "duplicate_heavy": SBCRequirementSet(
+        squad_size=11,
+        required_positions=FORMATION_433,
+        quality=[QualityConstraint(type="min", count=5, quality="gold")],
+        team_rating=RatingConstraint(type="min", value=72),
+    ),
+    # Diversity-heavy
+    "diversity_min": SBCRequirementSet(
+        squad_size=11,
+        diversity=[
+            DiversityConstraint(type="min", count=8, attribute="clubs"),
+            DiversityConstraint(type="min", count=4, attribute="leagues"),
+            DiversityConstraint(type="min", count=5, attribute="countries"),
+        ],
+        team_rating=RatingConstraint(type="min", value=72),
+    ),
+    "diversity_max_chemistry": SBCRequirementSet(
+        squad_size=11,
+        required_positions=FORMATION_442,
+        diversity=[
+            DiversityConstraint(type="max", count=4, attribute="clubs"),
+            DiversityConstraint(type="max", count=2, attribute="leagues"),
+        ],
+        chemistry=ChemistryConstraint(type="min", value=20),
+        team_rating=RatingConstraint(type="min", value=68),
+    ),
+}
@@ -0,0 +1,175 @@
+"""
+Synthetic club generator for benchmarks
+Builds reproducible player pools shaped like real clubs: a few leagues,
+clubs and nations dominate (Zipf-like skew), nationalities cluster around
+a league's home nation, and popular players are owned several times
+"""
+
+from typing import Dict, List
+import numpy as np
+from src.solver.models import SolverPlayer
+
+# Position IDs as in the database (GK: 1, LB: 2, CB: 3, ...)
+POSITION_IDS = {
+    "GK": 1,
+    "LB": 2,
+    "CB": 3,
+    "RB": 4,
+    "CDM": 5,
+    "CM": 6,
+    "CAM": 7,
+    "LM": 8,
+    "RM": 9,
+    "LW": 10,
+    "RW": 11,
+    "ST": 12,
+}
+
+# How often each position is a card's primary position
+POSITION_WEIGHTS = {
+    "GK": 0.08,
+    "LB": 0.08,
+    "CB": 0.17,
+    "RB": 0.08,
+    "CDM": 0.08,
+    "CM": 0.13,
+    "CAM": 0.07,
+    "LM": 0.05,
+    "RM": 0.05,
+    "LW": 0.05,
+    "RW": 0.05,
+    "ST": 0.11,
+}
+
+# Alternative positions a card of a primary position may also have
+ALTERNATE_POSITIONS = {
+    "GK": [],
+    "LB": ["LM", "CB"],
+    "CB": ["CDM", "LB", "RB"],
+    "RB": ["RM", "CB"],
+    "CDM": ["CM", "CB"],
+    "CM": ["CDM", "CAM"],
+    "CAM": ["CM", "ST"],
+    "LM": ["LW", "LB"],
+    "RM": ["RW", "RB"],
+    "LW": ["LM", "ST"],
+    "RW": ["RM", "ST"],
+    "ST": ["CAM", "LW", "RW"],
+}
+
+# Quality IDs as in the database
+QUALITY_IDS = {"bronze": 4, "silver": 3, "gold": 2, "special": 1}
+
+# Rarity IDs (1 = common, 2 = rare, 3+ = special cards)
+COMMON, RARE, SPECIAL = 1, 2, 3
+
+
+def _zipf_weights(count: int, skew: float) -> np.ndarray:
+    """Probabilities of count items, item i weighted 1 / (i + 1)^skew"""
+    weights = 1.0 / np.arange(1, count + 1) ** skew
+    return weights / weights.sum()
+
+
+def _quality(ovr: int, rarity: int) -> int:
+    if rarity >= SPECIAL:
+        return QUALITY_IDS["special"]
+    if ovr < 65:
+        return QUALITY_IDS["bronze"]
+    if ovr < 75:
+        return QUALITY_IDS["silver"]
+    return QUALITY_IDS["gold"]
+
+
+def generate_club(
+    size: int,
+    seed: int = 0,
+    num_leagues: int = 30,
+    clubs_per_league: int = 20,
+    num_countries: int = 100,
+    league_skew: float = 1.1,
+    club_skew: float = 0.8,
+    country_skew: float = 1.2,
+    home_nation_rate: float = 0.5,
+    duplicate_rate: float = 0.3,
+    special_rate: float = 0.05,
+    squad_rate: float = 0.02,
+) -> List[SolverPlayer]:
+    """
+    Generate a synthetic club
+
+    Args:
+        size: Number of cards
+        seed: Random seed (the same arguments always give the same club)
+        num_leagues: Leagues to draw from
+        clubs_per_league: Clubs in every league
+        num_countries: Nations to draw from
+        league_skew: Zipf exponent of league popularity (0 = uniform)
+        club_skew: Zipf exponent of club popularity within a league
+        country_skew: Zipf exponent of nation popularity for foreign players
+        home_nation_rate: Share of players from their league's home nation
+        duplicate_rate: Share of cards that are another copy of an owned player
+        special_rate: Share of players with a special (non-gold/silver/bronze) card
+        squad_rate: Share of cards in the active squad
+
+    Returns:
+        Solver players with ClubPlayer ids 1..size
+    """
+    rng = np.random.default_rng(seed)
+    league_weights = _zipf_weights(num_leagues, league_skew)
+    club_weights = _zipf_weights(clubs_per_league, club_skew)
+    country_weights = _zipf_weights(num_countries, country_skew)
+    # League i's home nation is drawn like any other nation
+    home_nation = rng.choice(num_countries, size=num_leagues, p=country_weights) + 1
+    position_names = list(POSITION_WEIGHTS)
+    position_weights = np.array(list(POSITION_WEIGHTS.values()))
+    position_weights /= position_weights.sum()
+
+    catalog: List[Dict] = []
+    players: List[SolverPlayer] = []
+    for card_id in range(1, size + 1):
+        if catalog and rng.random() < duplicate_rate:
+            # Popular players are owned more often: favour early catalog entries
+            base = catalog[int(len(catalog) * rng.random() ** 2)]
+        else:
+            league = int(rng.choice(num_leagues, p=league_weights)) + 1
+            club = (league - 1) * clubs_per_league + int(
+                rng.choice(clubs_per_league, p=club_weights)
+            ) + 1
+            if rng.random() < home_nation_rate:
+                country = int(home_nation[league - 1])
+            else:
+                country = int(rng.choice(num_countries, p=country_weights)) + 1
+
+            rarity = SPECIAL if rng.random() < special_rate else int(rng.choice([COMMON, RARE]))
+            ovr = int(np.clip(rng.normal(72 if rarity == SPECIAL else 66, 8), 45, 97))
+
+            primary = position_names[int(rng.choice(len(position_names), p=position_weights))]
+            alternates = ALTERNATE_POSITIONS[primary]
+            extra = int(rng.integers(0, min(2, len(alternates)) + 1))
+            positions = [primary] + [str(p) for p in rng.permutation(alternates)[:extra]]
+
+            base = {
+                "player_id": len(catalog) + 1,
+                "ovr": ovr,
+                "quality_id": _quality(ovr, rarity),
+                "rarity_id": rarity,
+                "country_id": country,
+                "club_id": club,
+                "league_id": league,
+                "positions": [POSITION_IDS[p] for p in positions],
+            }
+            catalog.append(base)
+
+        ratings = {f"rating{i}": base["ovr"] for i in range(1, 7)}
+        players.append(
+            SolverPlayer(
+                id=card_id,
+                display_name=f"Player {base['player_id']}",
+                full_name=f"Synthetic Player {base['player_id']}",
+                sbc=bool(rng.random() < 0.2),
+                squad=bool(rng.random() < squad_rate),
+                **ratings,
+                **base,
+            )
+        )
+    return players
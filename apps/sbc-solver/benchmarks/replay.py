@@ -0,0 +1,145 @@
+"""
+Replay captured solves
+Re-runs captured production requests against the current SBCSolver, in
+parallel, and reports latency and objective differences to the capture
+
+Usage (from apps/sbc-solver):
+    python -m benchmarks.replay captures/                 # every capture in a directory
+    python -m benchmarks.replay a.sbccap b.sbccap --jobs 4 --workers 2
+
+Captures are written by the solver service when SBC_SOLVER_CAPTURE_RATE is
+set. Latencies compare the captured worker time (table to response stages)
+with the replayed SBCSolver.solve, so queueing in production is excluded.
+Exits with status 1 if any replay lost a solution or found a worse one.
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from src.solver.capture import CAPTURE_SUFFIX, Capture
+from src.solver.instrumentation import NESTED_STAGES
+from src.solver.objective import selection_cost
+from src.solver.or_tools_solver import SBCSolver
+from src.solver.player_table import PlayerTable
+
+# Stages measured inside the worker (the rest are API-side)
+WORKER_STAGES = (
+    "table",
+    "feasibility",
+    "presolve",
+    "model_build",
+    "cpsat_presolve",
+    "search",
+    "response",
+)
+
+
+def _worker_time(outcome: dict) -> Optional[float]:
+    """Seconds the captured solve spent in the worker"""
+    stats = outcome.get("stats")
+    if not stats:
+        return None
+    return sum(
+        seconds
+        for name, seconds in stats["timings"].items()
+        if name in WORKER_STAGES and name not in NESTED_STAGES
+    )
+
+
+def replay(path: str, workers: int) -> dict:
+    """
+    Re-solve one capture (run in a worker process)
+
+    Returns:
+        Captured and replayed status, latency and objective
+    """
+    capture = Capture(path)
+    table = PlayerTable(capture.request.available_players)
+
+    start = time.perf_counter()
+    response = SBCSolver(num_search_workers=workers).solve(capture.request)
+    latency = time.perf_counter() - start
+
+    captured_ids = capture.outcome.get("selected_player_ids")
+    return {
+        "capture": os.path.basename(path),
+        "captured_status": capture.outcome["status"],
+        "status": response.status,
+        "captured_latency": _worker_time(capture.outcome),
+        "latency": latency,
+        "captured_objective": selection_cost(table, captured_ids) if captured_ids else None,
+        "objective": (
+            selection_cost(table, response.selected_player_ids)
+            if response.selected_player_ids
+            else None
+        ),
+    }
+
+
+def _capture_files(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*" + CAPTURE_SUFFIX))))
+        else:
+            files.append(path)
+    return files
+
+
+def _diff(old: Optional[float], new: Optional[float], fmt: str) -> str:
+    if old is None or new is None:
+        return "-"
+    return format(new - old, "+" + fmt)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("paths", nargs="+", help="Capture files or directories")
+    parser.add_argument("--jobs", type=int, default=2, help="Captures replayed at once")
+    parser.add_argument("--workers", type=int, default=8, help="CP-SAT search workers per solve")
+    args = parser.parse_args(argv)
+
+    files = _capture_files(args.paths)
+    if not files:
+        print("No captures found")
+        return 0
+
+    print(
+        f"{'capture':<36}{'status':<22}{'latency':>18}{'diff':>9}"
+        f"{'objective':>16}{'diff':>7}"
+    )
+    worse = False
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.jobs, mp_context=context) as pool:
+        futures = [pool.submit(replay, path, args.workers) for path in files]
+        for future in futures:
+            r = future.result()
+            lost = r["captured_objective"] is not None and r["objective"] is None
+            regressed = lost or (
+                r["objective"] is not None
+                and r["captured_objective"] is not None
+                and r["objective"] > r["captured_objective"]
+            )
+            worse = worse or regressed
+            old_latency = "-" if r["captured_latency"] is None else f"{r['captured_latency']:.2f}"
+            old_objective = "-" if r["captured_objective"] is None else r["captured_objective"]
+            new_objective = "-" if r["objective"] is None else r["objective"]
+            print(
+                f"{r['capture']:<36}"
+                f"{r['captured_status'] + ' -> ' + r['status']:<22}"
+                f"{old_latency + ' -> ' + format(r['latency'], '.2f'):>18}"
+                f"{_diff(r['captured_latency'], r['latency'], '.2f'):>9}"
+                f"{str(old_objective) + ' -> ' + str(new_objective):>16}"
+                f"{_diff(r['captured_objective'], r['objective'], 'd'):>7}"
+                + ("  WORSE" if regressed else "")
+            )
+    return 1 if worse else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+SBC solver benchmark
+Solves every corpus case against synthetic clubs of several sizes and
+compares the results with a stored baseline
+
+Usage (from apps/sbc-solver):
+    python -m benchmarks.run                       # compare with benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline       # record a new baseline
+    python -m benchmarks.run --sizes 200 2000 --cases chemistry_high
+
+Every run solves in a fresh process so peak RSS belongs to that run alone.
+The pool column shows cards in the request -> after merging duplicates ->
+in the model (after dominance reduction).
+CP-SAT's parallel search is not deterministic, so timings are compared with
+a tolerance; baselines are only meaningful on the machine that recorded them.
+Exits with status 1 if any run regressed.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from src.solver.models import SolveSBCRequest
+from src.solver.objective import selection_cost
+from src.solver.or_tools_solver import SBCSolver
+from src.solver.player_table import PlayerTable
+from .corpus import CLUB_SHAPES, CORPUS
+from .generator import QUALITY_IDS, generate_club
+
+DEFAULT_SIZES = [200, 2000, 20000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Timing differences below this many seconds are never reported as regressions
+TIME_NOISE = 0.05
+
+# Timed measurements compared with the baseline
+TIMED = ("build_time", "ttfs", "total_time")
+
+
+def run_case(case: str, size: int, seed: int, workers: int, time_limit: int) -> dict:
+    """
+    Solve one corpus case against a synthetic club (run in a fresh process)
+
+    Returns:
+        Status, build time, time to first solution, total solve time,
+        objective, peak RSS and pool sizes of the run
+    """
+    players = generate_club(size, seed=seed, **CLUB_SHAPES.get(case, {}))
+    request = SolveSBCRequest(
+        requirements=CORPUS[case],
+        available_players=players,
+        max_solve_time=time_limit,
+        no_improvement_time=time_limit,
+        quality_map=QUALITY_IDS,
+    )
+
+    start = time.perf_counter()
+    response = SBCSolver(num_search_workers=workers).solve(request)
+    total_time = time.perf_counter() - start
+
+    objective = None
+    if response.selected_player_ids:
+        objective = selection_cost(PlayerTable(players), response.selected_player_ids)
+
+    stats = response.stats
+    return {
+        "case": case,
+        "size": size,
+        "status": response.status,
+        "build_time": stats.timings.get("model_build") if stats else None,
+        "ttfs": stats.first_solution_time if stats else None,
+        "total_time": total_time,
+        "objective": objective,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "pool_size": len(players),
+        "collapsed_pool_size": stats.collapsed_pool_size if stats else None,
+        "reduced_pool_size": stats.reduced_pool_size if stats else None,
+        "num_variables": stats.num_variables if stats else None,
+    }
+
+
+def compare(result: dict, baseline: Optional[dict], tolerance: float) -> List[str]:
+    """
+    Regressions of a run against its baseline
+
+    Args:
+        result: Run result
+        baseline: Baseline result for the same case and size (None if missing)
+        tolerance: Allowed relative increase of timings and memory
+
+    Returns:
+        Description of every regression (empty if none)
+    """
+    if baseline is None:
+        return []
+
+    regressions = []
+    if baseline["status"] in ("OPTIMAL", "FEASIBLE") and result["status"] not in (
+        "OPTIMAL",
+        "FEASIBLE",
+    ):
+        regressions.append(f"status {baseline['status']} -> {result['status']}")
+    if baseline["objective"] is not None and result["objective"] is not None:
+        # Lower cost is better
+        if result["objective"] > baseline["objective"]:
+            regressions.append(f"objective {baseline['objective']} -> {result['objective']}")
+    for name in TIMED:
+        old, new = baseline.get(name), result.get(name)
+        if old is None or new is None:
+            continue
+        if new > old * (1 + tolerance) and new - old > TIME_NOISE:
+            regressions.append(f"{name} {old:.3f}s -> {new:.3f}s")
+    old_rss, new_rss = baseline.get("peak_rss_mb"), result.get("peak_rss_mb")
+    if old_rss and new_rss > old_rss * (1 + tolerance):
+        regressions.append(f"peak_rss {old_rss:.0f}MB -> {new_rss:.0f}MB")
+    return regressions
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def _format_pool(result: dict) -> str:
+    sizes = (result["pool_size"], result.get("collapsed_pool_size"), result["reduced_pool_size"])
+    return " -> ".join("-" if size is None else str(size) for size in sizes)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CORPUS), default=list(CORPUS))
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic club seed")
+    parser.add_argument("--workers", type=int, default=8, help="CP-SAT search workers")
+    parser.add_argument("--time-limit", type=int, default=30, help="Seconds per solve")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Write this run as the new baseline"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed relative slowdown"
+    )
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, dict] = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    results: Dict[str, dict] = {}
+    regressed = False
+    print(
+        f"{'case':<26}{'size':>7}  {'status':<10}{'build':>8}{'ttfs':>8}{'total':>8}"
+        f"{'objective':>11}{'rss MB':>8}  pool"
+    )
+    context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        for case in args.cases:
+            # One process per run so ru_maxrss is that run's peak
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(
+                    run_case, case, size, args.seed, args.workers, args.time_limit
+                ).result()
+            key = f"{case}@{size}"
+            results[key] = result
+            regressions = compare(result, baseline.get(key), args.tolerance)
+            regressed = regressed or bool(regressions)
+            print(
+                f"{case:<26}{size:>7}  {result['status']:<10}"
+                f"{_format_seconds(result['build_time']):>8}"
+                f"{_format_seconds(result['ttfs']):>8}"
+                f"{_format_seconds(result['total_time']):>8}"
+                f"{'-' if result['objective'] is None else result['objective']:>11}"
+                f"{result['peak_rss_mb']:>8.0f}"
+                f"  {_format_pool(result)}"
+                + (f"  REGRESSED: {'; '.join(regressions)}" if regressions else "")
+            )
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "settings": {
+                        "seed": args.seed,
+                        "workers": args.workers,
+                        "time_limit": args.time_limit,
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"Baseline written to {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline} - run with --save-baseline to record one")
+
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+ASGI middleware for the solver API
+"""
+
+import time
+from ..solver.metrics import solver_metrics
+
+
+class RequestTimingMiddleware:
+    """
+    Stamp every HTTP request with its arrival time
+
+    Handlers read request.state.received_at (time.perf_counter) to tell how
+    long receiving and validating the request body took before they ran.
+    Written as plain ASGI so streaming responses and disconnect detection
+    are untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["received_at"] = time.perf_counter()
+        await self.app(scope, receive, send)
+
+
+class RequestMetricsMiddleware:
+    """
+    Count HTTP requests by route handler, method and status code
+
+    The handler name (rather than the raw path) keeps the label set bounded
+    for routes with path parameters; requests that match no route are
+    counted as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router adds the matched endpoint to the (shared) scope
+            endpoint = scope.get("endpoint")
+            solver_metrics.http_requests.inc(
+                handler=getattr(endpoint, "__name__", "unmatched"),
+                method=scope["method"],
+                status=str(status),
+            )
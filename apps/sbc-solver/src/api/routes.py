@@ -2,12 +2,44 @@
 FastAPI routes for SBC solver
 """
 
-from fastapi import APIRouter, HTTPException
-from ..solver.models import SolveSBCRequest, SolveSBCResponse
-from ..solver.or_tools_solver import SBCSolver
+import asyncio
+import json
+import uuid
+from typing import Awaitable, Optional, Tuple, TypeVar, Union
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from ..solver.models import (
+    SolveSBCRequest,
+    SolveSBCResponse,
+    SolveSBCBatchRequest,
+    SolveSBCBatchResponse,
+    SolveProgress,
+    SolveJobInfo,
+    CreatePlayerPoolRequest,
+    PlayerPoolDelta,
+    PlayerPoolInfo,
+)
+from ..solver.executor import DuplicateJobError, SolverBusyError, solver_executor
+from ..solver.service import solve_service
+from ..solver.jobs import (
+    SolveJobConflictError,
+    SolveJobNotFoundError,
+    solve_job_manager,
+)
+from ..solver.player_table import PlayerTable
+from ..solver.player_pools import (
+    PlayerPoolNotFoundError,
+    PlayerPoolVersionError,
+    player_pool_store,
+)
 
 router = APIRouter()
 
+# Seconds between client disconnect checks while a solve is running
+DISCONNECT_POLL_INTERVAL = 0.1
+
+Request_T = TypeVar("Request_T", SolveSBCRequest, SolveSBCBatchRequest)
+
 
 @router.get("/health")
 async def health_check():
@@ -15,32 +47,343 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "sbc-solver",
-        "version": "0.1.0"
+        "version": "0.1.0",
+        "workers": solver_executor.stats(),
+    }
+
+
+@router.get("/stats")
+async def solver_stats():
+    """Worker pool utilization and CPU core allocation"""
+    return {
+        "workers": solver_executor.stats(),
+        "cores": solver_executor.scheduler.stats(),
+        "pools": player_pool_store.stats(),
+        "jobs": solve_job_manager.stats(),
+        **solve_service.stats(),
     }
 
 
+@router.post("/pools", response_model=PlayerPoolInfo)
+async def create_player_pool(request: CreatePlayerPoolRequest):
+    """
+    Upload a player pool once so later solves can reference it by ID
+
+    Args:
+        request: Full list of available players
+
+    Returns:
+        Pool ID, version and size
+    """
+    return player_pool_store.create(request.players)
+
+
+@router.get("/pools/{pool_id}", response_model=PlayerPoolInfo)
+async def get_player_pool(pool_id: str):
+    """Get the current version and size of a player pool"""
+    try:
+        return player_pool_store.get(pool_id).info()
+    except PlayerPoolNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.patch("/pools/{pool_id}", response_model=PlayerPoolInfo)
+async def update_player_pool(pool_id: str, delta: PlayerPoolDelta):
+    """
+    Apply add/update/remove changes to a player pool
+
+    Args:
+        pool_id: Pool to modify
+        delta: Cards to add, update or remove
+
+    Returns:
+        New pool version and size
+    """
+    try:
+        return player_pool_store.apply_delta(pool_id, delta)
+    except PlayerPoolNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PlayerPoolVersionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.delete("/pools/{pool_id}")
+async def delete_player_pool(pool_id: str):
+    """Remove a player pool"""
+    try:
+        player_pool_store.delete(pool_id)
+    except PlayerPoolNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"deleted": pool_id}
+
+
+def _prepare_request(request: Request_T) -> Tuple[Request_T, Optional[PlayerTable]]:
+    """
+    Assign a job ID if the client did not choose one, and fill in
+    available_players from an uploaded pool if pool_id is set
+
+    Returns:
+        The prepared request, and the pool's table (if any)
+    """
+    if request.job_id is None:
+        request = request.model_copy(update={"job_id": uuid.uuid4().hex})
+
+    if request.pool_id is None:
+        return request, None
+
+    if request.available_players:
+        raise HTTPException(
+            status_code=400,
+            detail="Specify either pool_id or available_players, not both",
+        )
+    try:
+        table = player_pool_store.get(request.pool_id).table()
+    except PlayerPoolNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return request.model_copy(update={"available_players": table.players}), table
+
+
 @router.post("/solve", response_model=SolveSBCResponse)
-async def solve_sbc(request: SolveSBCRequest):
+async def solve_sbc(request: SolveSBCRequest, http_request: Request):
     """
     Solve an SBC using constraint programming
 
+    The solve runs in a worker process so the event loop stays free for
+    other requests (including health checks) while CP-SAT is searching.
+    If the client disconnects, the solve is cancelled.
+
+    Players come either from `available_players` or from an uploaded pool
+    referenced by `pool_id`.
+
     Args:
         request: SBC solve request with requirements and players
 
     Returns:
         Solver response with solution or error status
     """
-    try:
-        # Create solver instance
-        solver = SBCSolver()
+    request, table = _prepare_request(request)
 
-        # Solve the SBC
-        response = solver.solve(request)
+    try:
+        # Answer from the cache or dispatch to the worker pool
+        response = await _cancel_on_disconnect(
+            http_request,
+            request.job_id,
+            solve_service.solve(request, table, received_at=_received_at(http_request)),
+        )
 
         return response
 
+    except SolverBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except DuplicateJobError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Solver error: {str(e)}"
         )
+
+
+@router.post("/solve/batch", response_model=SolveSBCBatchResponse)
+async def solve_sbc_batch(request: SolveSBCBatchRequest, http_request: Request):
+    """
+    Solve several SBCs jointly from one player pool
+
+    A single model assigns each card to at most one squad and minimizes the
+    total cost, so squads do not compete for the same cheap fodder the way
+    sequential solves do. Squads are returned in request order.
+
+    Args:
+        request: Requirement sets and players
+
+    Returns:
+        Batch response with one squad per requirement set
+    """
+    request, table = _prepare_request(request)
+
+    try:
+        return await _cancel_on_disconnect(
+            http_request, request.job_id, solve_service.solve_batch(request, table)
+        )
+    except SolverBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except DuplicateJobError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Solver error: {str(e)}")
+
+
+def _received_at(http_request: Request) -> Optional[float]:
+    """Arrival time stamped by RequestTimingMiddleware (None if it is not installed)"""
+    return getattr(http_request.state, "received_at", None)
+
+
+async def _cancel_on_disconnect(
+    http_request: Request,
+    job_id: str,
+    solve: Awaitable[Union[SolveSBCResponse, SolveSBCBatchResponse]],
+) -> Union[SolveSBCResponse, SolveSBCBatchResponse]:
+    """Await a solve, cancelling it if the client disconnects first"""
+    solve_task = asyncio.ensure_future(solve)
+    while not solve_task.done():
+        await asyncio.wait({solve_task}, timeout=DISCONNECT_POLL_INTERVAL)
+        if not solve_task.done() and await http_request.is_disconnected():
+            solve_service.cancel(job_id)
+            await solve_task
+    return solve_task.result()
+
+
+@router.post("/solve/stream")
+async def solve_sbc_stream(request: SolveSBCRequest, http_request: Request):
+    """
+    Solve an SBC, streaming progress as Server-Sent Events
+
+    Emits a `job` event with the job ID first, a `solution` event
+    (SolveProgress) for every improving solution while CP-SAT is searching,
+    then a single `result` event with the final SolveSBCResponse. Failures
+    are reported as an `error` event with a `status_code` and `detail`,
+    mirroring the /solve error responses. If the client disconnects, the
+    solve is cancelled.
+
+    Args:
+        request: SBC solve request with requirements and players
+
+    Returns:
+        text/event-stream response
+    """
+    request, table = _prepare_request(request)
+
+    events: "asyncio.Queue[SolveProgress]" = asyncio.Queue()
+    solve_task = asyncio.create_task(
+        solve_service.solve(
+            request,
+            table,
+            on_progress=events.put_nowait,
+            received_at=_received_at(http_request),
+        )
+    )
+
+    async def stream():
+        yield _sse("job", json.dumps({"job_id": request.job_id}))
+
+        try:
+            while True:
+                next_event = asyncio.create_task(events.get())
+                await asyncio.wait(
+                    {next_event, solve_task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not next_event.done():
+                    next_event.cancel()
+                    break
+                yield _sse("solution", next_event.result().model_dump_json())
+        finally:
+            # Runs early if the client disconnected and the stream was closed
+            if not solve_task.done():
+                solve_service.cancel(request.job_id)
+
+        # Progress is relayed before the solve returns, so nothing is left over
+        while not events.empty():
+            yield _sse("solution", events.get_nowait().model_dump_json())
+
+        try:
+            response = solve_task.result()
+        except SolverBusyError as e:
+            yield _sse("error", json.dumps({"status_code": 503, "detail": str(e)}))
+        except DuplicateJobError as e:
+            yield _sse("error", json.dumps({"status_code": 409, "detail": str(e)}))
+        except Exception as e:
+            yield _sse(
+                "error",
+                json.dumps({"status_code": 500, "detail": f"Solver error: {str(e)}"}),
+            )
+        else:
+            yield _sse("result", response.model_dump_json())
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/solve/{job_id}/cancel")
+async def cancel_solve(job_id: str):
+    """
+    Cancel a queued or running solve
+
+    A running search stops within about 100ms and its request returns the best
+    solution found so far, or status CANCELLED if there is none.
+
+    Args:
+        job_id: Job ID from the request, the `job` stream event or the response
+    """
+    if not solve_service.cancel(job_id):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} is not in progress")
+    return {"cancelled": job_id}
+
+
+@router.post("/jobs", response_model=SolveJobInfo, status_code=202)
+async def submit_solve_job(request: SolveSBCRequest, http_request: Request):
+    """
+    Submit a solve to run in the background
+
+    Poll GET /jobs/{job_id} for its status and fetch the response from
+    GET /jobs/{job_id}/result once it has finished. Interactive jobs are
+    dispatched before bulk ones; `deadline` bounds queue wait plus search time.
+
+    Args:
+        request: SBC solve request with requirements and players
+
+    Returns:
+        Job info including the job ID
+    """
+    request, table = _prepare_request(request)
+
+    try:
+        return solve_job_manager.submit(request, table, _received_at(http_request))
+    except SolverBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except SolveJobConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=SolveJobInfo)
+async def get_solve_job(job_id: str):
+    """Get a job's status, timings and best solution so far"""
+    try:
+        return solve_job_manager.get(job_id).info()
+    except SolveJobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/jobs/{job_id}/result", response_model=SolveSBCResponse)
+async def get_solve_job_result(job_id: str):
+    """
+    Get a finished job's solver response
+
+    Returns 409 while the job is still queued or running, and 500 if it failed.
+    """
+    try:
+        job = solve_job_manager.get(job_id)
+    except SolveJobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Solver error: {job.error}")
+    if job.response is None:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status}")
+    return job.response
+
+
+@router.delete("/jobs/{job_id}", response_model=SolveJobInfo)
+async def cancel_solve_job(job_id: str):
+    """Cancel a queued or running job"""
+    try:
+        return solve_job_manager.cancel(job_id)
+    except SolveJobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def _sse(event: str, data: str) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {data}\n\n"
@@ -2,15 +2,33 @@
 FastAPI application for SBC solver service
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
+from .api.middleware import RequestMetricsMiddleware, RequestTimingMiddleware
 from .api.routes import router
+from .solver.executor import solver_executor
+from .solver.log_config import configure_logging, shutdown_logging
+from .solver.metrics import CONTENT_TYPE, solver_metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start logging and the solver worker pool on startup and stop them on shutdown"""
+    configure_logging()
+    await solver_executor.start()
+    yield
+    solver_executor.shutdown()
+    shutdown_logging()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="SBC Solver API",
     description="Constraint-based solver for EA FC Squad Building Challenges",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -25,6 +43,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request arrival times for per-stage solve timings
+app.add_middleware(RequestTimingMiddleware)
+
+# Count requests for /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include routes with /api/v1 prefix
 app.include_router(router, prefix="/api/v1")
 
@@ -37,3 +61,9 @@ async def root():
         "version": "0.1.0",
         "status": "running"
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics (text exposition format)"""
+    return Response(solver_metrics.render(), headers={"Content-Type": CONTENT_TYPE})
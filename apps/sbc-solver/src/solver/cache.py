@@ -0,0 +1,192 @@
+"""
+Result cache for repeated solves
+Identical requests (same requirements, options and reduced pool) are answered
+from memory instead of re-running CP-SAT
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+from .models import SolveSBCRequest, SolveSBCResponse
+from .player_table import PlayerTable, ARRAY_COLUMNS
+
+# Request fields that describe the pool rather than the problem
+POOL_FIELDS = {"available_players", "pool_id"}
+
+# Request fields that identify the call rather than the problem
+CALL_FIELDS = {"job_id", "priority", "include_stats"}
+
+# Lists whose order is meaningful: one entry per squad slot, or requirements
+# that responses refer to by index (e.g. 'clubs[0]' in conflicting_requirements)
+ORDERED_FIELDS = {
+    "required_positions",
+    "leagues",
+    "countries",
+    "clubs",
+    "quality",
+    "rarity",
+    "diversity",
+}
+
+
+def request_fingerprint(request: SolveSBCRequest, table: PlayerTable) -> str:
+    """
+    Canonical hash of a solve request
+
+    Covers the requirements and solver options plus every solver-relevant
+    column of the (post-reduction) pool. Id lists and the pool itself are
+    sorted first, so their order does not change the hash; requirement lists
+    keep their order (see ORDERED_FIELDS).
+
+    Args:
+        request: Solve request
+        table: Player pool the solver will see
+
+    Returns:
+        Hex digest identifying the request
+    """
+    digest = hashlib.sha256()
+
+    options = request.model_dump(exclude=POOL_FIELDS | CALL_FIELDS)
+    digest.update(json.dumps(_canonical(options), sort_keys=True).encode())
+
+    order = np.argsort(table.id, kind="stable")
+    for name in ARRAY_COLUMNS:
+        column = np.ascontiguousarray(getattr(table, name)[order])
+        digest.update(name.encode())
+        digest.update(column.tobytes())
+
+    return digest.hexdigest()
+
+
+def requirements_fingerprint(request: SolveSBCRequest) -> str:
+    """
+    Canonical hash of a request's requirements, ignoring the pool and options
+
+    Identifies the SBC itself, so repeated solves of the same template can be
+    matched even when the club has changed in between.
+
+    Args:
+        request: Solve request
+
+    Returns:
+        Hex digest identifying the requirement set
+    """
+    shape = {
+        "requirements": request.requirements.model_dump(),
+        "quality_map": request.quality_map,
+        "rarity_map": request.rarity_map,
+    }
+    return hashlib.sha256(
+        json.dumps(_canonical(shape), sort_keys=True).encode()
+    ).hexdigest()
+
+
+def _canonical(value, ordered: bool = False):
+    """Recursively sort lists so semantically equal requests serialize identically"""
+    if isinstance(value, dict):
+        return {k: _canonical(v, k in ORDERED_FIELDS) for k, v in value.items()}
+    if isinstance(value, list) and ordered:
+        return [_canonical(v) for v in value]
+    if isinstance(value, list):
+        items = [_canonical(v) for v in value]
+        return sorted(items, key=lambda v: json.dumps(v, sort_keys=True))
+    return value
+
+
+class ResultCache:
+    """
+    LRU cache of solver responses with a size limit and TTL
+
+    Only definitive or successful outcomes are stored (OPTIMAL, FEASIBLE,
+    INFEASIBLE); timeouts and errors are always re-solved.
+    """
+
+    CACHEABLE_STATUSES = {"OPTIMAL", "FEASIBLE", "INFEASIBLE"}
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum number of cached responses (0 disables the cache)
+            ttl_seconds: Seconds a response stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, SolveSBCResponse]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """
+        Create cache configured from environment variables
+
+        SBC_SOLVER_CACHE_SIZE: maximum cached responses (default 256, 0 disables)
+        SBC_SOLVER_CACHE_TTL: seconds a cached response stays valid (default 600)
+        """
+        return cls(
+            max_entries=max(0, int(os.environ.get("SBC_SOLVER_CACHE_SIZE", "256"))),
+            ttl_seconds=float(os.environ.get("SBC_SOLVER_CACHE_TTL", "600")),
+        )
+
+    def get(self, key: str) -> Optional[SolveSBCResponse]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Request fingerprint
+
+        Returns:
+            Copy of the cached response, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1].model_copy(update={"cached": True})
+
+    def put(self, key: str, response: SolveSBCResponse) -> None:
+        """
+        Store a response if its status is cacheable
+
+        Args:
+            key: Request fingerprint
+            response: Solver response
+        """
+        if self.max_entries == 0 or response.status not in self.CACHEABLE_STATUSES:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response.model_copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
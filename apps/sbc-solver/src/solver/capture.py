@@ -0,0 +1,163 @@
+"""
+Request capture for offline profiling
+Writes a sample of production solves to compressed capture files holding the
+incoming request, the exported CpModelProto, stage timings and the outcome,
+so slow solves can be replayed later (python -m benchmarks.replay)
+"""
+
+import json
+import logging
+import os
+import random
+import time
+import uuid
+import zipfile
+from typing import Optional
+from .models import SolveSBCRequest, SolveSBCResponse
+
+logger = logging.getLogger(__name__)
+
+# Capture file extension; each capture is a zip archive of three members
+CAPTURE_SUFFIX = ".sbccap"
+REQUEST_MEMBER = "request.json"
+MODEL_MEMBER = "model.pb"
+OUTCOME_MEMBER = "outcome.json"
+
+
+class Capture:
+    """A captured solve, as read back from its file"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Capture file
+
+        Raises:
+            zipfile.BadZipFile: If the file is not a capture
+        """
+        self.path = path
+        with zipfile.ZipFile(path) as archive:
+            self.request = SolveSBCRequest.model_validate_json(archive.read(REQUEST_MEMBER))
+            self.outcome = json.loads(archive.read(OUTCOME_MEMBER))
+            names = archive.namelist()
+            self.model_proto = archive.read(MODEL_MEMBER) if MODEL_MEMBER in names else None
+
+
+class RequestCapture:
+    """
+    Samples solves and writes them to capture files
+
+    A sampled solve has its built model exported by the worker to a temporary
+    file next to the capture, which is folded into the capture once the
+    solve has finished.
+    """
+
+    def __init__(self, directory: str, sample_rate: float, min_seconds: float = 0.0):
+        """
+        Initialize capture
+
+        Args:
+            directory: Directory capture files are written to
+            sample_rate: Fraction of solves to capture (0 disables)
+            min_seconds: Keep only captures of solves that took at least this long
+        """
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.min_seconds = min_seconds
+        self.captured = 0
+
+    @classmethod
+    def from_env(cls) -> "RequestCapture":
+        """
+        Create capture configured from environment variables
+
+        SBC_SOLVER_CAPTURE_RATE: fraction of solves to capture, 0-1 (default 0, off)
+        SBC_SOLVER_CAPTURE_DIR: directory for capture files (default "captures")
+        SBC_SOLVER_CAPTURE_MIN_SECONDS: only keep solves at least this slow (default 0)
+        """
+        return cls(
+            directory=os.environ.get("SBC_SOLVER_CAPTURE_DIR", "captures"),
+            sample_rate=min(1.0, max(0.0, float(os.environ.get("SBC_SOLVER_CAPTURE_RATE", "0")))),
+            min_seconds=float(os.environ.get("SBC_SOLVER_CAPTURE_MIN_SECONDS", "0")),
+        )
+
+    def sample(self) -> Optional[str]:
+        """
+        Decide whether to capture the next solve
+
+        Returns:
+            Capture ID, or None if this solve is not captured
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def model_path(self, capture_id: str) -> str:
+        """Temporary file the worker exports the built model to"""
+        return os.path.join(self.directory, f".{capture_id}.pb")
+
+    def write(
+        self,
+        capture_id: str,
+        request: SolveSBCRequest,
+        response: SolveSBCResponse,
+        seconds: float,
+    ) -> Optional[str]:
+        """
+        Write a capture file (blocking - run off the event loop)
+
+        Args:
+            capture_id: ID returned by sample()
+            request: Request as sent to the worker (reduced pool, merged hints)
+            response: Response with stats attached
+            seconds: Solve latency in the service
+
+        Returns:
+            Path of the capture file, or None if the solve was too fast to keep
+        """
+        model_path = self.model_path(capture_id)
+        try:
+            if seconds < self.min_seconds:
+                return None
+
+            outcome = {
+                "status": response.status,
+                "success": response.success,
+                "selected_player_ids": response.selected_player_ids,
+                "solve_time": response.solve_time,
+                "latency": seconds,
+                "captured_at": time.time(),
+                "stats": response.stats.model_dump() if response.stats else None,
+            }
+            path = os.path.join(self.directory, capture_id + CAPTURE_SUFFIX)
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(
+                    REQUEST_MEMBER,
+                    request.model_copy(update={"pool_id": None}).model_dump_json(by_alias=True),
+                )
+                if os.path.exists(model_path):
+                    archive.write(model_path, MODEL_MEMBER)
+                archive.writestr(OUTCOME_MEMBER, json.dumps(outcome))
+            self.captured += 1
+            logger.info("Captured solve %s (%.2fs) to %s", capture_id, seconds, path)
+            return path
+        except OSError:
+            logger.exception("Could not write capture %s", capture_id)
+            return None
+        finally:
+            self.discard(capture_id)
+
+    def discard(self, capture_id: str) -> None:
+        """Remove the exported model of a solve that is not (or no longer) captured"""
+        model_path = self.model_path(capture_id)
+        if os.path.exists(model_path):
+            os.remove(model_path)
+
+    def stats(self) -> dict:
+        """Capture settings and number of captures written"""
+        return {
+            "sample_rate": self.sample_rate,
+            "min_seconds": self.min_seconds,
+            "captured": self.captured,
+        }
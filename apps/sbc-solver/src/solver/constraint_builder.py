@@ -3,10 +3,15 @@ Constraint builder for SBC solver
 Builds OR-Tools CP-SAT constraints from SBC requirements
 """
 
-from typing import List
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
 from ortools.sat.python import cp_model
+from .player_table import PlayerTable
+from .positions import SlotLayout, position_classes
 from .models import (
-    SolverPlayer,
     LeagueConstraint,
     CountryConstraint,
     ClubConstraint,
@@ -17,12 +22,74 @@ from .models import (
     DiversityConstraint,
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Chemistry bucket definitions (from EA FC reference)
+# Format: [[min, max], ...] teammates sharing the attribute, where index = chemistry tier (0-3)
+CHEMISTRY_BUCKETS = {
+    "club": [[0, 1], [2, 3], [4, 6], [7, 11]],
+    "league": [[0, 2], [3, 4], [5, 7], [8, 11]],
+    "nation": [[0, 1], [2, 4], [5, 7], [8, 11]],
+}
+
+# Diversity constraint attribute -> player table column
+DIVERSITY_COLUMNS = {"clubs": "club", "leagues": "league", "countries": "country"}
+
+# Quality name -> ID fallback when the request carries no quality map
+DEFAULT_QUALITY_MAP = {"bronze": 1, "silver": 2, "gold": 3, "special": 4}
+
+
+# Constraint types that accept enforcement literals directly
+ENFORCEABLE_CONSTRAINTS = {"linear", "bool_or", "bool_and"}
+
 
 class SBCConstraintBuilder:
     """Builds CP-SAT constraints for SBC requirements"""
 
-    def __init__(self, model: cp_model.CpModel):
+    def __init__(self, model: cp_model.CpModel, with_assumptions: bool = False):
+        """
+        Args:
+            model: CP-SAT model to add constraints to
+            with_assumptions: Guard every requirement added inside requirement()
+                with its own assumption literal (used to explain infeasibility)
+        """
         self.model = model
+        self.with_assumptions = with_assumptions
+        self.assumption_literals: Dict[str, cp_model.IntVar] = {}
+        self.requirement_times: Dict[str, float] = {}
+
+    @contextmanager
+    def requirement(self, name: str):
+        """
+        Context for the constraints of one requirement
+
+        Records the seconds spent building the requirement in requirement_times.
+        With assumptions enabled, every constraint added inside the block is
+        only enforced while the requirement's literal is true. Pure variable
+        definitions (element, min, product) are left as they are, since they
+        can always be satisfied once the counts they read are unconstrained.
+
+        Args:
+            name: Requirement path, e.g. 'leagues[0]' or 'team_rating'
+        """
+        start = time.perf_counter()
+        first = len(self.model.Proto().constraints)
+        yield
+        self.requirement_times[name] = time.perf_counter() - start
+        if not self.with_assumptions:
+            return
+
+        literal = self.model.NewBoolVar(f"assume_{name}")
+        self.assumption_literals[name] = literal
+
+        for ct in self.model.Proto().constraints[first:]:
+            kind = ct.WhichOneof("constraint")
+            if kind in ("exactly_one", "at_most_one"):
+                _to_linear(ct, kind)
+                kind = "linear"
+            if kind in ENFORCEABLE_CONSTRAINTS:
+                ct.enforcement_literal.append(literal.Index())
 
     def create_player_variables(self, num_players: int) -> List[cp_model.IntVar]:
         """
@@ -46,10 +113,10 @@ class SBCConstraintBuilder:
             player_vars: Player selection variables
             squad_size: Required number of players
         """
-        self.model.Add(sum(player_vars) == squad_size)
+        self.model.Add(cp_model.LinearExpr.Sum(player_vars) == squad_size)
 
     def add_unique_player_constraint(
-        self, player_vars: List[cp_model.IntVar], players: List[SolverPlayer]
+        self, player_vars: List[cp_model.IntVar], table: PlayerTable
     ) -> None:
         """
         Add constraint to ensure each unique player (by player_id) is only used once
@@ -59,59 +126,64 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
         """
-        # Group ClubPlayers by their underlying player_id
-        player_id_groups = {}
-        for i, p in enumerate(players):
-            if p.player_id not in player_id_groups:
-                player_id_groups[p.player_id] = []
-            player_id_groups[p.player_id].append(i)
-
         # For each unique player_id, ensure at most 1 ClubPlayer is selected
-        for player_id, club_player_indices in player_id_groups.items():
+        for player_id, club_player_indices in table.group_indices("player_id").items():
             if len(club_player_indices) > 1:
                 # This player has multiple copies - add constraint
-                count = sum(player_vars[i] for i in club_player_indices)
-                self.model.Add(count <= 1)
+                self.model.AddAtMostOne(
+                    player_vars[i] for i in club_player_indices.tolist()
+                )
 
     def add_position_constraints(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         required_positions: List[int],
+        squad_size: Optional[int] = None,
     ) -> None:
         """
         Add position constraints for each squad slot
 
-        Each position in the squad must be filled by a player who can play there.
-        For example, if slot 0 requires a GK (position_id=1), at least one selected
-        player must have position_id 1 in their positions array.
+        Every selected player must fill a distinct slot their positions allow,
+        so a CB/LB card covers the CB or the LB slot but not both. Encoded as
+        an integer flow from position classes (cards grouped by the required
+        positions they can play) to slot types, so the number of variables
+        depends on the distinct classes, not on the number of cards.
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             required_positions: List of position IDs required for each squad slot
-        """
-        # Group required positions by position ID to count how many of each we need
-        position_counts = {}
-        for pos_id in required_positions:
-            position_counts[pos_id] = position_counts.get(pos_id, 0) + 1
-
-        # For each required position, ensure we have enough players
-        for pos_id, count_needed in position_counts.items():
-            # Count how many selected players can play this position
-            players_with_position = sum(
-                player_vars[i] for i, p in enumerate(players) if pos_id in p.positions
-            )
-
-            # Must have at least count_needed players who can play this position
-            self.model.Add(players_with_position >= count_needed)
+            squad_size: Total squad slots; slots beyond required_positions accept
+                any player (default: one slot per required position)
+        """
+        layout = SlotLayout(required_positions, squad_size)
+        masks, class_of = position_classes(table, layout)
+        members = _group_by_class(class_of, len(masks))
+
+        # flows[slot_type] = [(class, number of its players in slots of that type)]
+        flows: Dict[int, list] = {slot_type: [] for slot_type in layout.demand}
+        for c, mask in enumerate(masks.tolist()):
+            selected = self._sum(player_vars, members[c])
+            class_flows = []
+            for slot_type in layout.compatible_types(mask):
+                upper = min(layout.demand[slot_type], len(members[c]))
+                flow = self.model.NewIntVar(0, upper, f"slots_{c}_{slot_type}")
+                flows[slot_type].append(flow)
+                class_flows.append(flow)
+            # Each selected player of the class fills exactly one compatible slot
+            self.model.Add(selected == cp_model.LinearExpr.Sum(class_flows))
+
+        # Every slot is filled
+        for slot_type, demand in layout.demand.items():
+            self.model.Add(cp_model.LinearExpr.Sum(flows[slot_type]) == demand)
 
     def add_league_constraints(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraints: List[LeagueConstraint],
     ) -> None:
         """
@@ -119,16 +191,15 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraints: League constraints to apply
         """
         for constraint in constraints:
             if constraint.league_ids:
                 # Specific leagues constraint
-                count = sum(
-                    player_vars[i]
-                    for i, p in enumerate(players)
-                    if p.league_id in constraint.league_ids
+                count = self._sum(
+                    player_vars,
+                    np.flatnonzero(table.isin("league", constraint.league_ids)),
                 )
                 self._apply_constraint_type(count, constraint.type, constraint.count)
             else:
@@ -139,8 +210,8 @@ class SBCConstraintBuilder:
                     # For each league, at most X players can be from that league
                     self._add_cardinality_constraint(
                         player_vars,
-                        players,
-                        lambda p: p.league_id,
+                        table,
+                        "league",
                         constraint.count,
                         "league",
                     )
@@ -148,8 +219,8 @@ class SBCConstraintBuilder:
                     # Min/exact: pick one league and have that many players from it
                     self._add_same_attribute_constraint(
                         player_vars,
-                        players,
-                        lambda p: p.league_id,
+                        table,
+                        "league",
                         constraint.type,
                         constraint.count,
                         "league",
@@ -158,7 +229,7 @@ class SBCConstraintBuilder:
     def add_country_constraints(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraints: List[CountryConstraint],
     ) -> None:
         """
@@ -166,19 +237,21 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraints: Country constraints to apply
         """
         for constraint in constraints:
             if constraint.country_ids:
                 # Specific countries constraint
-                print(
-                    f"  Adding specific country constraint: {constraint.type} {constraint.count} from countries {constraint.country_ids}"
+                logger.debug(
+                    "Adding specific country constraint: %s %d from countries %s",
+                    constraint.type,
+                    constraint.count,
+                    constraint.country_ids,
                 )
-                count = sum(
-                    player_vars[i]
-                    for i, p in enumerate(players)
-                    if p.country_id in constraint.country_ids
+                count = self._sum(
+                    player_vars,
+                    np.flatnonzero(table.isin("country", constraint.country_ids)),
                 )
                 self._apply_constraint_type(count, constraint.type, constraint.count)
             else:
@@ -187,25 +260,28 @@ class SBCConstraintBuilder:
                 # - Max: "at most X players from ANY SINGLE country" (cardinality constraint)
                 if constraint.type == "max":
                     # For each country, at most X players can be from that country
-                    print(
-                        f"  Adding cardinality constraint: max {constraint.count} players per country"
+                    logger.debug(
+                        "Adding cardinality constraint: max %d players per country",
+                        constraint.count,
                     )
                     self._add_cardinality_constraint(
                         player_vars,
-                        players,
-                        lambda p: p.country_id,
+                        table,
+                        "country",
                         constraint.count,
                         "country",
                     )
                 else:
                     # Min/exact: pick one country and have that many players from it
-                    print(
-                        f"  Adding same-country constraint: {constraint.type} {constraint.count} from same country"
+                    logger.debug(
+                        "Adding same-country constraint: %s %d from same country",
+                        constraint.type,
+                        constraint.count,
                     )
                     self._add_same_attribute_constraint(
                         player_vars,
-                        players,
-                        lambda p: p.country_id,
+                        table,
+                        "country",
                         constraint.type,
                         constraint.count,
                         "country",
@@ -214,7 +290,7 @@ class SBCConstraintBuilder:
     def add_club_constraints(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraints: List[ClubConstraint],
     ) -> None:
         """
@@ -222,20 +298,22 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraints: Club constraints to apply
         """
         for constraint in constraints:
             if constraint.club_ids:
                 # Specific clubs constraint (OR logic)
                 # Example: "Man City OR Chelsea: Min 2" = at least 2 from either club combined
-                print(
-                    f"  Adding specific club constraint: {constraint.type} {constraint.count} from clubs {constraint.club_ids}"
+                logger.debug(
+                    "Adding specific club constraint: %s %d from clubs %s",
+                    constraint.type,
+                    constraint.count,
+                    constraint.club_ids,
                 )
-                count = sum(
-                    player_vars[i]
-                    for i, p in enumerate(players)
-                    if p.club_id in constraint.club_ids
+                count = self._sum(
+                    player_vars,
+                    np.flatnonzero(table.isin("club", constraint.club_ids)),
                 )
                 self._apply_constraint_type(count, constraint.type, constraint.count)
             else:
@@ -244,25 +322,27 @@ class SBCConstraintBuilder:
                 # - Max: "at most X players from ANY SINGLE club" (cardinality constraint)
                 if constraint.type == "max":
                     # For each club, at most X players can be from that club
-                    print(
-                        f"  Adding cardinality constraint: max {constraint.count} players per club"
+                    logger.debug(
+                        "Adding cardinality constraint: max %d players per club", constraint.count
                     )
                     self._add_cardinality_constraint(
                         player_vars,
-                        players,
-                        lambda p: p.club_id,
+                        table,
+                        "club",
                         constraint.count,
                         "club",
                     )
                 else:
                     # Min/exact: pick one club and have that many players from it
-                    print(
-                        f"  Adding same-club constraint: {constraint.type} {constraint.count} from same club"
+                    logger.debug(
+                        "Adding same-club constraint: %s %d from same club",
+                        constraint.type,
+                        constraint.count,
                     )
                     self._add_same_attribute_constraint(
                         player_vars,
-                        players,
-                        lambda p: p.club_id,
+                        table,
+                        "club",
                         constraint.type,
                         constraint.count,
                         "club",
@@ -271,7 +351,7 @@ class SBCConstraintBuilder:
     def add_quality_constraints(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraints: List[QualityConstraint],
         quality_map: dict = None,
     ) -> None:
@@ -280,56 +360,54 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraints: Quality constraints to apply
             quality_map: Maps quality name to database ID (from database)
         """
         # Use provided quality map or fallback to default
         # (fallback should not be used if database is set up correctly)
         if quality_map is None:
-            quality_map = {"bronze": 1, "silver": 2, "gold": 3, "special": 4}
-            print(
-                "⚠️  WARNING: Using hardcoded quality map. Database mapping should be provided!"
+            quality_map = DEFAULT_QUALITY_MAP
+            logger.warning(
+                "Using hardcoded quality map. Database mapping should be provided!"
             )
 
         for constraint in constraints:
             quality_id = quality_map.get(constraint.quality)
             if quality_id is None:
-                print(
-                    f"⚠️  WARNING: Unknown quality '{constraint.quality}' in constraint"
-                )
+                logger.warning("Unknown quality '%s' in constraint", constraint.quality)
                 continue
 
-            # Count how many players match this quality
-            matching_players = [p for p in players if p.quality_id == quality_id]
-            print(
-                f"Found {len(matching_players)} {constraint.quality} players (quality_id={quality_id})"
-            )
-            print(f"  Constraint: {constraint.type} {constraint.count}")
-
-            # Show sample of matching players
-            sorted_matching = sorted(matching_players, key=lambda p: p.ovr)
-            print(f"  Sample {constraint.quality} players (sorted by OVR):")
-            for p in sorted_matching[:10]:
-                squad_flag = " [SQUAD]" if p.squad else ""
-                sbc_flag = " [SBC]" if p.sbc else ""
-                print(f"    {p.display_name} (OVR {p.ovr}){squad_flag}{sbc_flag}")
-
-            # Show sample of quality IDs in dataset
-            quality_ids_in_data = set(p.quality_id for p in players)
-            print(f"  All quality_ids in dataset: {sorted(quality_ids_in_data)}")
-
-            count = sum(
-                player_vars[i]
-                for i, p in enumerate(players)
-                if p.quality_id == quality_id
-            )
+            matching = np.flatnonzero(table.quality == quality_id)
+
+            # Sample of matching players (the sort is skipped unless debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                sorted_matching = matching[np.argsort(table.ovr[matching], kind="stable")]
+                samples = []
+                for i in sorted_matching[:10].tolist():
+                    p = table.players[i]
+                    squad_flag = " [SQUAD]" if p.squad else ""
+                    sbc_flag = " [SBC]" if p.sbc else ""
+                    samples.append(f"{p.display_name} (OVR {p.ovr}){squad_flag}{sbc_flag}")
+                logger.debug(
+                    "Found %d %s players (quality_id=%d), constraint: %s %d, "
+                    "lowest rated: %s, all quality_ids in dataset: %s",
+                    len(matching),
+                    constraint.quality,
+                    quality_id,
+                    constraint.type,
+                    constraint.count,
+                    ", ".join(samples),
+                    np.unique(table.quality).tolist(),
+                )
+
+            count = self._sum(player_vars, matching)
             self._apply_constraint_type(count, constraint.type, constraint.count)
 
     def add_rarity_constraints(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraints: List[RarityConstraint],
     ) -> None:
         """
@@ -340,7 +418,7 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraints: Rarity constraints to apply
         """
         for constraint in constraints:
@@ -348,21 +426,17 @@ class SBCConstraintBuilder:
             # For now, assume rarity_id > 1 means rare (Common=1, Rare=2+)
             if constraint.rare:
                 # Count rare players
-                count = sum(
-                    player_vars[i] for i, p in enumerate(players) if p.rarity_id > 1
-                )
+                count = self._sum(player_vars, np.flatnonzero(table.rarity > 1))
             else:
                 # Count common players
-                count = sum(
-                    player_vars[i] for i, p in enumerate(players) if p.rarity_id == 1
-                )
+                count = self._sum(player_vars, np.flatnonzero(table.rarity == 1))
 
             self._apply_constraint_type(count, constraint.type, constraint.count)
 
     def add_rating_constraint(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraint: RatingConstraint,
         squad_size: int,
     ) -> None:
@@ -373,13 +447,12 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraint: Rating constraint to apply
             squad_size: Expected squad size
         """
         # Calculate weighted sum of ratings
-        ratings = [p.ovr for p in players]
-        weighted_sum = sum(player_vars[i] * ratings[i] for i in range(len(players)))
+        weighted_sum = cp_model.LinearExpr.WeightedSum(player_vars, table.ovr.tolist())
 
         # To avoid floating point, multiply both sides by squad_size
         # avg_rating >= target becomes: sum(ratings) >= target * squad_size
@@ -390,8 +463,9 @@ class SBCConstraintBuilder:
     def add_chemistry_constraint(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraint: ChemistryConstraint,
+        squad_size: Optional[int] = None,
     ) -> None:
         """
         Add chemistry constraint
@@ -402,153 +476,125 @@ class SBCConstraintBuilder:
         - Total chemistry = sum of all players' individual chemistry
         - Players must be in valid positions to contribute chemistry
 
+        Model (size grows with players + groups, not players²):
+        - One count variable per club/league/nation group (selected players in it)
+        - One tier variable per group, looked up from the bucket table with AddElement
+        - Players sharing club, league and nation have identical chemistry, so
+          each such "link key" gets one capped chemistry variable multiplied by
+          the number of selected players with that key
+
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraint: Chemistry constraint to apply
+            squad_size: Squad size, used to bound the group count variables
         """
-        # Chemistry bucket definitions (from EA FC reference)
-        # Format: [[min, max], ...] where index = chemistry tier (0-3)
-        club_buckets = [[0, 1], [2, 3], [4, 6], [7, 11]]
-        league_buckets = [[0, 2], [3, 4], [5, 7], [8, 11]]
-        nation_buckets = [[0, 1], [2, 4], [5, 7], [8, 11]]
+        # Tier (0-3) of every club/league/nation group, as a variable or constant
+        club_tiers = self._add_group_chemistry_tiers(
+            player_vars, table, "club", CHEMISTRY_BUCKETS["club"], squad_size
+        )
+        league_tiers = self._add_group_chemistry_tiers(
+            player_vars, table, "league", CHEMISTRY_BUCKETS["league"], squad_size
+        )
+        nation_tiers = self._add_group_chemistry_tiers(
+            player_vars, table, "country", CHEMISTRY_BUCKETS["nation"], squad_size
+        )
 
-        # Get all unique clubs, leagues, nations in player pool
-        unique_clubs = set(p.club_id for p in players)
-        unique_leagues = set(p.league_id for p in players)
-        unique_nations = set(p.country_id for p in players)
+        # Group players by their (club, league, nation) link key
+        link_keys = np.stack([table.club, table.league, table.country], axis=1)
+        unique_keys, inverse = np.unique(link_keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        members_per_key = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
 
-        # For each player, calculate their chemistry contribution
         player_chemistry = []
 
-        for i, player in enumerate(players):
-            # Chemistry from club links
-            club_chem_var = self.model.NewIntVar(0, 3, f"player_{i}_club_chem")
-            self._add_bucket_chemistry(
-                player_vars,
-                players,
-                player,
-                i,
-                lambda p: p.club_id,
-                club_buckets,
-                club_chem_var,
-                "club",
-            )
-
-            # Chemistry from league links
-            league_chem_var = self.model.NewIntVar(0, 3, f"player_{i}_league_chem")
-            self._add_bucket_chemistry(
-                player_vars,
-                players,
-                player,
-                i,
-                lambda p: p.league_id,
-                league_buckets,
-                league_chem_var,
-                "league",
+        for k, (club_id, league_id, nation_id) in enumerate(unique_keys.tolist()):
+            members = members_per_key[k].tolist()
+            uncapped_chem = (
+                club_tiers[club_id] + league_tiers[league_id] + nation_tiers[nation_id]
             )
 
-            # Chemistry from nation links
-            nation_chem_var = self.model.NewIntVar(0, 3, f"player_{i}_nation_chem")
-            self._add_bucket_chemistry(
-                player_vars,
-                players,
-                player,
-                i,
-                lambda p: p.country_id,
-                nation_buckets,
-                nation_chem_var,
-                "nation",
-            )
+            # Selected players with this link key
+            if len(members) == 1:
+                selected_count = player_vars[members[0]]
+            else:
+                upper = len(members) if squad_size is None else min(len(members), squad_size)
+                selected_count = self.model.NewIntVar(0, upper, f"link_{k}_count")
+                self.model.Add(selected_count == self._sum(player_vars, members))
 
-            # Total chemistry for this player (capped at 3)
-            uncapped_chem = self.model.NewIntVar(0, 9, f"player_{i}_uncapped_chem")
-            self.model.Add(
-                uncapped_chem == club_chem_var + league_chem_var + nation_chem_var
-            )
+            if isinstance(uncapped_chem, int):
+                # None of this key's groups can ever reach tier 1 - always 0 chemistry
+                continue
 
-            capped_chem = self.model.NewIntVar(0, 3, f"player_{i}_chem")
+            # Chemistry of one player with this key (capped at 3)
+            capped_chem = self.model.NewIntVar(0, 3, f"link_{k}_chem")
             self.model.AddMinEquality(capped_chem, [uncapped_chem, 3])
 
-            # Player only contributes chemistry if selected
-            actual_chem = self.model.NewIntVar(0, 3, f"player_{i}_actual_chem")
-            self.model.AddMultiplicationEquality(
-                actual_chem, [player_vars[i], capped_chem]
-            )
+            # Only selected players contribute chemistry
+            upper = 3 * (len(members) if squad_size is None else min(len(members), squad_size))
+            key_chem = self.model.NewIntVar(0, upper, f"link_{k}_total_chem")
+            self.model.AddMultiplicationEquality(key_chem, [selected_count, capped_chem])
 
-            player_chemistry.append(actual_chem)
+            player_chemistry.append(key_chem)
 
         # Total team chemistry = sum of all players' chemistry
-        total_chemistry = sum(player_chemistry)
+        total_chemistry = cp_model.LinearExpr.Sum(player_chemistry)
 
         # Apply the constraint
         self._apply_constraint_type(total_chemistry, constraint.type, constraint.value)
 
-    def _add_bucket_chemistry(
+    def _add_group_chemistry_tiers(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
-        player: SolverPlayer,
-        player_idx: int,
-        attribute_getter,
+        table: PlayerTable,
+        column: str,
         buckets: List[List[int]],
-        chem_var: cp_model.IntVar,
-        attribute_name: str,
-    ) -> None:
+        squad_size: Optional[int],
+    ) -> Dict[int, Union[cp_model.IntVar, int]]:
         """
-        Calculate chemistry for a player based on bucket system
+        Create the shared chemistry tier for every group of an attribute
+
+        A selected player in a group with `count` selected players has
+        `count - 1` teammates sharing the attribute, so the group's tier is
+        bucket_tier(count - 1). The lookup is a single AddElement on the
+        group's count variable.
 
         Args:
             player_vars: All player selection variables
-            players: All available players
-            player: The specific player to calculate chemistry for
-            player_idx: Index of the player
-            attribute_getter: Function to get attribute (club_id, league_id, country_id)
+            table: Columnar player pool
+            column: Attribute column ('club', 'league', 'country')
             buckets: Bucket ranges for chemistry tiers
-            chem_var: Variable to store chemistry result (0-3)
-            attribute_name: Name for debugging
-        """
-        player_attribute = attribute_getter(player)
+            squad_size: Squad size, used to bound the count variables
 
-        # Count how many OTHER selected players share this attribute
-        # (Don't count the player themselves)
-        teammates_with_same = sum(
-            player_vars[j]
-            for j, p in enumerate(players)
-            if j != player_idx and attribute_getter(p) == player_attribute
-        )
-
-        # Determine which tier based on teammate count
-        # If player not selected, chemistry = 0
-        # Otherwise, use buckets to determine tier
+        Returns:
+            Mapping of attribute value to tier variable (or constant 0 when the
+            group is too small to ever reach tier 1)
+        """
+        tiers = {}
 
-        # When player is selected, map teammate count to chemistry tier
-        # We'll create boolean variables for each tier and ensure exactly one is active
-        tier_vars = []
-        for tier, (min_count, max_count) in enumerate(buckets):
-            tier_active = self.model.NewBoolVar(
-                f"player_{player_idx}_{attribute_name}_tier_{tier}"
-            )
-            tier_vars.append(tier_active)
+        for value, members in table.group_indices(column).items():
+            upper = len(members) if squad_size is None else min(len(members), squad_size)
 
-            # If this tier is active, teammate count must be in range
-            self.model.Add(teammates_with_same >= min_count).OnlyEnforceIf(tier_active)
-            self.model.Add(teammates_with_same <= max_count).OnlyEnforceIf(tier_active)
+            # Tier lookup indexed by the number of selected players in the group
+            lookup = [0] + [_bucket_tier(buckets, count - 1) for count in range(1, upper + 1)]
+            if max(lookup) == 0:
+                tiers[value] = 0
+                continue
 
-        # When player is selected, exactly one tier must be active
-        self.model.Add(sum(tier_vars) == 1).OnlyEnforceIf(player_vars[player_idx])
+            count = self.model.NewIntVar(0, upper, f"{column}_{value}_count")
+            self.model.Add(count == self._sum(player_vars, members))
 
-        # Set chemistry based on which tier is active
-        for tier, tier_active in enumerate(tier_vars):
-            self.model.Add(chem_var == tier).OnlyEnforceIf(tier_active)
+            tier = self.model.NewIntVar(0, max(lookup), f"{column}_{value}_tier")
+            self.model.AddElement(count, lookup, tier)
+            tiers[value] = tier
 
-        # If player not selected, chemistry = 0
-        self.model.Add(chem_var == 0).OnlyEnforceIf(player_vars[player_idx].Not())
+        return tiers
 
     def add_diversity_constraints(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
+        table: PlayerTable,
         constraints: List[DiversityConstraint],
     ) -> None:
         """
@@ -560,47 +606,31 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             constraints: Diversity constraints to apply
         """
         for constraint in constraints:
-            # Get the appropriate attribute getter based on the constraint type
-            if constraint.attribute == "clubs":
-                attribute_getter = lambda p: p.club_id
-                attribute_name = "club"
-            elif constraint.attribute == "leagues":
-                attribute_getter = lambda p: p.league_id
-                attribute_name = "league"
-            else:  # countries
-                attribute_getter = lambda p: p.country_id
-                attribute_name = "country"
-
-            # Get all unique attribute values in the player pool
-            unique_values = set(attribute_getter(p) for p in players)
+            # Get the column matching the constraint's attribute
+            attribute_name = DIVERSITY_COLUMNS[constraint.attribute]
+
+            # Player indices for each unique attribute value in the pool
+            groups = table.group_indices(attribute_name)
 
             # Create binary variables for each unique value
             # attribute_used[val] = 1 if at least one player with this value is selected
             attribute_used = {}
-            for val in unique_values:
+            for val in groups:
                 attribute_used[val] = self.model.NewBoolVar(
                     f"{attribute_name}_{val}_used"
                 )
 
             # For each unique value, link the "used" variable to player selection
-            for val in unique_values:
-                # Get players with this attribute value
-                players_with_val = [
-                    i for i, p in enumerate(players) if attribute_getter(p) == val
-                ]
-
-                if not players_with_val:
-                    continue
-
+            for val, players_with_val in groups.items():
                 # attribute_used[val] == 1 iff at least one player with this value is selected
                 # This is: attribute_used[val] <= sum(player_vars[i] for matching players)
                 # And: sum(player_vars[i]) <= M * attribute_used[val] (where M = squad size)
 
-                count_with_val = sum(player_vars[i] for i in players_with_val)
+                count_with_val = self._sum(player_vars, players_with_val)
 
                 # If any player with this value is selected, mark as used
                 # attribute_used[val] == 1 iff count_with_val >= 1
@@ -610,7 +640,7 @@ class SBCConstraintBuilder:
                 )
 
             # Count how many unique values are used
-            num_unique = sum(attribute_used.values())
+            num_unique = cp_model.LinearExpr.Sum(list(attribute_used.values()))
 
             # Apply the constraint
             self._apply_constraint_type(num_unique, constraint.type, constraint.count)
@@ -618,8 +648,8 @@ class SBCConstraintBuilder:
     def _add_cardinality_constraint(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
-        attribute_getter,
+        table: PlayerTable,
+        column: str,
         max_count: int,
         attribute_name: str,
     ) -> None:
@@ -631,25 +661,19 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
-            attribute_getter: Function to get attribute value from player
+            table: Columnar player pool
+            column: Attribute column to group by (e.g. 'league')
             max_count: Maximum players allowed per attribute value
             attribute_name: Name for debugging (e.g., 'country')
         """
-        # Get all unique attribute values
-        attribute_values = set(attribute_getter(p) for p in players)
-
         # For each attribute value, ensure at most max_count players
-        for attr_val in attribute_values:
-            players_with_attr = [
-                i for i, p in enumerate(players) if attribute_getter(p) == attr_val
-            ]
-
-            if not players_with_attr:
+        for attr_val, players_with_attr in table.group_indices(column).items():
+            # Groups smaller than the limit can never violate it
+            if len(players_with_attr) <= max_count:
                 continue
 
             # Count selected players with this attribute value
-            count_with_attr = sum(player_vars[i] for i in players_with_attr)
+            count_with_attr = self._sum(player_vars, players_with_attr)
 
             # Enforce max constraint
             self.model.Add(count_with_attr <= max_count)
@@ -657,8 +681,8 @@ class SBCConstraintBuilder:
     def _add_same_attribute_constraint(
         self,
         player_vars: List[cp_model.IntVar],
-        players: List[SolverPlayer],
-        attribute_getter,
+        table: PlayerTable,
+        column: str,
         constraint_type: str,
         count: int,
         attribute_name: str,
@@ -671,35 +695,27 @@ class SBCConstraintBuilder:
 
         Args:
             player_vars: Player selection variables
-            players: Available players
-            attribute_getter: Function to get attribute value from player
+            table: Columnar player pool
+            column: Attribute column to group by (e.g. 'league')
             constraint_type: 'min', 'max', or 'exact'
             count: Required count
             attribute_name: Name for variable naming (e.g., 'league')
         """
-        # Get all unique attribute values
-        attribute_values = set(attribute_getter(p) for p in players)
+        # Player indices for each attribute value
+        groups = table.group_indices(column)
 
         # Create binary variables for each possible attribute value
         attribute_vars = {
-            val: self.model.NewBoolVar(f"{attribute_name}_{val}")
-            for val in attribute_values
+            val: self.model.NewBoolVar(f"{attribute_name}_{val}") for val in groups
         }
 
         # Exactly one attribute must be selected
-        self.model.Add(sum(attribute_vars.values()) == 1)
+        self.model.AddExactlyOne(attribute_vars.values())
 
         # For each attribute value, count how many players have it
         for attr_val, attr_var in attribute_vars.items():
-            players_with_attr = [
-                i for i, p in enumerate(players) if attribute_getter(p) == attr_val
-            ]
-
-            if not players_with_attr:
-                continue
-
             # Count players with this attribute
-            count_with_attr = sum(player_vars[i] for i in players_with_attr)
+            count_with_attr = self._sum(player_vars, groups[attr_val])
 
             # If this attribute is selected, enforce the count constraint
             # We use a big-M approach here:
@@ -719,6 +735,22 @@ class SBCConstraintBuilder:
                 self.model.Add(count_with_attr == count).OnlyEnforceIf(attr_var)
                 self.model.Add(count_with_attr == 0).OnlyEnforceIf(attr_var.Not())
 
+    @staticmethod
+    def _sum(player_vars: List[cp_model.IntVar], indices: Iterable[int]):
+        """
+        Sum of the selection variables at the given player indices
+
+        Args:
+            player_vars: Player selection variables
+            indices: Player indices (list or NumPy array)
+
+        Returns:
+            Linear expression counting selected players
+        """
+        if isinstance(indices, np.ndarray):
+            indices = indices.tolist()
+        return cp_model.LinearExpr.Sum([player_vars[i] for i in indices])
+
     def _apply_constraint_type(self, expr, constraint_type: str, value: int) -> None:
         """
         Apply min/max/exact constraint to an expression
@@ -734,3 +766,48 @@ class SBCConstraintBuilder:
             self.model.Add(expr <= value)
         elif constraint_type == "exact":
             self.model.Add(expr == value)
+
+
+def _to_linear(ct, kind: str) -> None:
+    """Rewrite an exactly_one / at_most_one constraint as an equivalent linear one"""
+    literals = list(getattr(ct, kind).literals)
+    ct.ClearField(kind)
+
+    # A negated literal -v-1 contributes (1 - v)
+    offset = 0
+    for literal in literals:
+        if literal >= 0:
+            ct.linear.vars.append(literal)
+            ct.linear.coeffs.append(1)
+        else:
+            ct.linear.vars.append(-literal - 1)
+            ct.linear.coeffs.append(-1)
+            offset += 1
+
+    # Number of true literals must be exactly 1, or between 0 and 1
+    lower = 1 if kind == "exactly_one" else 0
+    ct.linear.domain.extend([lower - offset, 1 - offset])
+
+
+def _bucket_tier(buckets: List[List[int]], teammates: int) -> int:
+    """
+    Chemistry tier for a number of teammates sharing an attribute
+
+    Args:
+        buckets: Bucket ranges for chemistry tiers
+        teammates: Number of other selected players sharing the attribute
+
+    Returns:
+        Chemistry tier (0-3)
+    """
+    for tier, (min_count, max_count) in enumerate(buckets):
+        if min_count <= teammates <= max_count:
+            return tier
+    return len(buckets) - 1
+
+
+def _group_by_class(class_of: np.ndarray, num_classes: int) -> List[np.ndarray]:
+    """Card indices of every class, indexed by class"""
+    order = np.argsort(class_of, kind="stable")
+    bounds = np.cumsum(np.bincount(class_of, minlength=num_classes))[:-1]
+    return np.split(order, bounds)
@@ -0,0 +1,161 @@
+"""
+Shared deadline scheduler for search stops
+One timer thread per process fires the no-improvement, deadline and
+cancellation stops of every active search, instead of a polling thread per
+solve
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    """Handle of a scheduled callback"""
+
+    def __init__(
+        self,
+        when: float,
+        callback: Callable[[], None],
+        interval: Optional[float],
+        scheduler: "DeadlineScheduler",
+    ):
+        self.when = when
+        self.callback: Optional[Callable[[], None]] = callback
+        self.interval = interval
+        self.cancelled = False
+        self._scheduler = scheduler
+        self._queued = False
+
+    def cancel(self) -> None:
+        """
+        Stop the callback from running (again); safe to call more than once
+
+        The callback is released right away, so whatever it references (e.g.
+        a finished solve's solver and model) does not live until the due time.
+        """
+        self._scheduler._cancel(self)
+
+
+class DeadlineScheduler:
+    """
+    Runs callbacks at time.monotonic() deadlines on a single background thread
+
+    Timers live in a heap ordered by deadline; the thread sleeps until the
+    earliest one is due (or a new, earlier one is added), so every stop fires
+    at its deadline rather than on the next polling tick. Cancelled timers are
+    dropped lazily when they reach the top of the heap. Callbacks run on the
+    scheduler thread and must be short (e.g. CpSolver.StopSearch).
+
+    A cancelled timer releases its callback at once and is dropped from the
+    heap when it reaches the top, or earlier when cancelled entries make up
+    more than half of the heap (the heap is then rebuilt without them).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Timer]] = []
+        self._cancelled = 0
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def call_at(
+        self, when: float, callback: Callable[[], None], interval: Optional[float] = None
+    ) -> Timer:
+        """
+        Schedule a callback
+
+        Args:
+            when: time.monotonic() at which to run the callback
+            callback: Function to run on the scheduler thread
+            interval: If given, run the callback again every interval seconds
+                until the timer is cancelled
+
+        Returns:
+            Timer handle for cancellation
+        """
+        timer = Timer(when, callback, interval, self)
+        with self._condition:
+            self._push(timer)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="deadline-scheduler", daemon=True
+                )
+                self._thread.start()
+        return timer
+
+    def call_later(
+        self, delay: float, callback: Callable[[], None], interval: Optional[float] = None
+    ) -> Timer:
+        """Schedule a callback delay seconds from now (see call_at)"""
+        return self.call_at(time.monotonic() + delay, callback, interval)
+
+    def pending(self) -> int:
+        """Timers waiting to fire"""
+        with self._condition:
+            return len(self._heap) - self._cancelled
+
+    def _cancel(self, timer: Timer) -> None:
+        with self._condition:
+            if timer.cancelled:
+                return
+            timer.cancelled = True
+            timer.callback = None
+            if not timer._queued:
+                # Running right now (or already done) - nothing left in the heap
+                return
+            self._cancelled += 1
+            if self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def _push(self, timer: Timer) -> None:
+        timer._queued = True
+        heapq.heappush(self._heap, (timer.when, next(self._order), timer))
+        if self._heap[0][2] is timer:
+            # New earliest deadline - wake the thread to sleep for less
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    when, _, timer = self._heap[0]
+                    if timer.cancelled:
+                        heapq.heappop(self._heap)
+                        timer._queued = False
+                        self._cancelled -= 1
+                        continue
+                    delay = when - time.monotonic()
+                    if delay > 0:
+                        self._condition.wait(delay)
+                        continue
+                    heapq.heappop(self._heap)
+                    timer._queued = False
+                    callback = timer.callback
+                    break
+
+            try:
+                callback()
+            except Exception:
+                logger.exception("Deadline callback failed")
+
+            with self._condition:
+                if timer.interval is not None and not timer.cancelled:
+                    timer.when = max(timer.when + timer.interval, time.monotonic())
+                    self._push(timer)
+            # Don't hold the last callback (and what it references) while idle
+            del callback, timer
+
+
+# Scheduler shared by every search in this process
+deadline_scheduler = DeadlineScheduler()
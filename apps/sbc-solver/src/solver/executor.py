@@ -0,0 +1,457 @@
+"""
+Process pool executor for SBC solves
+Runs CP-SAT searches in pre-warmed worker processes so the API event loop stays responsive
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.managers import SyncManager
+from typing import Callable, Dict, Optional, Union
+from .models import (
+    SolveSBCRequest,
+    SolveSBCResponse,
+    SolveSBCBatchRequest,
+    SolveSBCBatchResponse,
+    SolveProgress,
+)
+from .log_config import configure_logging
+from .scheduler import CoreScheduler
+
+# Queue order of solve priorities (lower runs first)
+PRIORITY_RANKS = {"interactive": 0, "bulk": 1}
+
+
+class SolverBusyError(Exception):
+    """Raised when the solve queue is full and a request cannot be accepted"""
+
+
+class DuplicateJobError(Exception):
+    """Raised when a solve is submitted with the job ID of a solve still in progress"""
+
+
+class _Job:
+    """Cancellation state of a queued or running solve"""
+
+    def __init__(self):
+        self.cancelled = False
+        self.waiting: Optional[asyncio.Task] = None  # Slot acquisition while queued
+        self.cancel_event = None  # Manager event shared with the worker once running
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self.waiting is not None:
+            self.waiting.cancel()
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+
+
+class _PrioritySlots:
+    """Worker slots handed out by priority rank, then in arrival order"""
+
+    def __init__(self, count: int):
+        self._free = count
+        self._waiters = []  # Heap of (rank, arrival, future)
+        self._arrivals = itertools.count()
+
+    async def acquire(self, rank: int) -> None:
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (rank, next(self._arrivals), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A slot was handed over just as we gave up - pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._free += 1
+
+
+def _warm_worker() -> None:
+    """
+    Worker process initializer
+
+    Imports OR-Tools and runs a trivial model so the native library and the
+    solver module are fully loaded before the first real request arrives, and
+    routes the worker's solver logs through the queue handler.
+    """
+    from ortools.sat.python import cp_model
+    from . import or_tools_solver  # noqa: F401
+
+    configure_logging()
+
+    model = cp_model.CpModel()
+    x = model.NewBoolVar("warmup")
+    model.Add(x == 1)
+    cp_model.CpSolver().Solve(model)
+
+
+def _worker_pid() -> int:
+    """No-op task used to spin up every worker process at startup"""
+    return os.getpid()
+
+
+def _run_solve(
+    request: Union[SolveSBCRequest, SolveSBCBatchRequest],
+    num_search_workers: int,
+    progress_queue=None,
+    cancel_event=None,
+    model_path: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> Union[SolveSBCResponse, SolveSBCBatchResponse]:
+    """
+    Entry point executed inside a worker process
+
+    If a progress queue is given, every improving solution is put on it,
+    followed by None once the solve has finished. Setting the cancel event
+    stops the search, as does reaching the deadline (time.monotonic()). If a
+    model path is given, the built model is exported to it. Models are reused
+    from the worker's template cache.
+    """
+    from .or_tools_solver import SBCSolver
+    from .templates import model_templates
+
+    try:
+        solver = SBCSolver(
+            num_search_workers=num_search_workers,
+            progress_callback=progress_queue.put if progress_queue is not None else None,
+            cancel_event=cancel_event,
+            model_path=model_path,
+            deadline=deadline,
+            templates=model_templates,
+        )
+        if isinstance(request, SolveSBCBatchRequest):
+            return solver.solve_batch(request)
+        return solver.solve(request)
+    finally:
+        if progress_queue is not None:
+            progress_queue.put(None)
+
+
+async def _relay_progress(
+    progress_queue, on_progress: Callable[[SolveProgress], None], threads: Executor
+) -> None:
+    """
+    Forward progress events from a worker's queue until it sends None
+
+    The blocking queue reads run on `threads`, which holds one thread per
+    concurrent solve, so open streams never tie up the loop's default executor.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        event = await loop.run_in_executor(threads, progress_queue.get)
+        if event is None:
+            return
+        on_progress(event)
+
+
+def _unstarted_response(
+    request: Union[SolveSBCRequest, SolveSBCBatchRequest], status: str, message: str
+) -> Union[SolveSBCResponse, SolveSBCBatchResponse]:
+    """Response for a solve that never reached a worker"""
+    response_type = (
+        SolveSBCBatchResponse if isinstance(request, SolveSBCBatchRequest) else SolveSBCResponse
+    )
+    return response_type(
+        success=False, status=status, job_id=request.job_id, message=message
+    )
+
+
+class SolverExecutor:
+    """
+    Bounded pool of solver worker processes
+
+    At most `max_workers` solves run at once; up to `max_queue` more wait for a
+    free worker, interactive requests ahead of bulk ones. Requests beyond that
+    are rejected with SolverBusyError. Each solve's CP-SAT search worker count
+    comes from the core scheduler.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, scheduler: CoreScheduler):
+        """
+        Initialize executor
+
+        Args:
+            max_workers: Number of worker processes (concurrent solves)
+            max_queue: Maximum number of solves waiting for a free worker
+            scheduler: Core scheduler sizing each solve's search workers
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.scheduler = scheduler
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager: Optional[SyncManager] = None
+        self._start_lock = asyncio.Lock()
+        self._slots = _PrioritySlots(max_workers)
+        # Progress relays block on a queue read for a whole solve; at most one
+        # per running solve, kept off the default executor other work shares
+        self._relay_threads = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="progress-relay"
+        )
+        self._active = 0
+        self._queued = 0
+        self._busy_seconds = 0.0
+        self._jobs: Dict[str, _Job] = {}
+
+    @classmethod
+    def from_env(cls) -> "SolverExecutor":
+        """
+        Create executor configured from environment variables
+
+        SBC_SOLVER_WORKERS: number of worker processes (default 2)
+        SBC_SOLVER_MAX_QUEUE: maximum queued solves (default 16)
+        """
+        return cls(
+            max_workers=max(1, int(os.environ.get("SBC_SOLVER_WORKERS", "2"))),
+            max_queue=max(0, int(os.environ.get("SBC_SOLVER_MAX_QUEUE", "16"))),
+            scheduler=CoreScheduler.from_env(),
+        )
+
+    async def start(self) -> None:
+        """Create the process pool and pre-warm every worker"""
+        async with self._start_lock:
+            loop = asyncio.get_running_loop()
+            context = multiprocessing.get_context("spawn")
+
+            if self._manager is None:
+                # Hosts the queues workers report progress on (plain
+                # multiprocessing queues cannot be passed to pool tasks)
+                self._manager = await loop.run_in_executor(None, context.Manager)
+
+            if self._pool is not None:
+                return
+
+            pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_warm_worker,
+            )
+
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _worker_pid)
+                    for _ in range(self.max_workers)
+                )
+            )
+            self._pool = pool
+
+    def shutdown(self) -> None:
+        """Stop all worker processes"""
+        self._reset_pool()
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def _reset_pool(self) -> None:
+        """Stop the worker pool; the next solve starts a fresh one"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def solve(
+        self,
+        request: Union[SolveSBCRequest, SolveSBCBatchRequest],
+        on_progress: Optional[Callable[[SolveProgress], None]] = None,
+        on_start: Optional[Callable[[], None]] = None,
+        deadline: Optional[float] = None,
+        model_path: Optional[str] = None,
+    ) -> Union[SolveSBCResponse, SolveSBCBatchResponse]:
+        """
+        Run a solve in a worker process
+
+        Args:
+            request: SBC solve request, or batch request for a joint solve
+            on_progress: Optional callback, run on the event loop, for every
+                improving solution found by the worker
+            on_start: Optional callback run once the solve leaves the queue
+            deadline: Optional time.monotonic() by which the solve must finish;
+                the search time is capped to it, and a solve still queued at
+                the deadline returns TIMEOUT without running
+            model_path: Optional file the worker exports the built CpModelProto to
+
+        Returns:
+            Solver response
+
+        Raises:
+            SolverBusyError: If all workers are busy and the queue is full
+            DuplicateJobError: If request.job_id belongs to a solve still in progress
+        """
+        self.check_capacity()
+
+        solve_id = request.job_id or uuid.uuid4().hex
+        if solve_id in self._jobs:
+            raise DuplicateJobError(f"Job {solve_id} is already in progress")
+
+        job = _Job()
+        self._jobs[solve_id] = job
+        try:
+            self._queued += 1
+            job.waiting = asyncio.ensure_future(
+                self._slots.acquire(PRIORITY_RANKS[request.priority])
+            )
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                await asyncio.wait({job.waiting}, timeout=timeout)
+            except asyncio.CancelledError:
+                if job.waiting.done() and not job.waiting.cancelled():
+                    self._slots.release()
+                job.waiting.cancel()
+                raise
+            finally:
+                self._queued -= 1
+
+            if not job.waiting.done():
+                job.waiting.cancel()
+                return _unstarted_response(
+                    request, "TIMEOUT", "Deadline passed while waiting for a free worker"
+                )
+            if job.waiting.cancelled():
+                return _unstarted_response(
+                    request, "CANCELLED", "Solve cancelled before it started"
+                )
+            job.waiting = None
+
+            try:
+                if job.cancelled:
+                    return _unstarted_response(
+                        request, "CANCELLED", "Solve cancelled before it started"
+                    )
+                if on_start is not None:
+                    on_start()
+                if deadline is not None:
+                    # The worker stops the search exactly at the deadline; the
+                    # whole-second time limit only has to not run past it
+                    remaining = math.ceil(deadline - time.monotonic())
+                    request = request.model_copy(
+                        update={"max_solve_time": max(1, min(request.max_solve_time, remaining))}
+                    )
+                return await self._run(
+                    solve_id, job, request, on_progress, model_path, deadline
+                )
+            finally:
+                self._slots.release()
+        finally:
+            del self._jobs[solve_id]
+
+    def check_capacity(self) -> None:
+        """
+        Raises:
+            SolverBusyError: If all workers are busy and the queue is full
+        """
+        if self._queued >= self.max_queue and self._active >= self.max_workers:
+            raise SolverBusyError(
+                f"Solver queue is full ({self._active} running, {self._queued} queued)"
+            )
+
+    async def _run(
+        self,
+        solve_id: str,
+        job: _Job,
+        request: Union[SolveSBCRequest, SolveSBCBatchRequest],
+        on_progress: Optional[Callable[[SolveProgress], None]],
+        model_path: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> Union[SolveSBCResponse, SolveSBCBatchResponse]:
+        """Run a solve that holds a worker slot"""
+        num_search_workers = self.scheduler.acquire(solve_id, waiting=self._queued)
+
+        self._active += 1
+        started = time.monotonic()
+        try:
+            await self.start()
+            pool = self._pool
+            loop = asyncio.get_running_loop()
+
+            job.cancel_event = self._manager.Event()
+            progress_queue = None
+            relay = None
+            if on_progress is not None:
+                progress_queue = self._manager.Queue()
+                relay = asyncio.create_task(
+                    _relay_progress(progress_queue, on_progress, self._relay_threads)
+                )
+
+            future = loop.run_in_executor(
+                pool,
+                _run_solve,
+                request,
+                num_search_workers,
+                progress_queue,
+                job.cancel_event,
+                model_path,
+                deadline,
+            )
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The caller went away - stop the search and keep the slot
+                # until the worker is actually free again
+                job.cancel()
+                await asyncio.wait({future})
+                raise
+            except BrokenProcessPool:
+                # A worker died (e.g. killed by the OOM killer) - replace the pool
+                if self._pool is pool:
+                    self._reset_pool()
+                raise
+            finally:
+                if relay is not None:
+                    # Unblock the relay even if the worker died before sending None
+                    progress_queue.put(None)
+                    await relay
+        finally:
+            self._active -= 1
+            self._busy_seconds += time.monotonic() - started
+            self.scheduler.release(solve_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running solve
+
+        A queued solve returns a CANCELLED response without running; a running
+        search is stopped and returns the best solution found so far, if any.
+
+        Args:
+            job_id: Job ID of the solve
+
+        Returns:
+            False if no solve with this job ID is in progress
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def stats(self) -> dict:
+        """Current pool utilization"""
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queued": self._queued,
+            "busy_seconds": self._busy_seconds,
+            "jobs": len(self._jobs),
+        }
+
+
+# Shared executor used by the API routes
+solver_executor = SolverExecutor.from_env()
@@ -0,0 +1,317 @@
+"""
+Combinatorial pre-feasibility check
+Cheap counting bounds evaluated before any model is built, so requests that
+can never be satisfied are rejected without running CP-SAT
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from .constraint_builder import DEFAULT_QUALITY_MAP, DIVERSITY_COLUMNS
+from .models import RequirementViolation, SBCRequirementSet
+from .player_table import PlayerTable
+from .positions import SlotLayout, max_slot_matching, position_classes
+
+# Highest chemistry a single player can contribute
+MAX_PLAYER_CHEMISTRY = 3
+
+
+def check_requirements(
+    table: PlayerTable,
+    requirements: SBCRequirementSet,
+    quality_map: Optional[Dict[str, int]] = None,
+) -> List[RequirementViolation]:
+    """
+    Find requirements that no squad from this pool can satisfy
+
+    Every check is a necessary condition of the model SBCConstraintBuilder
+    builds (counted over distinct players, since each player is used at most
+    once), so an empty result does not prove feasibility but a violation
+    always proves infeasibility.
+
+    Args:
+        table: Columnar player pool
+        requirements: SBC requirements
+        quality_map: Maps quality name to database ID
+
+    Returns:
+        Violated requirements (empty if none was detected)
+    """
+    checker = _Checker(table, requirements.squad_size)
+
+    checker.at_least("squad_size", "players", requirements.squad_size, np.ones(len(table), bool))
+
+    if requirements.required_positions:
+        needed: Dict[int, int] = {}
+        for position_id in requirements.required_positions:
+            needed[position_id] = needed.get(position_id, 0) + 1
+        # Keyed by position ID, not list index, as one check covers every slot
+        # of the position
+        for position_id, count in sorted(needed.items()):
+            checker.at_least(
+                f"required_positions(position_id={position_id})",
+                f"players for position {position_id}",
+                count,
+                table.has_position(position_id),
+            )
+        if not checker.violations:
+            checker.slot_matching(requirements.required_positions)
+
+    for field, column, ids_attr in (
+        ("leagues", "league", "league_ids"),
+        ("countries", "country", "country_ids"),
+        ("clubs", "club", "club_ids"),
+    ):
+        for index, constraint in enumerate(getattr(requirements, field) or []):
+            requirement = f"{field}[{index}]"
+            ids = getattr(constraint, ids_attr)
+            if ids:
+                checker.count(
+                    requirement,
+                    f"players from {column}s {ids}",
+                    constraint.type,
+                    constraint.count,
+                    table.isin(column, ids),
+                )
+            elif constraint.type == "max":
+                checker.per_value_cap(requirement, column, constraint.count)
+            else:
+                checker.single_value(requirement, column, constraint.type, constraint.count)
+
+    for index, constraint in enumerate(requirements.quality or []):
+        quality_id = (quality_map or DEFAULT_QUALITY_MAP).get(constraint.quality)
+        if quality_id is None:
+            continue
+        checker.count(
+            f"quality[{index}]",
+            f"{constraint.quality} players",
+            constraint.type,
+            constraint.count,
+            table.quality == quality_id,
+        )
+
+    for index, constraint in enumerate(requirements.rarity or []):
+        checker.count(
+            f"rarity[{index}]",
+            "rare players" if constraint.rare else "common players",
+            constraint.type,
+            constraint.count,
+            table.rarity > 1 if constraint.rare else table.rarity == 1,
+        )
+
+    if requirements.team_rating:
+        checker.rating(requirements.team_rating.type, requirements.team_rating.value)
+
+    if requirements.chemistry and requirements.chemistry.type != "max":
+        best = MAX_PLAYER_CHEMISTRY * requirements.squad_size
+        if requirements.chemistry.value > best:
+            checker.violate(
+                "chemistry",
+                f"Chemistry {requirements.chemistry.type} {requirements.chemistry.value} "
+                f"exceeds the maximum of {best} for {requirements.squad_size} players",
+                requirements.chemistry.value,
+                best,
+            )
+
+    for index, constraint in enumerate(requirements.diversity or []):
+        checker.distinct_values(
+            f"diversity[{index}]",
+            DIVERSITY_COLUMNS[constraint.attribute],
+            constraint.type,
+            constraint.count,
+        )
+
+    return checker.violations
+
+
+def check_batch_requirements(
+    table: PlayerTable,
+    requirement_sets: List[SBCRequirementSet],
+    quality_map: Optional[Dict[str, int]] = None,
+) -> List[RequirementViolation]:
+    """
+    check_requirements for every squad of a batch, with paths prefixed by
+    the squad index (e.g. 'squads[1].quality[0]')
+    """
+    violations = []
+    for index, requirements in enumerate(requirement_sets):
+        for violation in check_requirements(table, requirements, quality_map):
+            violation.requirement = f"squads[{index}].{violation.requirement}"
+            violations.append(violation)
+    return violations
+
+
+def describe_violations(violations: List[RequirementViolation]) -> str:
+    """One-line summary of violated requirements for response messages"""
+    return "No valid solution exists: " + "; ".join(v.message for v in violations)
+
+
+class _Checker:
+    """Evaluates counting bounds and collects violations"""
+
+    def __init__(self, table: PlayerTable, squad_size: int):
+        self.table = table
+        self.squad_size = squad_size
+        self.violations: List[RequirementViolation] = []
+
+        # Dense 0..P-1 player numbering so distinct counts are a bincount
+        unique_players, self.player_index = np.unique(table.player_id, return_inverse=True)
+        self.num_players = len(unique_players)
+
+    def violate(self, requirement: str, message: str, required: int, available: int) -> None:
+        self.violations.append(
+            RequirementViolation(
+                requirement=requirement, message=message, required=required, available=available
+            )
+        )
+
+    def distinct_players(self, mask: np.ndarray) -> int:
+        """Number of different players among the cards in a mask"""
+        return int(
+            np.count_nonzero(np.bincount(self.player_index[mask], minlength=self.num_players))
+        )
+
+    def at_least(self, requirement: str, what: str, required: int, mask: np.ndarray) -> None:
+        available = self.distinct_players(mask)
+        if available < required:
+            self.violate(
+                requirement,
+                f"Need {required} {what}, only {available} available",
+                required,
+                available,
+            )
+
+    def count(
+        self, requirement: str, what: str, constraint_type: str, required: int, mask: np.ndarray
+    ) -> None:
+        """Min/max/exact number of selected players within a mask"""
+        if constraint_type in ("min", "exact"):
+            self.at_least(requirement, what, required, mask)
+        if constraint_type in ("max", "exact"):
+            # The rest of the squad must come from outside the mask
+            self.at_least(
+                requirement,
+                f"players that are not {what} (at most {required} of them allowed)",
+                self.squad_size - required,
+                ~mask,
+            )
+
+    def players_per_value(self, column: str) -> np.ndarray:
+        """Number of different players for every value of a column"""
+        if len(self.table) == 0:
+            return np.zeros(0, dtype=np.int64)
+        stride = self.num_players
+        values = np.unique(self.table.column(column) * stride + self.player_index) // stride
+        return np.unique(values, return_counts=True)[1]
+
+    def slot_matching(self, required_positions: List[int]) -> None:
+        """Every position slot filled by a different player who can play it"""
+        layout = SlotLayout(required_positions, self.squad_size)
+        masks, class_of = position_classes(self.table, layout)
+        capacity = [self.distinct_players(class_of == c) for c in range(len(masks))]
+        assigned = max_slot_matching(layout, masks.tolist(), capacity)
+        filled = sum(c is not None for c in assigned)
+        if filled < layout.squad_size:
+            self.violate(
+                "required_positions",
+                f"Only {filled} of {layout.squad_size} position slots can be filled "
+                f"by different players",
+                layout.squad_size,
+                filled,
+            )
+
+    def per_value_cap(self, requirement: str, column: str, cap: int) -> None:
+        """At most `cap` players per value of a column"""
+        available = int(np.minimum(self.players_per_value(column), cap).sum())
+        if available < self.squad_size:
+            self.violate(
+                requirement,
+                f"Need {self.squad_size} players with at most {cap} per {column}, "
+                f"only {available} available",
+                self.squad_size,
+                available,
+            )
+
+    def single_value(
+        self, requirement: str, column: str, constraint_type: str, required: int
+    ) -> None:
+        """Whole squad from one value of a column, with a min/exact player count"""
+        if constraint_type == "exact" and required != self.squad_size:
+            self.violate(
+                requirement,
+                f"Exactly {required} players from the same {column} is impossible "
+                f"when all {self.squad_size} must share it",
+                required,
+                self.squad_size,
+            )
+            return
+
+        required = max(required, self.squad_size)
+        available = int(self.players_per_value(column).max(initial=0))
+        if available < required:
+            self.violate(
+                requirement,
+                f"Need {required} players from the same {column}, largest {column} has {available}",
+                required,
+                available,
+            )
+
+    def rating(self, constraint_type: str, value: int) -> None:
+        """Squad rating bound from the best / worst possible squads"""
+        target = value * self.squad_size
+
+        # Lowest and highest rated card of every player
+        order = np.lexsort((self.table.ovr, self.table.player_id))
+        player_id = self.table.player_id[order]
+        ovr = self.table.ovr[order]
+        first = np.flatnonzero(np.r_[True, player_id[1:] != player_id[:-1]])
+        last = np.r_[first[1:], len(order)] - 1
+
+        if constraint_type in ("min", "exact"):
+            best = np.sort(ovr[last])[::-1][: self.squad_size]
+            if len(best) == self.squad_size and best.sum() < target:
+                self.violate(
+                    "team_rating",
+                    f"Squad rating {constraint_type} {value} needs a rating total of {target}, "
+                    f"best possible is {int(best.sum())}",
+                    target,
+                    int(best.sum()),
+                )
+
+        if constraint_type in ("max", "exact"):
+            worst = np.sort(ovr[first])[: self.squad_size]
+            if len(worst) == self.squad_size and worst.sum() > target:
+                self.violate(
+                    "team_rating",
+                    f"Squad rating {constraint_type} {value} allows a rating total of {target}, "
+                    f"lowest possible is {int(worst.sum())}",
+                    target,
+                    int(worst.sum()),
+                )
+
+    def distinct_values(
+        self, requirement: str, column: str, constraint_type: str, required: int
+    ) -> None:
+        """Min/max/exact number of different values of a column in the squad"""
+        sizes = np.sort(self.players_per_value(column))[::-1]
+
+        if constraint_type in ("min", "exact"):
+            available = min(len(sizes), self.squad_size)
+            if available < required:
+                self.violate(
+                    requirement,
+                    f"Need {required} different {column}s, at most {available} possible",
+                    required,
+                    available,
+                )
+
+        if constraint_type in ("max", "exact"):
+            # The squad must fit into the `required` largest groups
+            available = int(sizes[:required].sum())
+            if available < self.squad_size:
+                self.violate(
+                    requirement,
+                    f"Need {self.squad_size} players from at most {required} {column}s, "
+                    f"only {available} available",
+                    self.squad_size,
+                    available,
+                )
@@ -0,0 +1,78 @@
+"""
+Solution hint memory
+Remembers the last good selection per requirement set so repeat SBCs can be
+warm-started with CP-SAT solution hints
+"""
+
+import os
+from collections import OrderedDict
+from typing import List
+
+
+class SolutionHintStore:
+    """LRU map of requirement fingerprint -> last selected ClubPlayer ids"""
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize store
+
+        Args:
+            max_entries: Maximum number of requirement sets remembered
+        """
+        self.max_entries = max_entries
+        self._selections: "OrderedDict[str, List[int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "SolutionHintStore":
+        """
+        Create store configured from environment variables
+
+        SBC_SOLVER_HINT_ENTRIES: remembered requirement sets (default 512, 0 disables)
+        """
+        return cls(max_entries=max(0, int(os.environ.get("SBC_SOLVER_HINT_ENTRIES", "512"))))
+
+    def lookup(self, key: str) -> List[int]:
+        """
+        Last good selection for a requirement set
+
+        Args:
+            key: Requirement fingerprint
+
+        Returns:
+            ClubPlayer ids, or an empty list if nothing is remembered
+        """
+        selection = self._selections.get(key)
+        if selection is None:
+            self.misses += 1
+            return []
+
+        self._selections.move_to_end(key)
+        self.hits += 1
+        return list(selection)
+
+    def remember(self, key: str, selected_ids: List[int]) -> None:
+        """
+        Store a good selection for a requirement set
+
+        Args:
+            key: Requirement fingerprint
+            selected_ids: ClubPlayer ids of the selected squad
+        """
+        if self.max_entries == 0 or not selected_ids:
+            return
+
+        self._selections[key] = list(selected_ids)
+        self._selections.move_to_end(key)
+        while len(self._selections) > self.max_entries:
+            self._selections.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        return {
+            "size": len(self._selections),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,122 @@
+"""
+Per-solve instrumentation
+Stage timings and model statistics for single solves, plus the running
+aggregate the service reports on /stats
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from ortools.sat.python import cp_model
+from .models import SolveStats
+
+# Stages timed inside another stage (explain runs while building the response)
+NESTED_STAGES = {"explain"}
+
+# CP-SAT log line marking the end of its presolve
+SEARCH_START_PATTERN = re.compile(r"^Starting (?:sequential )?search at ([0-9.]+)s")
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per named stage"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block (repeated stages add up)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+class PresolveClock:
+    """
+    CP-SAT log callback that records when presolve finished
+
+    CP-SAT does not report its presolve time in the response, only in the
+    search log ("Starting search at 0.19s"), so the log is captured and
+    scanned for that line.
+    """
+
+    def __init__(self):
+        self.presolve_time: Optional[float] = None
+
+    def __call__(self, line: str) -> None:
+        if self.presolve_time is None:
+            match = SEARCH_START_PATTERN.match(line)
+            if match:
+                self.presolve_time = float(match.group(1))
+
+    def attach(self, solver: cp_model.CpSolver) -> None:
+        """Capture the solver's log without printing it"""
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = self
+
+
+def model_statistics(model: cp_model.CpModel) -> Dict[str, int]:
+    """
+    Size of a CP-SAT model
+
+    Returns:
+        Number of variables, constraints and linear terms
+    """
+    proto = model.Proto()
+    return {
+        "num_variables": len(proto.variables),
+        "num_constraints": len(proto.constraints),
+        "num_linear_terms": sum(len(ct.linear.vars) for ct in proto.constraints),
+    }
+
+
+class StatsAggregator:
+    """Running totals of SolveStats across solves"""
+
+    def __init__(self):
+        self.solves = 0
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._sizes: Dict[str, int] = {}
+
+    def record(self, stats: SolveStats) -> None:
+        """Add one solve's stats"""
+        self.solves += 1
+        for name, seconds in stats.timings.items():
+            stage = self._stages.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            stage["count"] += 1
+            stage["total"] += seconds
+            stage["max"] = max(stage["max"], seconds)
+        for name in (
+            "pool_size",
+            "collapsed_pool_size",
+            "reduced_pool_size",
+            "num_variables",
+            "num_constraints",
+            "num_linear_terms",
+            "fixed_variables",
+        ):
+            self._sizes[name] = self._sizes.get(name, 0) + getattr(stats, name)
+
+    def summary(self) -> dict:
+        """Average and maximum seconds per stage, and average model size"""
+        return {
+            "solves": self.solves,
+            "stages": {
+                name: {
+                    "count": int(stage["count"]),
+                    "avg": stage["total"] / stage["count"],
+                    "max": stage["max"],
+                }
+                for name, stage in self._stages.items()
+            },
+            "avg_model": {
+                name: total / self.solves for name, total in self._sizes.items()
+            },
+        }
@@ -0,0 +1,248 @@
+"""
+Asynchronous solve jobs
+Long solves are submitted once and polled for their result, instead of holding
+an HTTP connection open for the whole search
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from .models import (
+    SolveSBCRequest,
+    SolveSBCResponse,
+    SolveProgress,
+    SolveJobInfo,
+    SolvePriority,
+)
+from .executor import SolverBusyError
+from .player_table import PlayerTable
+from .service import SolveService, solve_service
+
+
+class SolveJobNotFoundError(Exception):
+    """Raised when a job ID is unknown or its result has expired"""
+
+
+class SolveJobConflictError(Exception):
+    """Raised when a job ID is already taken"""
+
+
+class SolveJob:
+    """A submitted solve and its timings"""
+
+    def __init__(self, request: SolveSBCRequest):
+        self.job_id: str = request.job_id
+        self.priority: SolvePriority = request.priority
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: Optional[SolveProgress] = None
+        self.response: Optional[SolveSBCResponse] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """Seconds between submission and leaving the queue"""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_time(self) -> Optional[float]:
+        """Seconds between leaving the queue and finishing"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def info(self) -> SolveJobInfo:
+        """Summary of this job"""
+        return SolveJobInfo(
+            job_id=self.job_id,
+            status=self.status,
+            priority=self.priority,
+            submitted_at=self.submitted_at,
+            queue_wait=self.queue_wait,
+            run_time=self.run_time,
+            progress=self.progress,
+            result_status=self.response.status if self.response else None,
+            error=self.error,
+        )
+
+
+class SolveJobManager:
+    """
+    In-memory queue of asynchronous solve jobs
+
+    Jobs are dispatched through the solve service right away and wait for a
+    worker in the executor's priority queue. Finished jobs are kept for
+    `retention_seconds`; the oldest finished job is dropped once `max_jobs`
+    is reached, and new jobs are rejected while all of them are still
+    queued or running.
+    """
+
+    def __init__(self, service: SolveService, max_jobs: int, retention_seconds: float):
+        """
+        Initialize manager
+
+        Args:
+            service: Solve service that runs the jobs
+            max_jobs: Maximum number of jobs kept in memory
+            retention_seconds: Seconds a finished job's result is kept
+        """
+        self.service = service
+        self.max_jobs = max_jobs
+        self.retention_seconds = retention_seconds
+        self._jobs: "OrderedDict[str, SolveJob]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls, service: SolveService) -> "SolveJobManager":
+        """
+        Create manager configured from environment variables
+
+        SBC_SOLVER_MAX_JOBS: maximum stored jobs (default 1000)
+        SBC_SOLVER_JOB_RETENTION: seconds finished jobs are kept (default 3600)
+        """
+        return cls(
+            service,
+            max_jobs=max(1, int(os.environ.get("SBC_SOLVER_MAX_JOBS", "1000"))),
+            retention_seconds=float(os.environ.get("SBC_SOLVER_JOB_RETENTION", "3600")),
+        )
+
+    def submit(
+        self,
+        request: SolveSBCRequest,
+        table: Optional[PlayerTable] = None,
+        received_at: Optional[float] = None,
+    ) -> SolveJobInfo:
+        """
+        Queue a solve
+
+        Args:
+            request: SBC solve request with players resolved and job_id set
+            table: Prebuilt table of request.available_players (e.g. from a stored pool)
+            received_at: time.perf_counter() when the HTTP request arrived
+
+        Returns:
+            Info for the new job
+
+        Raises:
+            SolverBusyError: If the worker pool queue is full, or max_jobs jobs
+                are queued or running
+            SolveJobConflictError: If a job with this ID is still stored
+        """
+        self._expire()
+        if request.job_id in self._jobs:
+            raise SolveJobConflictError(f"Job {request.job_id} already exists")
+        self.service.executor.check_capacity()
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.task.done()]
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0)]
+        if len(self._jobs) >= self.max_jobs:
+            raise SolverBusyError(f"Job store is full ({len(self._jobs)} jobs in progress)")
+
+        job = SolveJob(request)
+        job.task = asyncio.create_task(self._run(job, request, table, received_at))
+        self._jobs[job.job_id] = job
+        return job.info()
+
+    async def _run(
+        self,
+        job: SolveJob,
+        request: SolveSBCRequest,
+        table: Optional[PlayerTable],
+        received_at: Optional[float],
+    ) -> None:
+        """Run a job to completion and record its outcome"""
+
+        def on_start() -> None:
+            job.status = "running"
+            job.started_at = time.time()
+
+        def on_progress(progress: SolveProgress) -> None:
+            job.progress = progress
+
+        try:
+            job.response = await self.service.solve(
+                request, table, on_progress, on_start, received_at
+            )
+            job.status = "cancelled" if job.response.status == "CANCELLED" else "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            if job.started_at is None:
+                # Answered from the cache or never left the queue
+                job.started_at = job.finished_at
+
+    def get(self, job_id: str) -> SolveJob:
+        """
+        Look up a job
+
+        Raises:
+            SolveJobNotFoundError: If the job does not exist or has expired
+        """
+        self._expire()
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise SolveJobNotFoundError(f"Job {job_id} not found")
+        return job
+
+    def cancel(self, job_id: str) -> SolveJobInfo:
+        """
+        Cancel a queued or running job (no-op if it has already finished)
+
+        Raises:
+            SolveJobNotFoundError: If the job does not exist or has expired
+        """
+        job = self.get(job_id)
+        self.service.cancel(job_id)
+        return job.info()
+
+    def _expire(self) -> None:
+        """Drop finished jobs older than the retention window"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> dict:
+        """Job counts by status and average timings by priority"""
+        self._expire()
+        by_status: Dict[str, int] = {}
+        timings: Dict[str, Dict[str, List[float]]] = {}
+        for job in self._jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+            if job.finished_at is None:
+                continue
+            priority = timings.setdefault(job.priority, {"queue_wait": [], "run_time": []})
+            priority["queue_wait"].append(job.queue_wait)
+            priority["run_time"].append(job.run_time)
+
+        return {
+            "jobs": len(self._jobs),
+            "max_jobs": self.max_jobs,
+            "retention_seconds": self.retention_seconds,
+            "by_status": by_status,
+            "finished": {
+                priority: {
+                    "count": len(values["run_time"]),
+                    "avg_queue_wait": sum(values["queue_wait"]) / len(values["queue_wait"]),
+                    "avg_run_time": sum(values["run_time"]) / len(values["run_time"]),
+                }
+                for priority, values in timings.items()
+            },
+        }
+
+
+# Shared job manager used by the API routes
+solve_job_manager = SolveJobManager.from_env(solve_service)
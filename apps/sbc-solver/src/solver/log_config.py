@@ -0,0 +1,99 @@
+"""
+Logging setup for the solver service
+Solver modules log through standard leveled loggers. Records are put on an
+in-memory queue by the calling thread and written to stderr by a background
+listener, so a solve never blocks on terminal or pipe I/O
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Parent logger of every solver module (src.solver.*)
+SOLVER_LOGGER = __name__.rsplit(".", 1)[0]
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(processName)s] %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, for log collectors"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.processName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for a queue read in the same process
+
+    Merges the message arguments on the logging thread, but keeps exc_info
+    (which QueueHandler folds into the message) so the output formatter
+    decides how tracebacks are written.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging() -> None:
+    """
+    Route solver logs through a queue handler (once per process)
+
+    Called in the API process and in every worker process.
+
+    SBC_SOLVER_LOG_LEVEL: DEBUG, INFO, WARNING or ERROR (default INFO);
+        DEBUG adds per-constraint diagnostics that cost extra work per solve
+    SBC_SOLVER_LOG_FORMAT: text or json (default text)
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    if os.environ.get("SBC_SOLVER_LOG_FORMAT", "text").lower() == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    logger = logging.getLogger(SOLVER_LOGGER)
+    logger.setLevel(os.environ.get("SBC_SOLVER_LOG_LEVEL", "INFO").upper())
+    logger.addHandler(_LocalQueueHandler(log_queue))
+    logger.propagate = False
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    logger = logging.getLogger(SOLVER_LOGGER)
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
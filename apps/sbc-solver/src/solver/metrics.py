@@ -0,0 +1,240 @@
+"""
+Prometheus metrics for the solver service
+A small in-process registry rendered in the Prometheus text exposition
+format (version 0.0.4), so /metrics needs no client library or sidecar
+"""
+
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from .models import SolveStats
+
+# Content type of the Prometheus text format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram buckets (upper bounds, +Inf is implied)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+BUILD_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+IMPROVEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """A named metric family with optional labels"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _format_labels(self, values: LabelValues, extra: Iterable[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labels, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{self._format_labels(key)} {_number(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Sampled(_Metric):
+    """Gauge or counter read from a callback at scrape time"""
+
+    def __init__(
+        self, name: str, documentation: str, read: Callable[[], float], kind: str = "gauge"
+    ):
+        super().__init__(name, documentation)
+        self._read = read
+        self.kind = kind
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name} {_number(self._read())}"]
+
+
+class Histogram(_Metric):
+    """Observation counts per bucket, plus their sum and count, per label set"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labels: Sequence[str] = (),
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}  # bucket counts, then sum
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1  # +Inf bucket = count
+            series[-1] += value
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            bounds = [_number(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, series[:-1]):
+                labels = self._format_labels(key, [("le", bound)])
+                lines.append(f"{self.name}_bucket{labels} {_number(count)}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {_number(series[-2])}")
+        return lines
+
+
+class SolverMetrics:
+    """Metrics recorded by the API routes, the solve service and the executor"""
+
+    def __init__(self):
+        self.http_requests = Counter(
+            "sbc_solver_http_requests_total",
+            "HTTP requests handled, by route handler and status code",
+            ("handler", "method", "status"),
+        )
+        self.solve_duration = Histogram(
+            "sbc_solver_solve_duration_seconds",
+            "End-to-end solve latency in the service, by solve kind and outcome",
+            LATENCY_BUCKETS,
+            ("kind", "status"),
+        )
+        self.time_to_first_solution = Histogram(
+            "sbc_solver_time_to_first_solution_seconds",
+            "Seconds from the start of the CP-SAT search to its first solution",
+            LATENCY_BUCKETS,
+        )
+        self.improvements = Histogram(
+            "sbc_solver_solution_improvements",
+            "Improving solutions found per solve",
+            IMPROVEMENT_BUCKETS,
+        )
+        self.model_build = Histogram(
+            "sbc_solver_model_build_seconds",
+            "Seconds spent building the CP-SAT model per solve",
+            BUILD_BUCKETS,
+        )
+        self._sampled: List[Sampled] = []
+
+    def add_sampled(
+        self, name: str, documentation: str, read: Callable[[], float], kind: str = "gauge"
+    ) -> None:
+        """Register a value read at scrape time (e.g. active solves)"""
+        self._sampled.append(Sampled(name, documentation, read, kind))
+
+    def watch_executor(self, executor) -> None:
+        """
+        Sample the worker pool's load on every scrape
+
+        Args:
+            executor: SolverExecutor (anything with a compatible stats())
+        """
+        self.add_sampled(
+            "sbc_solver_active_solves",
+            "Solves currently running in a worker",
+            lambda: executor.stats()["active"],
+        )
+        self.add_sampled(
+            "sbc_solver_queued_solves",
+            "Solves waiting for a free worker",
+            lambda: executor.stats()["queued"],
+        )
+        self.add_sampled(
+            "sbc_solver_workers",
+            "Worker processes (maximum concurrent solves)",
+            lambda: executor.stats()["workers"],
+        )
+        self.add_sampled(
+            "sbc_solver_worker_utilization",
+            "Fraction of workers currently running a solve",
+            lambda: executor.stats()["active"] / executor.stats()["workers"],
+        )
+        self.add_sampled(
+            "sbc_solver_worker_busy_seconds_total",
+            "Worker-seconds spent running solves (rate() / workers gives utilization)",
+            lambda: executor.stats()["busy_seconds"],
+            kind="counter",
+        )
+
+    def observe_solve(self, kind: str, status: str, seconds: float) -> None:
+        """Record a finished solve request"""
+        self.solve_duration.observe(seconds, kind=kind, status=status)
+
+    def observe_stats(self, stats: SolveStats) -> None:
+        """Record the worker-side measurements of a solve"""
+        if stats.first_solution_time is not None:
+            self.time_to_first_solution.observe(stats.first_solution_time)
+        self.improvements.observe(stats.improvements)
+        model_build: Optional[float] = stats.timings.get("model_build")
+        if model_build is not None:
+            self.model_build.observe(model_build)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        families: List[_Metric] = [
+            self.http_requests,
+            self.solve_duration,
+            self.time_to_first_solution,
+            self.improvements,
+            self.model_build,
+            *self._sampled,
+        ]
+        lines: List[str] = []
+        for family in families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Shared metrics registry
+solver_metrics = SolverMetrics()
@@ -3,13 +3,21 @@ Pydantic models for SBC solver
 These models mirror the TypeScript interfaces in libs/shared-types
 """
 
-from typing import List, Optional, Literal, Dict
+from typing import Annotated, List, Optional, Literal, Dict
 from pydantic import BaseModel, Field
 
+# Positions are stored as a bitmask, one bit per position ID
+MAX_POSITION_ID = 62
+
 # Type aliases
+PositionId = Annotated[int, Field(ge=0, le=MAX_POSITION_ID)]
 ConstraintType = Literal["min", "max", "exact"]
 QualityType = Literal["bronze", "silver", "gold", "special"]
-SolverStatus = Literal["OPTIMAL", "FEASIBLE", "INFEASIBLE", "MODEL_INVALID", "TIMEOUT"]
+SolvePriority = Literal["interactive", "bulk"]
+JobStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+SolverStatus = Literal[
+    "OPTIMAL", "FEASIBLE", "INFEASIBLE", "MODEL_INVALID", "TIMEOUT", "CANCELLED"
+]
 
 
 class LeagueConstraint(BaseModel):
@@ -103,7 +111,7 @@ class SBCRequirementSet(BaseModel):
     """
 
     squad_size: int
-    required_positions: Optional[List[int]] = (
+    required_positions: Optional[List[PositionId]] = (
         None  # Array of position IDs, one per squad slot
     )
     leagues: Optional[List[LeagueConstraint]] = None
@@ -146,17 +154,33 @@ class SolverPlayer(BaseModel):
         populate_by_name = True  # Allow both camelCase and snake_case
 
 
-class SolveSBCRequest(BaseModel):
+class SolveSBCRequestBase(BaseModel):
     """
-    Request to solve an SBC
+    Players and search options shared by single and batch solve requests
     """
 
-    requirements: SBCRequirementSet
-    available_players: List[SolverPlayer]
+    available_players: List[SolverPlayer] = Field(default_factory=list)
+    pool_id: Optional[str] = Field(
+        default=None,
+        alias="poolId",
+        description="ID of an uploaded player pool to use instead of available_players",
+    )
     max_solve_time: int = Field(default=60, description="Maximum solve time in seconds")
     no_improvement_time: int = Field(
         default=30, description="Stop if no improvement for this many seconds"
     )
+    relative_gap: Optional[float] = Field(
+        default=None,
+        alias="relativeGap",
+        ge=0,
+        description="Stop once the best squad costs at most this fraction more than "
+        "the best possible squad (e.g. 0.01 = within 1%)",
+    )
+    target_objective: Optional[int] = Field(
+        default=None,
+        alias="targetObjective",
+        description="Stop as soon as a squad costs at most this much",
+    )
     quality_map: Optional[Dict[str, int]] = Field(
         default=None,
         alias="qualityMap",
@@ -165,11 +189,137 @@ class SolveSBCRequest(BaseModel):
     rarity_map: Optional[Dict[str, int]] = Field(
         default=None, alias="rarityMap", description="Maps rarity name to database ID"
     )
+    reduce_pool: bool = Field(
+        default=True,
+        alias="reducePool",
+        description="Drop cards dominated by cheaper interchangeable cards before solving",
+    )
+    job_id: Optional[str] = Field(
+        default=None,
+        alias="jobId",
+        description="Client-chosen ID for cancelling this solve (generated if omitted)",
+    )
+    priority: SolvePriority = Field(
+        default="interactive",
+        description="Queue priority; interactive solves run before bulk ones",
+    )
+    deadline: Optional[float] = Field(
+        default=None,
+        description="Seconds after submission by which the solve must finish",
+    )
 
     class Config:
         populate_by_name = True  # Allow both camelCase and snake_case
 
 
+class SolveSBCRequest(SolveSBCRequestBase):
+    """
+    Request to solve an SBC
+    """
+
+    requirements: SBCRequirementSet
+    hint_player_ids: Optional[List[int]] = Field(
+        default=None,
+        alias="hintPlayerIds",
+        description="ClubPlayer ids of a known good selection to warm-start the search",
+    )
+    include_stats: bool = Field(
+        default=False,
+        alias="includeStats",
+        description="Return per-stage timings and model statistics in the response",
+    )
+    alternatives: int = Field(
+        default=0,
+        ge=0,
+        le=10,
+        description="Number of alternative squads to return after the best one",
+    )
+    min_difference: int = Field(
+        default=1,
+        ge=1,
+        alias="minDifference",
+        description="Cards in which every returned squad differs from every other",
+    )
+
+
+class RequirementViolation(BaseModel):
+    """
+    A requirement that no squad from the pool can satisfy
+    """
+
+    requirement: str = Field(
+        description=(
+            "Path of the requirement in the requirement set, e.g. 'leagues[0]', or "
+            "'required_positions(position_id=3)' for the slots of one position"
+        )
+    )
+    message: str
+    required: int
+    available: int
+
+
+class SolveStats(BaseModel):
+    """
+    Where a solve spent its time and how large its model was
+    """
+
+    timings: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Seconds per stage: parse, prepare, queue_wait, transfer (API process); "
+        "table, feasibility, presolve, model_build, cpsat_presolve, search, explain, "
+        "response (worker)",
+    )
+    requirement_times: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Seconds spent building the constraints of each requirement",
+    )
+    pool_size: int = Field(default=0, description="Cards in the request")
+    collapsed_pool_size: int = Field(
+        default=0, description="Cards left after merging duplicates of the same player"
+    )
+    reduced_pool_size: int = Field(default=0, description="Cards in the model")
+    num_variables: int = 0
+    num_constraints: int = 0
+    num_linear_terms: int = 0
+    first_solution_time: Optional[float] = Field(
+        default=None,
+        description="Seconds from the start of the CP-SAT search to its first solution",
+    )
+    improvements: int = Field(default=0, description="Improving solutions found")
+    fixed_variables: int = Field(
+        default=0,
+        description="Selection variables of template cards missing from the pool, fixed "
+        "to 0; counted in num_variables, but a model built for the pool alone has none",
+    )
+    template_hit: Optional[bool] = Field(
+        default=None,
+        description="Whether the model came from a cached template (None if templates are off)",
+    )
+
+
+class SlotAssignment(BaseModel):
+    """
+    The squad slot a selected player fills
+    """
+
+    slot: int = Field(description="Index into required_positions (free slots follow them)")
+    position_id: Optional[int] = Field(
+        default=None, description="Position the slot requires (None for free slots)"
+    )
+    player_id: int
+
+
+class AlternativeSquad(BaseModel):
+    """
+    A next best squad, returned alongside the best one
+    """
+
+    selected_player_ids: List[int]
+    slot_assignments: Optional[List[SlotAssignment]] = None
+    squad_rating: float
+    objective: int = Field(description="Cost of the squad")
+
+
 class SolveSBCResponse(BaseModel):
     """
     Response from SBC solver
@@ -178,7 +328,152 @@ class SolveSBCResponse(BaseModel):
     success: bool
     status: SolverStatus
     selected_player_ids: Optional[List[int]] = None
+    slot_assignments: Optional[List[SlotAssignment]] = Field(
+        default=None, description="Slot filled by every selected player, by slot"
+    )
     squad_rating: Optional[float] = None
     chemistry: Optional[int] = None
     solve_time: Optional[float] = None
+    objective: Optional[int] = Field(default=None, description="Cost of the squad")
+    objective_gap: Optional[float] = Field(
+        default=None,
+        description="Relative gap between the squad's cost and the best possible cost "
+        "when the search stopped (0 = proven optimal)",
+    )
     message: Optional[str] = None
+    violations: Optional[List[RequirementViolation]] = Field(
+        default=None, description="Requirements found impossible before solving"
+    )
+    conflicting_requirements: Optional[List[str]] = Field(
+        default=None,
+        description="Minimal set of requirement paths that cannot be met together "
+        "(e.g. ['team_rating', 'quality[0]']), for INFEASIBLE solves",
+    )
+    job_id: Optional[str] = None
+    cached: bool = Field(
+        default=False, description="True if this response was served from the result cache"
+    )
+    stats: Optional[SolveStats] = Field(
+        default=None,
+        description="Stage timings and model size (if requested; not set for cached responses)",
+    )
+    alternatives: Optional[List[AlternativeSquad]] = Field(
+        default=None,
+        description="Next best squads by cost (if requested), each differing from every "
+        "other returned squad by at least min_difference cards",
+    )
+
+
+class SolveSBCBatchRequest(SolveSBCRequestBase):
+    """
+    Request to solve several SBCs jointly from one player pool
+    Each card is used in at most one squad
+    """
+
+    squads: List[SBCRequirementSet] = Field(min_length=1)
+
+
+class BatchSquadSolution(BaseModel):
+    """
+    Selected squad for one requirement set of a batch
+    """
+
+    selected_player_ids: List[int]
+    slot_assignments: Optional[List[SlotAssignment]] = None
+    squad_rating: float
+
+
+class SolveSBCBatchResponse(BaseModel):
+    """
+    Response from the joint SBC solver
+    Squads are in the same order as the request's requirement sets
+    """
+
+    success: bool
+    status: SolverStatus
+    squads: Optional[List[BatchSquadSolution]] = None
+    total_cost: Optional[int] = None
+    solve_time: Optional[float] = None
+    message: Optional[str] = None
+    violations: Optional[List[RequirementViolation]] = Field(
+        default=None,
+        description="Requirements found impossible before solving (paths prefixed with squads[i].)",
+    )
+    job_id: Optional[str] = None
+
+
+class SolveProgress(BaseModel):
+    """
+    Improving solution reported while a solve is still running
+    """
+
+    solution: int = Field(description="Number of this solution within the search")
+    objective: float
+    bound: float = Field(description="Best proven lower bound on the objective so far")
+    elapsed: float = Field(description="Seconds since the search started")
+    selected_player_ids: List[int]
+
+
+class SolveJobInfo(BaseModel):
+    """
+    State of an asynchronous solve job
+    """
+
+    job_id: str
+    status: JobStatus
+    priority: SolvePriority
+    submitted_at: float = Field(description="Unix time the job was submitted")
+    queue_wait: Optional[float] = Field(
+        default=None, description="Seconds spent waiting for a free worker"
+    )
+    run_time: Optional[float] = Field(
+        default=None, description="Seconds from leaving the queue to finishing"
+    )
+    progress: Optional[SolveProgress] = Field(
+        default=None, description="Best solution found so far while running"
+    )
+    result_status: Optional[SolverStatus] = None
+    error: Optional[str] = None
+
+
+class CreatePlayerPoolRequest(BaseModel):
+    """
+    Request to upload a player pool once for reuse across solves
+    """
+
+    players: List[SolverPlayer]
+
+
+class PlayerPoolDelta(BaseModel):
+    """
+    Incremental changes to an uploaded player pool
+    - add: new cards (replaces any card with the same id)
+    - update: replacement data for existing cards
+    - remove: ClubPlayer ids to drop (e.g. cards consumed by a submitted squad)
+    """
+
+    add: List[SolverPlayer] = Field(default_factory=list)
+    update: List[SolverPlayer] = Field(default_factory=list)
+    remove: List[int] = Field(default_factory=list)
+    base_version: Optional[int] = Field(
+        default=None,
+        alias="baseVersion",
+        description="Reject the delta if the pool is no longer at this version",
+    )
+
+    class Config:
+        populate_by_name = True  # Allow both camelCase and snake_case
+
+
+class PlayerPoolInfo(BaseModel):
+    """
+    Summary of an uploaded player pool
+    """
+
+    pool_id: str
+    version: int
+    size: int
+    missing_ids: List[int] = Field(
+        default_factory=list,
+        description="Ids from the last delta's update/remove lists that were not in the pool",
+    )
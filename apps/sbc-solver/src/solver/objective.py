@@ -3,62 +3,119 @@ Objective function for SBC solver
 Goal: Minimize use of high-rated players and avoid squad players
 """
 
-from typing import List
+import logging
+from typing import List, Sequence
+import numpy as np
 from ortools.sat.python import cp_model
-from .models import SolverPlayer
+from .player_table import PlayerTable
+
+logger = logging.getLogger(__name__)
+
+# Penalty added to the cost of players in the active squad
+SQUAD_PENALTY = 1000
+
+
+def player_costs(table: PlayerTable) -> np.ndarray:
+    """
+    Cost of selecting each player
+
+    Strategy:
+    1. Penalize high OVR players more (base cost = rating)
+    2. Heavily penalize squad players (want to avoid using them)
+
+    Args:
+        table: Columnar player pool
+
+    Returns:
+        Integer cost per player index
+    """
+    # Base cost is the player's overall rating
+    # This naturally prefers lower-rated players
+    costs = table.ovr.copy()
+
+    # Heavy penalty for squad players - we NEVER want to use them
+    # This ensures they are only selected if absolutely no other option exists
+    costs[table.squad] += SQUAD_PENALTY
+
+    # No penalty for SBC storage - treat them the same as regular club players
+    # We want to use the lowest-rated players regardless of storage location
+
+    return costs
+
+
+def selection_cost(table: PlayerTable, selected_ids: Sequence[int]) -> int:
+    """
+    Objective value of a selection
+
+    Args:
+        table: Columnar player pool containing the selection
+        selected_ids: ClubPlayer ids of the selected players
+
+    Returns:
+        Total cost of the selected players
+    """
+    costs = player_costs(table)
+    return int(costs[np.isin(table.id, selected_ids)].sum())
 
 
 def build_objective(
     model: cp_model.CpModel,
     player_vars: List[cp_model.IntVar],
-    players: List[SolverPlayer]
+    table: PlayerTable
 ) -> None:
     """
     Build the objective function to minimize use of high-rated players
 
-    Strategy:
-    1. Penalize high OVR players more (base cost = rating)
-    2. Heavily penalize squad players (want to avoid using them)
-    3. Slightly penalize SBC storage players (prefer using club players)
-
     Args:
         model: CP-SAT model
         player_vars: Binary variables for player selection
-        players: List of available players
+        table: Columnar player pool
     """
+    costs = player_costs(table)
 
-    costs = []
+    # Debug: Show cost breakdown for lowest-rated players
+    # (sorting the whole pool is skipped unless debugging)
+    if logger.isEnabledFor(logging.DEBUG):
+        cheapest = np.argsort(costs, kind="stable")[:10]
+        for i in cheapest.tolist():
+            player = table.players[i]
+            squad_flag = " [SQUAD]" if player.squad else ""
+            sbc_flag = " [SBC]" if player.sbc else ""
+            logger.debug(
+                "Lowest cost: %s (OVR %d, quality_id=%d): cost=%d%s%s",
+                player.display_name,
+                player.ovr,
+                player.quality_id,
+                costs[i],
+                squad_flag,
+                sbc_flag,
+            )
 
-    for i, player in enumerate(players):
-        # Base cost is the player's overall rating
-        # This naturally prefers lower-rated players
-        cost = player.ovr
+    # Create the objective: minimize total cost
+    total_cost = cp_model.LinearExpr.WeightedSum(player_vars, costs.tolist())
 
-        # Heavy penalty for squad players - we NEVER want to use them
-        # This ensures they are only selected if absolutely no other option exists
-        if player.squad:
-            cost += 1000  # Very high penalty to effectively exclude squad players
+    model.Minimize(total_cost)
 
-        # No penalty for SBC storage - treat them the same as regular club players
-        # We want to use the lowest-rated players regardless of storage location
 
-        costs.append(cost)
+def build_batch_objective(
+    model: cp_model.CpModel,
+    squad_vars: List[List[cp_model.IntVar]],
+    table: PlayerTable
+) -> None:
+    """
+    Build the objective for a joint multi-squad solve: minimize the total
+    cost of every squad
 
-    # Debug: Show cost breakdown for lowest-rated players
-    sorted_players = sorted(
-        [(i, p, costs[i]) for i, p in enumerate(players)],
-        key=lambda x: x[2]  # Sort by cost
-    )
-    print("\nObjective function - 10 lowest cost players:")
-    for i, player, cost in sorted_players[:10]:
-        squad_flag = " [SQUAD]" if player.squad else ""
-        sbc_flag = " [SBC]" if player.sbc else ""
-        print(f"  {player.display_name} (OVR {player.ovr}, quality_id={player.quality_id}): cost={cost}{squad_flag}{sbc_flag}")
+    Args:
+        model: CP-SAT model
+        squad_vars: Binary selection variables per squad, one per player
+        table: Columnar player pool
+    """
+    costs = player_costs(table).tolist()
 
-    # Create the objective: minimize total cost
-    total_cost = sum(
-        player_vars[i] * costs[i]
-        for i in range(len(players))
+    total_cost = cp_model.LinearExpr.WeightedSum(
+        [var for player_vars in squad_vars for var in player_vars],
+        costs * len(squad_vars),
     )
 
     model.Minimize(total_cost)
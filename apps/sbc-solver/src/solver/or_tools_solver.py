@@ -2,59 +2,137 @@
 Main SBC solver using Google OR-Tools CP-SAT
 """
 
+import logging
 import time
-import threading
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
 from ortools.sat.python import cp_model
-from .models import SolveSBCRequest, SolveSBCResponse
+from .models import (
+    AlternativeSquad,
+    BatchSquadSolution,
+    SBCRequirementSet,
+    SlotAssignment,
+    SolveSBCBatchRequest,
+    SolveSBCBatchResponse,
+    SolveSBCRequest,
+    SolveSBCResponse,
+    SolveProgress,
+    SolveStats,
+)
+from .cache import requirements_fingerprint
 from .constraint_builder import SBCConstraintBuilder
-from .objective import build_objective
+from .deadlines import Timer, deadline_scheduler
+from .objective import build_batch_objective, build_objective, player_costs
+from .instrumentation import PresolveClock, StageTimer, model_statistics
+from .player_table import PlayerTable
+from .feasibility import check_batch_requirements, check_requirements, describe_violations
+from .positions import SlotLayout, assign_slots
+from .presolve import collapse_duplicates, reduce_batch_pool, reduce_pool
+from .templates import ModelTemplate, TemplateCache
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the cancel event while CP-SAT is searching
+# (a multiprocessing manager event cannot notify, so it is polled)
+CANCEL_POLL_INTERVAL = 0.05
+
+# Upper bound on the seconds spent explaining an infeasible request (also
+# bounded by what is left of the request's time limit and deadline)
+MAX_EXPLAIN_TIME = 10.0
+
+# Minimum seconds of search for each alternative squad, even once the
+# request's time budget is used up by the main search
+MIN_ALTERNATIVE_TIME = 1.0
+
+# Response message suffix for searches stopped before proving optimality
+STOP_MESSAGES = {
+    "no_improvement": "no improvement within the time limit",
+    "target_objective": "target objective reached",
+    "relative_gap": "within the requested gap of the best possible cost",
+    "deadline": "request deadline reached",
+}
+
+
+def _relative_gap(solver: cp_model.CpSolver) -> float:
+    """Gap between the best objective and the best bound, as CP-SAT defines it"""
+    objective = solver.ObjectiveValue()
+    return abs(objective - solver.BestObjectiveBound()) / max(1.0, abs(objective))
 
 
 class SolutionPrinter(cp_model.CpSolverSolutionCallback):
     """
     Callback to track solution progress and improvements
-    Implements automatic stopping after no improvement timeout
+    Implements automatic stopping after no improvement timeout (fired by the
+    shared deadline scheduler), or once a solution reaches a target objective
     """
 
-    def __init__(self, log_callback: Callable[[str], None], no_improvement_time: int):
+    def __init__(
+        self,
+        log_callback: Callable[[str], None],
+        no_improvement_time: int,
+        progress_callback: Optional[Callable[[SolveProgress], None]] = None,
+        player_vars=None,
+        table: Optional[PlayerTable] = None,
+        target_objective: Optional[int] = None,
+    ):
         cp_model.CpSolverSolutionCallback.__init__(self)
         self.log_callback = log_callback
+        self.progress_callback = progress_callback
+        self.player_vars = player_vars
+        self.table = table
         self.solution_count = 0
         self.start_time = time.time()
-        self.last_improvement_time = time.time()
+        self.last_improvement_time = time.monotonic()
         self.no_improvement_time = no_improvement_time
+        self.target_objective = target_objective
         self.best_objective = None
+        self.first_solution_time: Optional[float] = None
+        self.stop_reason: Optional[str] = None
         self.stop_requested = False
-        self._start_timeout_monitor()
-
-    def _start_timeout_monitor(self):
-        """Start a background thread to monitor for no-improvement timeout"""
-
-        def monitor():
-            while not self.stop_requested:
-                time.sleep(1)  # Check every second
-
-                # Only check timeout if we've found at least one solution
-                if self.solution_count > 0:
-                    time_since_improvement = time.time() - self.last_improvement_time
-                    if time_since_improvement >= self.no_improvement_time:
-                        self.log_callback(
-                            f"⏱️  No improvement for {self.no_improvement_time}s, stopping search..."
-                        )
-                        self.stop_requested = True
-                        self.StopSearch()
-                        break
-
-        self.monitor_thread = threading.Thread(target=monitor, daemon=True)
-        self.monitor_thread.start()
+        self._no_improvement_timer: Optional[Timer] = None
+
+    def _check_no_improvement(self) -> None:
+        """Scheduler callback: stop if the last improvement is too old, else check again later"""
+        if self.stop_requested:
+            return
+        due = self.last_improvement_time + self.no_improvement_time
+        if time.monotonic() < due:
+            # Improved since this check was scheduled
+            self._no_improvement_timer = deadline_scheduler.call_at(
+                due, self._check_no_improvement
+            )
+            return
+        self.log_callback(
+            f"⏱️  No improvement for {self.no_improvement_time}s, stopping search..."
+        )
+        self.request_stop("no_improvement")
+
+    def request_stop(self, reason: str) -> None:
+        """Stop the search (from the solver thread or the deadline scheduler)"""
+        if self.stop_requested:
+            return
+        self.stop_reason = reason
+        self.stop_requested = True
+        self.StopSearch()
+
+    def finish(self) -> None:
+        """Cancel pending stops once the search has returned"""
+        self.stop_requested = True
+        if self._no_improvement_timer is not None:
+            self._no_improvement_timer.cancel()
 
     def on_solution_callback(self):
         """Called each time a new solution is found"""
         self.solution_count += 1
-        current_time = time.time()
-        elapsed = current_time - self.start_time
-        self.last_improvement_time = current_time  # Reset the no-improvement timer
+        elapsed = time.time() - self.start_time
+        self.last_improvement_time = time.monotonic()  # Reset the no-improvement timer
+        if self.first_solution_time is None:
+            self.first_solution_time = elapsed
+            # Only stop for lack of improvement once there is a solution
+            self._no_improvement_timer = deadline_scheduler.call_at(
+                self.last_improvement_time + self.no_improvement_time,
+                self._check_no_improvement,
+            )
 
         objective = self.ObjectiveValue()
         self.best_objective = objective
@@ -64,18 +142,66 @@ class SolutionPrinter(cp_model.CpSolverSolutionCallback):
             f"(objective: {objective})"
         )
 
+        if self.progress_callback is not None:
+            selected = [
+                i for i, var in enumerate(self.player_vars) if self.BooleanValue(var)
+            ]
+            self.progress_callback(
+                SolveProgress(
+                    solution=self.solution_count,
+                    objective=objective,
+                    bound=self.BestObjectiveBound(),
+                    elapsed=elapsed,
+                    selected_player_ids=self.table.id[selected].tolist(),
+                )
+            )
+
+        if self.target_objective is not None and objective <= self.target_objective:
+            self.log_callback(
+                f"🎯 Objective {objective} reached target {self.target_objective}, stopping search..."
+            )
+            self.request_stop("target_objective")
+
 
 class SBCSolver:
     """Main SBC solver using CP-SAT"""
 
-    def __init__(self, log_callback: Optional[Callable[[str], None]] = None):
+    def __init__(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        num_search_workers: int = 8,
+        progress_callback: Optional[Callable[[SolveProgress], None]] = None,
+        cancel_event=None,
+        model_path: Optional[str] = None,
+        deadline: Optional[float] = None,
+        templates: Optional[TemplateCache] = None,
+    ):
         """
         Initialize solver
 
         Args:
-            log_callback: Optional callback for logging messages
+            log_callback: Optional callback for progress messages (default: this
+                module's logger at INFO level; diagnostics are logged at DEBUG)
+            num_search_workers: Number of parallel CP-SAT search workers
+            progress_callback: Optional callback receiving every improving solution
+            cancel_event: Optional event (threading or multiprocessing manager);
+                setting it stops the search
+            model_path: Optional file the built CpModelProto of single solves is
+                written to (for request captures)
+            deadline: Optional time.monotonic() at which the search is stopped
+                (the clock is shared by processes on the same host)
+            templates: Optional cache of model templates reused by single solves
+                of the same requirement set
         """
-        self.log_callback = log_callback or print
+        self.log_callback = log_callback or logger.info
+        self.num_search_workers = num_search_workers
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.cancelled = False
+        self.model_path = model_path
+        self.deadline = deadline
+        self.templates = templates
+        self.timer = StageTimer()
 
     def solve(self, request: SolveSBCRequest) -> SolveSBCResponse:
         """
@@ -85,197 +211,843 @@ class SBCSolver:
             request: SBC solve request with requirements and players
 
         Returns:
-            Solver response with solution or error status
+            Solver response with solution or error status (with stats attached)
         """
+        self.timer = StageTimer()
+        stats = SolveStats(pool_size=len(request.available_players))
         try:
-            self.log_callback(
-                f"Starting solver with {len(request.available_players)} players"
+            response = self._solve(request, stats)
+        except Exception as e:
+            logger.exception("Error during solving")
+            response = SolveSBCResponse(
+                success=False, status="MODEL_INVALID", message=f"Solver error: {str(e)}"
             )
-            self.log_callback(f"Squad size: {request.requirements.squad_size}")
+        stats.timings = self.timer.timings
+        response.stats = stats
+        return response
+
+    def _solve(self, request: SolveSBCRequest, stats: SolveStats) -> SolveSBCResponse:
+        """Body of solve(), recording stage timings in self.timer and model size in stats"""
+        timer = self.timer
+        self.log_callback(f"Starting solver with {len(request.available_players)} players")
+        logger.debug("Squad size: %d", request.requirements.squad_size)
+
+        # Debug: Log what constraints we received (formatted only if enabled)
+        logger.debug("Received constraints: %s", request.requirements)
+
+        # Columnar view of the pool, built once and shared by all constraints
+        with timer.stage("table"):
+            table = PlayerTable(request.available_players)
+
+        # Reject requirements no squad from this pool can meet, before building a model
+        with timer.stage("feasibility"):
+            violations = check_requirements(table, request.requirements, request.quality_map)
+        if violations:
+            return self._violations_response(SolveSBCResponse, violations)
+
+        with timer.stage("presolve"):
+            # One variable per group of identical duplicates
+            duplicates = collapse_duplicates(table)
+            table = table.take(duplicates.kept)
+            stats.collapsed_pool_size = len(table)
+            self.log_callback(duplicates.summary())
+
+            # An infeasible request is explained over the unreduced pool, as
+            # reduction relies on requirements the explanation may drop
+            explain_table = table
+
+            # Drop cards dominated by cheaper interchangeable ones; a model
+            # template is built over extra cards per class (headroom), and
+            # alternative squads need replacements for the best squad's cards
+            template_pool = table
+            if request.reduce_pool:
+                spare = request.alternatives * request.min_difference
+                reduction = reduce_pool(table, request.requirements, spare=spare)
+                if self.templates is not None and self.templates.enabled:
+                    template_pool = table.take(
+                        reduce_pool(
+                            table,
+                            request.requirements,
+                            headroom=self.templates.headroom,
+                            spare=spare,
+                        ).kept
+                    )
+                table = table.take(reduction.kept)
+                self.log_callback(reduction.summary())
+        stats.reduced_pool_size = len(table)
+
+        with timer.stage("model_build"):
+            model, player_vars = self._build_model(request, table, template_pool, stats)
+
+            # Warm start from a previous selection
+            warm_start = None
+            if request.hint_player_ids:
+                hinted, warm_start = self._add_solution_hint(
+                    model, player_vars, table, duplicates.resolve(request.hint_player_ids)
+                )
+                self.log_callback(
+                    f"Added solution hint with {hinted} of {len(request.hint_player_ids)} suggested players"
+                    + (" (valid squad, kept as fallback solution)" if warm_start else "")
+                )
 
-            # Debug: Log what constraints we received
-            self.log_callback("\n=== RECEIVED CONSTRAINTS ===")
-            self.log_callback(
-                f"Required Positions: {request.requirements.required_positions}"
-            )
-            self.log_callback(f"Leagues: {request.requirements.leagues}")
-            self.log_callback(f"Countries: {request.requirements.countries}")
-            self.log_callback(f"Clubs: {request.requirements.clubs}")
-            self.log_callback(f"Quality: {request.requirements.quality}")
-            self.log_callback(f"Rarity: {request.requirements.rarity}")
-            self.log_callback(f"Team Rating: {request.requirements.team_rating}")
-            self.log_callback(f"Chemistry: {request.requirements.chemistry}")
-            self.log_callback(f"Diversity: {request.requirements.diversity}")
-            self.log_callback("=== END CONSTRAINTS ===\n")
-
-            # Create model
-            model = cp_model.CpModel()
-            builder = SBCConstraintBuilder(model)
+        for name, value in model_statistics(model).items():
+            setattr(stats, name, value)
 
-            # Create variables
-            num_players = len(request.available_players)
-            player_vars = builder.create_player_variables(num_players)
+        if self.model_path is not None:
+            with open(self.model_path, "wb") as f:
+                f.write(model.Proto().SerializeToString())
 
-            # Add constraints
-            self.log_callback("Adding constraints...")
+        # Solve
+        solver, status, solve_time, solution_printer = self._search(
+            model, request, player_vars, table
+        )
+        stats.first_solution_time = solution_printer.first_solution_time
+        stats.improvements = solution_printer.solution_count
 
-            # Squad size (required)
-            builder.add_squad_size_constraint(
-                player_vars, request.requirements.squad_size
+        # Build and return response
+        with timer.stage("response"):
+            response = self._build_response(
+                status,
+                solver,
+                player_vars,
+                table,
+                solve_time,
+                solution_printer,
+                request,
+                warm_start,
+                explain_table,
             )
 
-            # Unique player constraint (each player can only be used once)
-            self.log_callback("Adding unique player constraint (no duplicate players)")
-            builder.add_unique_player_constraint(player_vars, request.available_players)
+        if request.alternatives and response.success and not self.cancelled:
+            best = np.flatnonzero(np.isin(table.id, response.selected_player_ids)).tolist()
+            response.alternatives = self._find_alternatives(
+                model, request, player_vars, table, best, solve_time
+            )
+            response.message += f" and {len(response.alternatives)} alternatives"
+        return response
 
-            # Position constraints
-            if request.requirements.required_positions:
-                self.log_callback(
-                    f"Adding position constraints for {len(request.requirements.required_positions)} positions"
-                )
-                builder.add_position_constraints(
-                    player_vars,
-                    request.available_players,
-                    request.requirements.required_positions,
-                )
+    def _build_model(
+        self,
+        request: SolveSBCRequest,
+        table: PlayerTable,
+        template_pool: PlayerTable,
+        stats: SolveStats,
+    ) -> Tuple[cp_model.CpModel, List]:
+        """
+        Model of the requirements and objective, one selection variable per card
 
-            # League constraints
-            if request.requirements.leagues:
-                self.log_callback(
-                    f"Adding {len(request.requirements.leagues)} league constraints"
-                )
-                builder.add_league_constraints(
-                    player_vars, request.available_players, request.requirements.leagues
-                )
+        With model templates, the model is instantiated from the requirement
+        set's template if it covers the pool. Otherwise a new template is
+        built over template_pool (a superset of table) and stored first.
 
-            # Country constraints
-            if request.requirements.countries:
-                self.log_callback(
-                    f"Adding {len(request.requirements.countries)} country constraints"
-                )
-                builder.add_country_constraints(
-                    player_vars,
-                    request.available_players,
-                    request.requirements.countries,
-                )
+        Args:
+            request: Solve request
+            table: Collapsed, reduced pool
+            template_pool: Pool a new template is built over
+            stats: Stats receiving requirement build times and template use
+                (template cards fixed to 0 are counted in fixed_variables)
 
-            # Club constraints
-            if request.requirements.clubs:
-                self.log_callback(
-                    f"Adding {len(request.requirements.clubs)} club constraints"
-                )
-                builder.add_club_constraints(
-                    player_vars, request.available_players, request.requirements.clubs
-                )
+        Returns:
+            Model and selection variable of every card of table
+        """
+        if self.templates is None or not self.templates.enabled:
+            return self._build_requirements(request, table, stats)
+
+        key = requirements_fingerprint(request)
+        instance = self.templates.instantiate(key, table)
+        stats.template_hit = instance is not None
+        if instance is not None:
+            self.log_callback("Reused model template")
+        else:
+            model, player_vars = self._build_requirements(request, template_pool, stats)
+            template = ModelTemplate(model, player_vars, template_pool)
+            self.templates.put(key, template)
+            self.log_callback(f"Built model template over {len(template_pool)} players")
+            instance = template.instantiate(table)
+            if instance is None:
+                return self._build_requirements(request, table, stats)
+
+        model, player_vars, stats.fixed_variables = instance
+        return model, player_vars
+
+    def _build_requirements(
+        self, request: SolveSBCRequest, table: PlayerTable, stats: SolveStats
+    ) -> Tuple[cp_model.CpModel, List]:
+        """Build a new model of the requirements and objective over table"""
+        model = cp_model.CpModel()
+        builder = SBCConstraintBuilder(model)
+
+        # Create variables
+        player_vars = builder.create_player_variables(len(table))
+
+        # Add constraints
+        logger.debug("Adding constraints...")
+
+        self._add_requirements(
+            builder, player_vars, table, request.requirements, request.quality_map
+        )
+        stats.requirement_times = builder.requirement_times
 
-            # Quality constraints
-            if request.requirements.quality:
-                self.log_callback(
-                    f"Adding {len(request.requirements.quality)} quality constraints"
-                )
-                builder.add_quality_constraints(
-                    player_vars,
-                    request.available_players,
-                    request.requirements.quality,
-                    request.quality_map,
-                )
+        # Add objective function
+        logger.debug("Building objective function (minimize high-rated players)...")
+        build_objective(model, player_vars, table)
+        return model, player_vars
 
-            # Rarity constraints
-            if request.requirements.rarity:
-                self.log_callback(
-                    f"Adding {len(request.requirements.rarity)} rarity constraints"
-                )
-                builder.add_rarity_constraints(
-                    player_vars, request.available_players, request.requirements.rarity
+    def _find_alternatives(
+        self,
+        model: cp_model.CpModel,
+        request: SolveSBCRequest,
+        player_vars,
+        table: PlayerTable,
+        best: List[int],
+        solve_time: float,
+    ) -> List[AlternativeSquad]:
+        """
+        Next best squads, found by re-solving the same model with no-good cuts
+
+        After every squad, a cut requires the next one to leave out at least
+        min_difference of its cards (squads have a fixed size, so this also
+        means min_difference new cards). The model is reused as built, so
+        only the search is repeated. Alternatives share the request's time
+        budget with the main search, with at least MIN_ALTERNATIVE_TIME each.
+
+        Args:
+            model: Model of the main search
+            request: Solve request (alternatives, min_difference, time limits)
+            player_vars: Player selection variables
+            table: Columnar player pool
+            best: Table indices of the best squad
+            solve_time: Seconds the main search took
+
+        Returns:
+            Up to request.alternatives squads, by increasing cost (fewer if no
+            further squad differs enough or time runs out)
+        """
+        alternatives: List[AlternativeSquad] = []
+        budget_end = time.monotonic() + request.max_solve_time - solve_time
+        squad = best
+        for _ in range(request.alternatives):
+            model.Add(
+                cp_model.LinearExpr.Sum([player_vars[i] for i in squad])
+                <= len(squad) - request.min_difference
+            )
+            time_limit = max(MIN_ALTERNATIVE_TIME, budget_end - time.monotonic())
+            solver, status, _, _ = self._search(model, request, time_limit=time_limit)
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE) or self.cancelled:
+                break
+
+            squad = [i for i in range(len(table)) if solver.BooleanValue(player_vars[i])]
+            alternatives.append(
+                AlternativeSquad(
+                    selected_player_ids=table.id[squad].tolist(),
+                    slot_assignments=self._slot_assignments(
+                        table, squad, request.requirements
+                    ),
+                    squad_rating=float(table.ovr[squad].mean()),
+                    objective=int(solver.ObjectiveValue()),
                 )
+            )
+        self.log_callback(f"Found {len(alternatives)} alternative squads")
+        return alternatives
 
-            # Team rating constraint
-            if request.requirements.team_rating:
-                self.log_callback(
-                    f"Adding team rating constraint: {request.requirements.team_rating.type} {request.requirements.team_rating.value}"
+    def _add_requirements(
+        self,
+        builder: SBCConstraintBuilder,
+        player_vars,
+        table: PlayerTable,
+        requirements: SBCRequirementSet,
+        quality_map: Optional[Dict[str, int]],
+    ):
+        """
+        Add every constraint of one requirement set
+
+        Args:
+            builder: Constraint builder for the model
+            player_vars: Selection variables of the squad, one per player in the table
+            table: Columnar player pool
+            requirements: SBC requirements for the squad
+            quality_map: Maps quality name to database ID
+        """
+        # Squad size (required)
+        builder.add_squad_size_constraint(player_vars, requirements.squad_size)
+
+        # Unique player constraint (each player can only be used once)
+        logger.debug("Adding unique player constraint (no duplicate players)")
+        builder.add_unique_player_constraint(player_vars, table)
+
+        # Each requirement is added on its own so it can be guarded by an
+        # assumption literal (requirement paths match feasibility.py)
+
+        # Position constraints
+        if requirements.required_positions:
+            logger.debug(
+                "Adding position constraints for %d positions",
+                len(requirements.required_positions),
+            )
+            # One joint slot assignment, so the positions are a single requirement
+            with builder.requirement("required_positions"):
+                builder.add_position_constraints(
+                    player_vars, table, requirements.required_positions, requirements.squad_size
                 )
+
+        # League constraints
+        if requirements.leagues:
+            logger.debug("Adding %d league constraints", len(requirements.leagues))
+            for index, constraint in enumerate(requirements.leagues):
+                with builder.requirement(f"leagues[{index}]"):
+                    builder.add_league_constraints(player_vars, table, [constraint])
+
+        # Country constraints
+        if requirements.countries:
+            logger.debug("Adding %d country constraints", len(requirements.countries))
+            for index, constraint in enumerate(requirements.countries):
+                with builder.requirement(f"countries[{index}]"):
+                    builder.add_country_constraints(player_vars, table, [constraint])
+
+        # Club constraints
+        if requirements.clubs:
+            logger.debug("Adding %d club constraints", len(requirements.clubs))
+            for index, constraint in enumerate(requirements.clubs):
+                with builder.requirement(f"clubs[{index}]"):
+                    builder.add_club_constraints(player_vars, table, [constraint])
+
+        # Quality constraints
+        if requirements.quality:
+            logger.debug("Adding %d quality constraints", len(requirements.quality))
+            for index, constraint in enumerate(requirements.quality):
+                with builder.requirement(f"quality[{index}]"):
+                    builder.add_quality_constraints(player_vars, table, [constraint], quality_map)
+
+        # Rarity constraints
+        if requirements.rarity:
+            logger.debug("Adding %d rarity constraints", len(requirements.rarity))
+            for index, constraint in enumerate(requirements.rarity):
+                with builder.requirement(f"rarity[{index}]"):
+                    builder.add_rarity_constraints(player_vars, table, [constraint])
+
+        # Team rating constraint
+        if requirements.team_rating:
+            logger.debug(
+                "Adding team rating constraint: %s %d",
+                requirements.team_rating.type,
+                requirements.team_rating.value,
+            )
+            with builder.requirement("team_rating"):
                 builder.add_rating_constraint(
                     player_vars,
-                    request.available_players,
-                    request.requirements.team_rating,
-                    request.requirements.squad_size,
+                    table,
+                    requirements.team_rating,
+                    requirements.squad_size,
                 )
 
-            # Chemistry constraint (if implemented)
-            if request.requirements.chemistry:
-                self.log_callback(
-                    f"Adding chemistry constraint: {request.requirements.chemistry.type} {request.requirements.chemistry.value}"
-                )
+        # Chemistry constraint (if implemented)
+        if requirements.chemistry:
+            logger.debug(
+                "Adding chemistry constraint: %s %d",
+                requirements.chemistry.type,
+                requirements.chemistry.value,
+            )
+            with builder.requirement("chemistry"):
                 builder.add_chemistry_constraint(
                     player_vars,
-                    request.available_players,
-                    request.requirements.chemistry,
+                    table,
+                    requirements.chemistry,
+                    requirements.squad_size,
                 )
 
-            # Diversity constraints (clubs/leagues/countries in squad)
-            if request.requirements.diversity:
+        # Diversity constraints (clubs/leagues/countries in squad)
+        if requirements.diversity:
+            logger.debug("Adding %d diversity constraints", len(requirements.diversity))
+            for index, constraint in enumerate(requirements.diversity):
+                with builder.requirement(f"diversity[{index}]"):
+                    builder.add_diversity_constraints(player_vars, table, [constraint])
+
+    def _explain_infeasibility(
+        self, request: SolveSBCRequest, table: PlayerTable, time_left: float
+    ) -> Optional[List[str]]:
+        """
+        Find a minimal set of requirements that cannot be met together
+
+        Rebuilds the model with every requirement guarded by an assumption
+        literal, takes the infeasible core CP-SAT reports for the assumptions,
+        then drops core members one at a time while the rest stays infeasible
+        (deletion filter). Squad size and unique players are always enforced.
+        Stops once the time left or the request deadline is reached, or the
+        solve is cancelled.
+
+        Args:
+            request: Solve request that was found infeasible
+            table: Columnar player pool, not reduced by requirements (the
+                explanation drops some of them)
+            time_left: Seconds of the request's time limit left after the search
+
+        Returns:
+            Requirement paths of a minimal conflicting set (only squad_size if
+            the pool cannot fill a squad at all), or None if the time ran out
+            or the solve was cancelled before the first core was found
+        """
+        model = cp_model.CpModel()
+        builder = SBCConstraintBuilder(model, with_assumptions=True)
+        player_vars = builder.create_player_variables(len(table))
+        self._add_requirements(
+            builder, player_vars, table, request.requirements, request.quality_map
+        )
+        names = list(builder.assumption_literals)
+        literals = [builder.assumption_literals[name] for name in names]
+        position = {literal.Index(): i for i, literal in enumerate(literals)}
+
+        deadline = time.monotonic() + min(MAX_EXPLAIN_TIME, time_left)
+        if self.deadline is not None:
+            deadline = min(deadline, self.deadline)
+
+        def infeasible(subset: List[int]) -> Optional[bool]:
+            """True/False if proven, None if the time budget ran out or the solve was cancelled"""
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._is_cancelled():
+                return None
+            model.ClearAssumptions()
+            model.AddAssumptions([literals[i] for i in subset])
+            solver = cp_model.CpSolver()
+            solver.parameters.num_search_workers = self.num_search_workers
+            solver.parameters.max_time_in_seconds = remaining
+            timer = self._cancel_timer(solver)
+            try:
+                status = solver.Solve(model)
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            if status == cp_model.INFEASIBLE:
+                core[:] = [position[i] for i in solver.SufficientAssumptionsForInfeasibility()]
+                return True
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                return False
+            return None
+
+        core: List[int] = []
+        if not infeasible(list(range(len(literals)))):
+            return None
+        if not core:
+            return ["squad_size"]
+
+        # Deletion filter: a member is needed if the core without it is feasible
+        needed: List[int] = []
+        candidates = list(core)
+        while candidates:
+            member = candidates.pop()
+            result = infeasible(needed + candidates)
+            if result is None:
                 self.log_callback(
-                    f"Adding {len(request.requirements.diversity)} diversity constraints"
+                    "Conflict explanation stopped early, result may not be minimal"
                 )
-                builder.add_diversity_constraints(
-                    player_vars,
-                    request.available_players,
-                    request.requirements.diversity,
+                needed += [member] + candidates
+                break
+            if result:
+                # Still infeasible without it - keep only what the new core used
+                candidates = [i for i in candidates if i in core]
+            else:
+                needed.append(member)
+
+        return [names[i] for i in sorted(needed)]
+
+    def _search(
+        self,
+        model: cp_model.CpModel,
+        request,
+        player_vars=None,
+        table: Optional[PlayerTable] = None,
+        time_limit: Optional[float] = None,
+    ) -> Tuple[cp_model.CpSolver, int, float, SolutionPrinter]:
+        """
+        Run CP-SAT on a built model
+
+        Args:
+            model: CP-SAT model with constraints and objective
+            request: Solve request (time limits)
+            player_vars: Selection variables reported in progress events (if any)
+            table: Columnar player pool matching player_vars
+            time_limit: Seconds of search (default: request.max_solve_time)
+
+        Returns:
+            Solver, status, solve time and solution callback
+        """
+        self.log_callback(
+            f"Starting CP-SAT solver with {self.num_search_workers} search workers..."
+        )
+        solver = cp_model.CpSolver()
+
+        # Configure solver
+        solver.parameters.max_time_in_seconds = (
+            request.max_solve_time if time_limit is None else time_limit
+        )
+        solver.parameters.num_search_workers = self.num_search_workers
+        if request.relative_gap is not None:
+            # CP-SAT stops once (objective - bound) / objective is this small
+            solver.parameters.relative_gap_limit = request.relative_gap
+
+        # The search log is only scanned for the presolve time, never printed
+        presolve_clock = PresolveClock()
+        presolve_clock.attach(solver)
+
+        # Solution callback for tracking improvements
+        solution_printer = SolutionPrinter(
+            self.log_callback,
+            request.no_improvement_time,
+            self.progress_callback if player_vars is not None else None,
+            player_vars,
+            table,
+            request.target_objective,
+        )
+
+        start_time = time.time()
+
+        if self._is_cancelled():
+            status = cp_model.UNKNOWN
+        else:
+            # Cancellation and deadline stops are fired by the shared scheduler
+            timers = []
+            cancel_timer = self._cancel_timer(solver)
+            if cancel_timer is not None:
+                timers.append(cancel_timer)
+            if self.deadline is not None:
+                timers.append(
+                    deadline_scheduler.call_at(
+                        self.deadline, lambda: self._stop_at_deadline(solver, solution_printer)
+                    )
                 )
+            try:
+                status = solver.Solve(model, solution_printer)
+            finally:
+                for timer in timers:
+                    timer.cancel()
+                solution_printer.finish()
+
+        solve_time = time.time() - start_time
+
+        # CP-SAT reports a search stopped by the gap limit as OPTIMAL
+        if status == cp_model.OPTIMAL and _relative_gap(solver) > 0:
+            status = cp_model.FEASIBLE
+            solution_printer.stop_reason = "relative_gap"
+
+        presolve_time = min(presolve_clock.presolve_time or 0.0, solve_time)
+        self.timer.add("cpsat_presolve", presolve_time)
+        self.timer.add("search", solve_time - presolve_time)
+        return solver, status, solve_time, solution_printer
+
+    def solve_batch(self, request: SolveSBCBatchRequest) -> SolveSBCBatchResponse:
+        """
+        Solve several SBCs jointly so they do not compete for the same fodder
+
+        One selection variable is created per (card, squad) pair and every
+        card goes to at most one squad. Minimizing the combined cost lets the
+        search hand cheap cards to the squad that needs them most, which a
+        sequence of independent solves cannot do.
+
+        Args:
+            request: Batch request with one requirement set per squad
 
-            # Add objective function
+        Returns:
+            Batch response with one squad per requirement set
+        """
+        try:
             self.log_callback(
-                "Building objective function (minimize high-rated players)..."
+                f"Starting joint solver for {len(request.squads)} squads "
+                f"with {len(request.available_players)} players"
             )
-            build_objective(model, player_vars, request.available_players)
 
-            # Solve
-            self.log_callback("Starting CP-SAT solver...")
-            solver = cp_model.CpSolver()
+            table = PlayerTable(request.available_players)
 
-            # Configure solver
-            solver.parameters.max_time_in_seconds = request.max_solve_time
-            solver.parameters.num_search_workers = 8  # Parallel search
-            solver.parameters.log_search_progress = False  # We have our own logging
+            violations = check_batch_requirements(table, request.squads, request.quality_map)
+            if violations:
+                return self._violations_response(SolveSBCBatchResponse, violations)
 
-            # Solution callback for tracking improvements
-            solution_printer = SolutionPrinter(
-                self.log_callback, request.no_improvement_time
-            )
+            # A player may appear once per squad, so keep a duplicate per squad
+            duplicates = collapse_duplicates(table, copies=len(request.squads))
+            table = table.take(duplicates.kept)
+            self.log_callback(duplicates.summary())
 
-            start_time = time.time()
+            # Drop cards dominated by cheaper interchangeable ones
+            if request.reduce_pool:
+                reduction = reduce_batch_pool(table, request.squads)
+                table = table.take(reduction.kept)
+                self.log_callback(reduction.summary())
 
-            # Run solver with periodic timeout checking
-            status = solver.Solve(model, solution_printer)
+            model = cp_model.CpModel()
+            builder = SBCConstraintBuilder(model)
 
-            solve_time = time.time() - start_time
+            squad_vars = []
+            for number, requirements in enumerate(request.squads, start=1):
+                self.log_callback(
+                    f"Adding constraints for squad {number} ({requirements.squad_size} players)..."
+                )
+                player_vars = builder.create_player_variables(len(table))
+                self._add_requirements(
+                    builder, player_vars, table, requirements, request.quality_map
+                )
+                squad_vars.append(player_vars)
 
-            # Build and return response
-            return self._build_response(
-                status,
-                solver,
-                player_vars,
-                request.available_players,
-                solve_time,
-                solution_printer,
-                request,
+            # Each card can only be submitted once
+            logger.debug("Adding card usage constraint (each card in at most one squad)")
+            for card_vars in zip(*squad_vars):
+                model.AddAtMostOne(card_vars)
+
+            logger.debug("Building objective function (minimize total cost)...")
+            build_batch_objective(model, squad_vars, table)
+
+            solver, status, solve_time, solution_printer = self._search(model, request)
+
+            return self._build_batch_response(
+                status, solver, squad_vars, table, solve_time, solution_printer, request.squads
             )
 
         except Exception as e:
-            self.log_callback(f"Error during solving: {str(e)}")
-            return SolveSBCResponse(
+            logger.exception("Error during solving")
+            return SolveSBCBatchResponse(
                 success=False, status="MODEL_INVALID", message=f"Solver error: {str(e)}"
             )
 
+    def _build_batch_response(
+        self,
+        status: int,
+        solver: cp_model.CpSolver,
+        squad_vars,
+        table: PlayerTable,
+        solve_time: float,
+        solution_printer: SolutionPrinter,
+        requirement_sets: List[SBCRequirementSet],
+    ) -> SolveSBCBatchResponse:
+        """
+        Build batch response based on solver status
+
+        Args:
+            status: CP-SAT status code
+            solver: Solver instance
+            squad_vars: Selection variables per squad
+            table: Columnar player pool
+            solve_time: Total solve time
+            solution_printer: Solution callback
+            requirement_sets: Requirements of every squad
+
+        Returns:
+            Formatted batch response
+        """
+        status_map = {
+            cp_model.OPTIMAL: "OPTIMAL",
+            cp_model.FEASIBLE: "FEASIBLE",
+            cp_model.INFEASIBLE: "INFEASIBLE",
+            cp_model.MODEL_INVALID: "MODEL_INVALID",
+            cp_model.UNKNOWN: "CANCELLED" if self.cancelled else "TIMEOUT",
+        }
+        status_str = status_map.get(status, "UNKNOWN")
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            if status == cp_model.INFEASIBLE:
+                message = "No combination of squads exists for these requirements"
+            elif status == cp_model.UNKNOWN and self.cancelled:
+                message = f"Solve cancelled after {solve_time:.2f}s"
+            elif status == cp_model.UNKNOWN:
+                message = f"Solver timeout after {solve_time:.2f}s"
+            else:
+                message = f"Solver failed with status: {status_str}"
+            self.log_callback(f"✗ {message}")
+            return SolveSBCBatchResponse(
+                success=False, status=status_str, solve_time=solve_time, message=message
+            )
+
+        squads = []
+        for number, (player_vars, requirements) in enumerate(
+            zip(squad_vars, requirement_sets), start=1
+        ):
+            selected = [i for i, var in enumerate(player_vars) if solver.BooleanValue(var)]
+            squad_rating = float(table.ovr[selected].mean()) if selected else 0.0
+            squads.append(
+                BatchSquadSolution(
+                    selected_player_ids=table.id[selected].tolist(),
+                    slot_assignments=self._slot_assignments(table, selected, requirements),
+                    squad_rating=squad_rating,
+                )
+            )
+            self.log_callback(
+                f"✓ Squad {number}: {len(selected)} players selected, "
+                f"avg rating: {squad_rating:.1f}"
+            )
+
+        return SolveSBCBatchResponse(
+            success=True,
+            status=status_str,
+            squads=squads,
+            total_cost=int(solver.ObjectiveValue()),
+            solve_time=solve_time,
+            message=f"Found {len(squads)} squads in {solve_time:.2f}s with {solution_printer.solution_count} improvements"
+            + (" (search cancelled)" if self.cancelled else ""),
+        )
+
+    def _slot_assignments(
+        self, table: PlayerTable, selected: List[int], requirements: SBCRequirementSet
+    ) -> Optional[List[SlotAssignment]]:
+        """
+        Line up a selected squad on the required position slots
+
+        Args:
+            table: Columnar player pool
+            selected: Indices of the selected cards
+            requirements: Requirements the squad was selected for
+
+        Returns:
+            Assignment ordered by slot, or None without required positions
+        """
+        if not requirements.required_positions:
+            return None
+        layout = SlotLayout(requirements.required_positions, requirements.squad_size)
+        assignment = assign_slots(table, selected, layout)
+        if assignment is None:
+            self.log_callback("Selected squad does not fill every position slot")
+            return None
+        return [
+            SlotAssignment(
+                slot=slot,
+                position_id=(
+                    layout.required_positions[slot]
+                    if slot < len(layout.required_positions)
+                    else None
+                ),
+                player_id=int(table.id[index]),
+            )
+            for slot, index in assignment
+        ]
+
+    def _violations_response(self, response_type, violations):
+        """
+        Response for requirements rejected by the pre-feasibility check
+
+        Args:
+            response_type: SolveSBCResponse or SolveSBCBatchResponse
+            violations: Violated requirements
+
+        Returns:
+            INFEASIBLE response listing the violations
+        """
+        self.log_callback("✗ Requirements cannot be met by this pool:")
+        for violation in violations:
+            self.log_callback(f"  - {violation.requirement}: {violation.message}")
+        return response_type(
+            success=False,
+            status="INFEASIBLE",
+            solve_time=0.0,
+            message=describe_violations(violations),
+            violations=violations,
+        )
+
+    def _is_cancelled(self) -> bool:
+        """Whether the cancel event is set (recorded in self.cancelled)"""
+        if not self.cancelled and self.cancel_event is not None and self.cancel_event.is_set():
+            self.cancelled = True
+        return self.cancelled
+
+    def _cancel_timer(self, solver: cp_model.CpSolver) -> Optional[Timer]:
+        """Schedule the cancellation check of a running search (None without a cancel event)"""
+        if self.cancel_event is None:
+            return None
+        return deadline_scheduler.call_later(
+            CANCEL_POLL_INTERVAL,
+            lambda: self._stop_if_cancelled(solver),
+            interval=CANCEL_POLL_INTERVAL,
+        )
+
+    def _stop_if_cancelled(self, solver: cp_model.CpSolver) -> None:
+        """Scheduler callback: stop the search once the cancel event is set"""
+        if not self.cancelled and self.cancel_event.is_set():
+            self.cancelled = True
+            self.log_callback("Solve cancelled, stopping search...")
+            solver.StopSearch()
+
+    def _stop_at_deadline(
+        self, solver: cp_model.CpSolver, solution_printer: SolutionPrinter
+    ) -> None:
+        """Scheduler callback: stop the search at the request deadline"""
+        if solution_printer.stop_requested:
+            return
+        self.log_callback("Deadline reached, stopping search...")
+        solution_printer.stop_reason = "deadline"
+        solution_printer.stop_requested = True
+        solver.StopSearch()
+
+    def _add_solution_hint(
+        self,
+        model: cp_model.CpModel,
+        player_vars,
+        table: PlayerTable,
+        hint_ids,
+    ) -> Tuple[int, Optional[List[int]]]:
+        """
+        Hint CP-SAT towards a known selection
+
+        If the suggested cards still form a valid squad, the hint is completed
+        for every auxiliary variable (chemistry counts, tiers, ...) by solving a
+        copy of the model with the selection fixed. CP-SAT accepts a complete,
+        feasible hint as its first solution right after presolve. Otherwise
+        only the player variables are hinted and CP-SAT repairs the hint.
+
+        Args:
+            model: CP-SAT model
+            player_vars: Player selection variables
+            table: Columnar player pool
+            hint_ids: ClubPlayer ids of the suggested selection
+
+        Returns:
+            Number of suggested cards found in the pool, and the indices of the
+            selection if it is a valid squad (usable as a fallback solution)
+        """
+        suggested = table.isin("id", hint_ids).astype(int).tolist()
+
+        completed = self._complete_hint(model, player_vars, suggested)
+        if completed is None:
+            for var, value in zip(player_vars, suggested):
+                model.AddHint(var, value)
+            return sum(suggested), None
+
+        for index, value in enumerate(completed):
+            model.Proto().solution_hint.vars.append(index)
+            model.Proto().solution_hint.values.append(value)
+        return sum(suggested), [i for i, value in enumerate(suggested) if value]
+
+    def _complete_hint(self, model: cp_model.CpModel, player_vars, suggested):
+        """
+        Extend a selection to a full variable assignment
+
+        Args:
+            model: CP-SAT model
+            player_vars: Player selection variables
+            suggested: 0/1 value per player variable
+
+        Returns:
+            Value of every model variable, or None if the selection is not feasible
+        """
+        fixed = cp_model.CpModel()
+        fixed.Proto().CopyFrom(model.Proto())
+        fixed.Proto().ClearField("objective")
+        for var, value in zip(player_vars, suggested):
+            domain = fixed.Proto().variables[var.Index()].domain
+            domain[:] = [value, value]
+
+        solver = cp_model.CpSolver()
+        solver.parameters.num_search_workers = 1
+        solver.parameters.max_time_in_seconds = 1.0
+        if solver.Solve(fixed) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+
+        return list(solver.ResponseProto().solution)
+
     def _build_response(
         self,
         status: int,
         solver: cp_model.CpSolver,
         player_vars,
-        players,
+        table: PlayerTable,
         solve_time: float,
         solution_printer: SolutionPrinter,
         request,
+        warm_start: Optional[List[int]] = None,
+        explain_table: Optional[PlayerTable] = None,
     ) -> SolveSBCResponse:
         """
         Build response based on solver status
@@ -284,10 +1056,13 @@ class SBCSolver:
             status: CP-SAT status code
             solver: Solver instance
             player_vars: Player selection variables
-            players: Available players
+            table: Columnar player pool
             solve_time: Total solve time
             solution_printer: Solution callback
             request: Original solver request
+            warm_start: Valid hinted selection, returned if the search finds nothing
+            explain_table: Pool an infeasible request is explained over
+                (default: table)
 
         Returns:
             Formatted solver response
@@ -298,25 +1073,34 @@ class SBCSolver:
             cp_model.FEASIBLE: "FEASIBLE",
             cp_model.INFEASIBLE: "INFEASIBLE",
             cp_model.MODEL_INVALID: "MODEL_INVALID",
-            cp_model.UNKNOWN: "TIMEOUT",
+            cp_model.UNKNOWN: "CANCELLED" if self.cancelled else "TIMEOUT",
         }
 
+        # Fall back to the warm-start squad if the search ran out of time
+        selected = None
+        if status == cp_model.UNKNOWN and warm_start is not None:
+            self.log_callback("No better solution found, returning warm-start squad")
+            status = cp_model.FEASIBLE
+            selected = warm_start
+
         status_str = status_map.get(status, "UNKNOWN")
 
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             # Extract solution
-            selected_ids = [
-                players[i].id
-                for i in range(len(players))
-                if solver.Value(player_vars[i]) == 1
-            ]
+            if selected is None:
+                selected = [
+                    i for i in range(len(table)) if solver.BooleanValue(player_vars[i])
+                ]
+                objective = int(solver.ObjectiveValue())
+                objective_gap = _relative_gap(solver)
+            else:
+                # Warm-start squad, not a search result
+                objective = int(player_costs(table)[selected].sum())
+                objective_gap = None
+            selected_ids = table.id[selected].tolist()
 
             # Calculate squad rating
-            selected_players = [
-                players[i]
-                for i in range(len(players))
-                if solver.Value(player_vars[i]) == 1
-            ]
+            selected_players = [table.players[i] for i in selected]
 
             if selected_players:
                 squad_rating = sum(p.ovr for p in selected_players) / len(
@@ -330,43 +1114,59 @@ class SBCSolver:
                 f"avg rating: {squad_rating:.1f}"
             )
 
-            # Log selected players
-            self.log_callback("\nSelected players:")
-            for player in sorted(selected_players, key=lambda p: p.ovr):
-                storage_info = " [SBC Storage]" if player.sbc else ""
-                squad_info = " [SQUAD]" if player.squad else ""
-                self.log_callback(
-                    f"  - {player.display_name} ({player.ovr} OVR){storage_info}{squad_info}"
-                )
+            # Log selected players (sorted only if debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                for player in sorted(selected_players, key=lambda p: p.ovr):
+                    storage_info = " [SBC Storage]" if player.sbc else ""
+                    squad_info = " [SQUAD]" if player.squad else ""
+                    logger.debug(
+                        "Selected: %s (%d OVR)%s%s",
+                        player.display_name,
+                        player.ovr,
+                        storage_info,
+                        squad_info,
+                    )
+
+            message = f"Found solution in {solve_time:.2f}s with {solution_printer.solution_count} improvements"
+            if self.cancelled:
+                message += " (search cancelled)"
+            elif status == cp_model.FEASIBLE and solution_printer.stop_reason is not None:
+                message += f" (stopped: {STOP_MESSAGES[solution_printer.stop_reason]})"
 
             return SolveSBCResponse(
                 success=True,
                 status=status_str,
                 selected_player_ids=selected_ids,
+                slot_assignments=self._slot_assignments(
+                    table, selected, request.requirements
+                ),
                 squad_rating=squad_rating,
                 solve_time=solve_time,
-                message=f"Found solution in {solve_time:.2f}s with {solution_printer.solution_count} improvements",
+                objective=objective,
+                objective_gap=objective_gap,
+                message=message,
             )
         else:
             # No solution found
+            conflicting = None
             if status == cp_model.INFEASIBLE:
                 message = "No valid solution exists for these requirements"
                 self.log_callback(f"✗ {message}")
-                self.log_callback(
-                    "\n💡 This SBC cannot be completed with your current club."
-                )
-                self.log_callback("Possible reasons:")
-                self.log_callback(
-                    "  - Not enough variety of players (duplicates would be needed)"
-                )
-                self.log_callback(
-                    "  - Missing players in specific positions/countries/clubs"
-                )
-                self.log_callback(
-                    "  - Chemistry requirement too high for available players"
-                )
-                self.log_callback("\n=== INFEASIBILITY ANALYSIS ===")
-                self._analyze_infeasibility(request)
+                # Per-constraint availability scans of the whole pool, debug only
+                if logger.isEnabledFor(logging.DEBUG):
+                    self._analyze_infeasibility(request)
+                with self.timer.stage("explain"):
+                    conflicting = self._explain_infeasibility(
+                        request,
+                        table if explain_table is None else explain_table,
+                        request.max_solve_time - solve_time,
+                    )
+                if conflicting:
+                    self.log_callback(f"Conflicting requirements: {', '.join(conflicting)}")
+                    message += f" (conflicting requirements: {', '.join(conflicting)})"
+            elif status == cp_model.UNKNOWN and self.cancelled:
+                message = f"Solve cancelled after {solve_time:.2f}s"
+                self.log_callback(f"✗ {message}")
             elif status == cp_model.UNKNOWN:
                 message = f"Solver timeout after {solve_time:.2f}s"
                 self.log_callback(f"✗ {message}")
@@ -375,21 +1175,24 @@ class SBCSolver:
                 self.log_callback(f"✗ {message}")
 
             return SolveSBCResponse(
-                success=False, status=status_str, solve_time=solve_time, message=message
+                success=False,
+                status=status_str,
+                solve_time=solve_time,
+                message=message,
+                conflicting_requirements=conflicting,
             )
 
     def _analyze_infeasibility(self, request):
         """Analyze why the problem is infeasible"""
         players = request.available_players
-        self.log_callback("\nChecking individual constraints:")
-        self.log_callback(f"  Squad size required: {request.requirements.squad_size}")
-        self.log_callback(f"  Total players available: {len(players)}")
+        logger.debug("=== INFEASIBILITY ANALYSIS ===")
+        logger.debug("Checking individual constraints:")
+        logger.debug("  Squad size required: %d", request.requirements.squad_size)
+        logger.debug("  Total players available: %d", len(players))
 
         # Check position coverage
         if request.requirements.required_positions:
-            self.log_callback(
-                f"\n  Required positions: {len(request.requirements.required_positions)}"
-            )
+            logger.debug("  Required positions: %d", len(request.requirements.required_positions))
 
             # Count how many of each position we need
             position_counts = {}
@@ -400,13 +1203,17 @@ class SBCSolver:
             for pos_id, count_needed in position_counts.items():
                 available = sum(1 for p in players if pos_id in p.positions)
                 status = "✓" if available >= count_needed else "✗"
-                self.log_callback(
-                    f"    {status} Position {pos_id}: Need {count_needed}, have {available} available"
+                logger.debug(
+                    "    %s Position %d: Need %d, have %d available",
+                    status,
+                    pos_id,
+                    count_needed,
+                    available,
                 )
 
         # Check quality constraints
         if request.requirements.quality:
-            self.log_callback("\n  Quality constraints:")
+            logger.debug("  Quality constraints:")
             for constraint in request.requirements.quality:
                 quality_id = (
                     request.quality_map.get(constraint.quality)
@@ -415,40 +1222,56 @@ class SBCSolver:
                 )
                 if quality_id:
                     count = sum(1 for p in players if p.quality_id == quality_id)
-                    self.log_callback(
-                        f"    {constraint.quality.upper()}: Need {constraint.type} {constraint.count}, have {count} available"
+                    logger.debug(
+                        "    %s: Need %s %d, have %d available",
+                        constraint.quality.upper(),
+                        constraint.type,
+                        constraint.count,
+                        count,
                     )
 
         # Check club constraints
         if request.requirements.clubs:
-            self.log_callback("\n  Club constraints:")
+            logger.debug("  Club constraints:")
             for constraint in request.requirements.clubs:
                 if constraint.club_ids:
                     count = sum(1 for p in players if p.club_id in constraint.club_ids)
-                    self.log_callback(
-                        f"    Clubs {constraint.club_ids}: Need {constraint.type} {constraint.count}, have {count} available"
+                    logger.debug(
+                        "    Clubs %s: Need %s %d, have %d available",
+                        constraint.club_ids,
+                        constraint.type,
+                        constraint.count,
+                        count,
                     )
 
         # Check league constraints
         if request.requirements.leagues:
-            self.log_callback("\n  League constraints:")
+            logger.debug("  League constraints:")
             for constraint in request.requirements.leagues:
                 if constraint.league_ids:
                     for league_id in constraint.league_ids:
                         count = sum(1 for p in players if p.league_id == league_id)
-                        self.log_callback(
-                            f"    League {league_id}: Need {constraint.type} {constraint.count}, have {count} available"
+                        logger.debug(
+                            "    League %d: Need %s %d, have %d available",
+                            league_id,
+                            constraint.type,
+                            constraint.count,
+                            count,
                         )
 
         # Check country constraints
         if request.requirements.countries:
-            self.log_callback("\n  Country constraints:")
+            logger.debug("  Country constraints:")
             for constraint in request.requirements.countries:
                 if constraint.country_ids:
                     for country_id in constraint.country_ids:
                         count = sum(1 for p in players if p.country_id == country_id)
-                        self.log_callback(
-                            f"    Country {country_id}: Need {constraint.type} {constraint.count}, have {count} available"
+                        logger.debug(
+                            "    Country %d: Need %s %d, have %d available",
+                            country_id,
+                            constraint.type,
+                            constraint.count,
+                            count,
                         )
 
         # Check team rating
@@ -464,33 +1287,44 @@ class SBCSolver:
                 if players
                 else 0
             )
-            self.log_callback(f"\n  Team Rating constraint:")
-            self.log_callback(
-                f"    Need {request.requirements.team_rating.type} {request.requirements.team_rating.value}"
+            logger.debug("  Team Rating constraint:")
+            logger.debug(
+                "    Need %s %d",
+                request.requirements.team_rating.type,
+                request.requirements.team_rating.value,
             )
-            self.log_callback(f"    Average all players: {avg_rating:.1f}")
-            self.log_callback(
-                f"    Max possible with top {request.requirements.squad_size}: {max_avg:.1f}"
+            logger.debug("    Average all players: %.1f", avg_rating)
+            logger.debug(
+                "    Max possible with top %d: %.1f", request.requirements.squad_size, max_avg
             )
 
         # Check diversity constraints
         if request.requirements.diversity:
-            self.log_callback(f"\n  Diversity constraints:")
+            logger.debug("  Diversity constraints:")
             for constraint in request.requirements.diversity:
                 if constraint.attribute == "clubs":
                     unique_count = len(set(p.club_id for p in players))
-                    self.log_callback(
-                        f"    Unique clubs: {unique_count} (need {constraint.type} {constraint.count})"
+                    logger.debug(
+                        "    Unique clubs: %d (need %s %d)",
+                        unique_count,
+                        constraint.type,
+                        constraint.count,
                     )
                 elif constraint.attribute == "leagues":
                     unique_count = len(set(p.league_id for p in players))
-                    self.log_callback(
-                        f"    Unique leagues: {unique_count} (need {constraint.type} {constraint.count})"
+                    logger.debug(
+                        "    Unique leagues: %d (need %s %d)",
+                        unique_count,
+                        constraint.type,
+                        constraint.count,
                     )
                 elif constraint.attribute == "countries":
                     unique_count = len(set(p.country_id for p in players))
-                    self.log_callback(
-                        f"    Unique countries: {unique_count} (need {constraint.type} {constraint.count})"
+                    logger.debug(
+                        "    Unique countries: %d (need %s %d)",
+                        unique_count,
+                        constraint.type,
+                        constraint.count,
                     )
 
-        self.log_callback("\n=== END ANALYSIS ===\n")
+        logger.debug("=== END ANALYSIS ===")
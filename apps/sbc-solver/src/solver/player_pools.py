@@ -0,0 +1,200 @@
+"""
+Server-side player pool sessions
+Clubs upload their cards once and then send only the changes between solves
+"""
+
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from .models import SolverPlayer, PlayerPoolDelta, PlayerPoolInfo
+from .player_table import PlayerTable
+
+
+class PlayerPoolNotFoundError(Exception):
+    """Raised when a pool ID is unknown or has expired"""
+
+
+class PlayerPoolVersionError(Exception):
+    """Raised when a delta targets an outdated pool version"""
+
+
+class PlayerPool:
+    """A stored player pool, keyed by ClubPlayer.id"""
+
+    def __init__(self, pool_id: str, players: List[SolverPlayer]):
+        self.pool_id = pool_id
+        self.players: Dict[int, SolverPlayer] = {p.id: p for p in players}
+        self.version = 1
+        self.last_used = time.monotonic()
+        self._table: Optional[PlayerTable] = None
+
+    def table(self) -> PlayerTable:
+        """Columnar view of the pool, built once and then patched by deltas"""
+        if self._table is None:
+            self._table = PlayerTable(list(self.players.values()))
+        return self._table
+
+    def info(self, missing_ids: List[int] = None) -> PlayerPoolInfo:
+        """Summary of this pool"""
+        return PlayerPoolInfo(
+            pool_id=self.pool_id,
+            version=self.version,
+            size=len(self.players),
+            missing_ids=missing_ids or [],
+        )
+
+
+class PlayerPoolStore:
+    """
+    In-memory store of uploaded player pools
+
+    Pools that have not been used for `ttl_seconds` expire, and the least
+    recently used pool is evicted once `max_pools` is reached.
+    """
+
+    def __init__(self, max_pools: int, ttl_seconds: float):
+        """
+        Initialize store
+
+        Args:
+            max_pools: Maximum number of pools kept in memory
+            ttl_seconds: Idle time after which a pool expires
+        """
+        self.max_pools = max_pools
+        self.ttl_seconds = ttl_seconds
+        self._pools: "OrderedDict[str, PlayerPool]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "PlayerPoolStore":
+        """
+        Create store configured from environment variables
+
+        SBC_SOLVER_MAX_POOLS: maximum stored pools (default 32)
+        SBC_SOLVER_POOL_TTL: idle seconds before a pool expires (default 86400)
+        """
+        return cls(
+            max_pools=max(1, int(os.environ.get("SBC_SOLVER_MAX_POOLS", "32"))),
+            ttl_seconds=float(os.environ.get("SBC_SOLVER_POOL_TTL", "86400")),
+        )
+
+    def create(self, players: List[SolverPlayer]) -> PlayerPoolInfo:
+        """
+        Store a new pool
+
+        Args:
+            players: Full list of available players
+
+        Returns:
+            Info for the new pool, including its ID
+        """
+        self._expire()
+        while len(self._pools) >= self.max_pools:
+            self._pools.popitem(last=False)
+
+        pool = PlayerPool(uuid.uuid4().hex, players)
+        self._pools[pool.pool_id] = pool
+        return pool.info()
+
+    def get(self, pool_id: str) -> PlayerPool:
+        """
+        Look up a pool and mark it as recently used
+
+        Raises:
+            PlayerPoolNotFoundError: If the pool does not exist or has expired
+        """
+        self._expire()
+        pool = self._pools.get(pool_id)
+        if pool is None:
+            raise PlayerPoolNotFoundError(f"Player pool {pool_id} not found")
+
+        pool.last_used = time.monotonic()
+        self._pools.move_to_end(pool_id)
+        return pool
+
+    def apply_delta(self, pool_id: str, delta: PlayerPoolDelta) -> PlayerPoolInfo:
+        """
+        Apply add/update/remove changes to a pool
+
+        Args:
+            pool_id: Pool to modify
+            delta: Changes to apply
+
+        Returns:
+            Info for the updated pool, listing update/remove ids that were not found
+
+        Raises:
+            PlayerPoolNotFoundError: If the pool does not exist or has expired
+            PlayerPoolVersionError: If delta.base_version does not match the pool
+        """
+        pool = self.get(pool_id)
+        if delta.base_version is not None and delta.base_version != pool.version:
+            raise PlayerPoolVersionError(
+                f"Player pool {pool_id} is at version {pool.version}, "
+                f"delta expects {delta.base_version}"
+            )
+
+        missing_ids = []
+        removed = set()
+        # Card IDs whose row is overwritten / appended (ordered, no duplicates)
+        updated: Dict[int, None] = {}
+        added: Dict[int, None] = {}
+
+        for player_id in delta.remove:
+            if pool.players.pop(player_id, None) is None:
+                missing_ids.append(player_id)
+            else:
+                removed.add(player_id)
+
+        for player in delta.update:
+            if player.id not in pool.players:
+                missing_ids.append(player.id)
+                continue
+            pool.players[player.id] = player
+            updated[player.id] = None
+
+        for player in delta.add:
+            if player.id in pool.players and player.id not in added:
+                updated[player.id] = None
+            else:
+                added[player.id] = None
+            pool.players[player.id] = player
+
+        pool.version += 1
+        if pool._table is not None:
+            pool._table = pool._table.patch(
+                removed,
+                [pool.players[i] for i in updated],
+                [pool.players[i] for i in added],
+            )
+        return pool.info(missing_ids)
+
+    def delete(self, pool_id: str) -> None:
+        """
+        Remove a pool
+
+        Raises:
+            PlayerPoolNotFoundError: If the pool does not exist or has expired
+        """
+        self.get(pool_id)
+        del self._pools[pool_id]
+
+    def _expire(self) -> None:
+        """Drop pools that have been idle longer than the TTL"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [pid for pid, pool in self._pools.items() if pool.last_used < cutoff]
+        for pool_id in expired:
+            del self._pools[pool_id]
+
+    def stats(self) -> dict:
+        """Number of stored pools and cards"""
+        return {
+            "pools": len(self._pools),
+            "max_pools": self.max_pools,
+            "players": sum(len(p.players) for p in self._pools.values()),
+        }
+
+
+# Shared store used by the API routes
+player_pool_store = PlayerPoolStore.from_env()
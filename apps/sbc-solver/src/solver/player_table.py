@@ -0,0 +1,176 @@
+"""
+Columnar player pool for the solver core
+Built once per request so constraint building works on NumPy arrays
+instead of per-player Pydantic attribute access
+"""
+
+from typing import Dict, Iterable, Sequence
+import numpy as np
+from .models import MAX_POSITION_ID, SolverPlayer
+
+# Every per-player array stored on the table
+ARRAY_COLUMNS = (
+    "id",
+    "player_id",
+    "ovr",
+    "club",
+    "league",
+    "country",
+    "quality",
+    "rarity",
+    "squad",
+    "sbc",
+    "position_mask",
+)
+
+# Integer columns available for grouping and filtering
+GROUP_COLUMNS = ("id", "player_id", "club", "league", "country", "quality", "rarity", "ovr")
+
+
+class PlayerTable:
+    """
+    Columnar view of the available players
+
+    Index i in every array refers to players[i] (and player_vars[i] in the model).
+    """
+
+    def __init__(self, players: Sequence[SolverPlayer]):
+        """
+        Build arrays from the request's players
+
+        Args:
+            players: Available players
+
+        Raises:
+            ValueError: If a position ID does not fit in the position bitmask
+        """
+        self.players = list(players)
+        n = len(self.players)
+
+        def column(getter) -> np.ndarray:
+            return np.fromiter((getter(p) for p in self.players), dtype=np.int64, count=n)
+
+        self.id = column(lambda p: p.id)
+        self.player_id = column(lambda p: p.player_id)
+        self.ovr = column(lambda p: p.ovr)
+        self.club = column(lambda p: p.club_id)
+        self.league = column(lambda p: p.league_id)
+        self.country = column(lambda p: p.country_id)
+        self.quality = column(lambda p: p.quality_id)
+        self.rarity = column(lambda p: p.rarity_id)
+        self.squad = np.fromiter((p.squad for p in self.players), dtype=bool, count=n)
+        self.sbc = np.fromiter((p.sbc for p in self.players), dtype=bool, count=n)
+        self.position_mask = column(lambda p: _position_mask(p.positions))
+
+        self._groups: Dict[str, Dict[int, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def take(self, indices: np.ndarray) -> "PlayerTable":
+        """
+        New table containing only the given player indices (in that order)
+
+        Args:
+            indices: Player indices to keep
+
+        Returns:
+            Table over the subset, without re-reading the Pydantic objects
+        """
+        subset = PlayerTable.__new__(PlayerTable)
+        subset.players = [self.players[i] for i in indices.tolist()]
+        for name in ARRAY_COLUMNS:
+            setattr(subset, name, getattr(self, name)[indices])
+        subset._groups = {}
+        return subset
+
+    def patch(
+        self,
+        remove_ids: Iterable[int],
+        update: Sequence[SolverPlayer],
+        add: Sequence[SolverPlayer],
+    ) -> "PlayerTable":
+        """
+        New table with a pool delta applied, reading only the changed players
+
+        Rows keep their order; added players are appended. This table is left
+        untouched, so solves already working on it are not affected.
+
+        Args:
+            remove_ids: ClubPlayer IDs to drop
+            update: Players that replace the row with the same ID
+            add: Players appended after the existing rows
+
+        Returns:
+            Table equal to one built from the changed player list
+        """
+        keep = ~np.isin(self.id, np.fromiter(remove_ids, dtype=np.int64))
+        table = self.take(np.flatnonzero(keep))
+
+        if update:
+            rows = PlayerTable(update)
+            order = np.argsort(table.id, kind="stable")
+            at = order[np.searchsorted(table.id, rows.id, sorter=order)]
+            for name in ARRAY_COLUMNS:
+                getattr(table, name)[at] = getattr(rows, name)
+            for i, player in zip(at.tolist(), rows.players):
+                table.players[i] = player
+
+        if add:
+            rows = PlayerTable(add)
+            table.players += rows.players
+            for name in ARRAY_COLUMNS:
+                setattr(table, name, np.concatenate([getattr(table, name), getattr(rows, name)]))
+        return table
+
+    def column(self, name: str) -> np.ndarray:
+        """Get an integer column by name (see GROUP_COLUMNS)"""
+        if name not in GROUP_COLUMNS:
+            raise ValueError(f"Unknown player column: {name}")
+        return getattr(self, name)
+
+    def group_indices(self, name: str) -> Dict[int, np.ndarray]:
+        """
+        Player indices grouped by the value of a column
+
+        Computed once per column and cached for the lifetime of the table.
+
+        Args:
+            name: Column name (e.g. 'club', 'league', 'country')
+
+        Returns:
+            Mapping of column value to array of player indices
+        """
+        if name not in self._groups:
+            self._groups[name] = _group_by(self.column(name))
+        return self._groups[name]
+
+    def isin(self, name: str, values: Iterable[int]) -> np.ndarray:
+        """Boolean mask of players whose column value is in `values`"""
+        return np.isin(self.column(name), np.fromiter(values, dtype=np.int64))
+
+    def has_position(self, position_id: int) -> np.ndarray:
+        """Boolean mask of players who can play a position"""
+        if position_id < 0 or position_id > MAX_POSITION_ID:
+            return np.zeros(len(self), dtype=bool)
+        return (self.position_mask & (1 << position_id)) != 0
+
+
+def _position_mask(positions: Iterable[int]) -> int:
+    """Encode a list of position IDs as a bitmask"""
+    mask = 0
+    for position_id in positions:
+        if position_id < 0 or position_id > MAX_POSITION_ID:
+            raise ValueError(f"Position ID {position_id} is out of range")
+        mask |= 1 << position_id
+    return mask
+
+
+def _group_by(values: np.ndarray) -> Dict[int, np.ndarray]:
+    """Split indices into groups of equal values"""
+    if len(values) == 0:
+        return {}
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse))[:-1]
+    return dict(zip(unique_values.tolist(), np.split(order, bounds)))
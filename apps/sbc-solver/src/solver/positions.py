@@ -0,0 +1,164 @@
+"""
+Slot assignment for required positions
+Cards are grouped into classes by the required positions they can play, so
+matching, pruning and the CP-SAT encoding scale with the number of distinct
+position classes rather than the number of cards
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .player_table import PlayerTable
+
+# Slot type of squad slots beyond required_positions, fillable by any card
+FREE_SLOT = -1
+
+
+class SlotLayout:
+    """
+    Squad slots grouped by the position they require
+
+    Slot i < len(required_positions) requires required_positions[i]; any
+    remaining slots up to squad_size are free slots (type FREE_SLOT).
+    """
+
+    def __init__(self, required_positions: Sequence[int], squad_size: Optional[int] = None):
+        """
+        Args:
+            required_positions: Position ID required for each squad slot
+            squad_size: Total number of slots (default: one per required position)
+        """
+        self.required_positions = list(required_positions)
+        self.squad_size = max(squad_size or 0, len(self.required_positions))
+        self.slot_types: List[int] = self.required_positions + [FREE_SLOT] * (
+            self.squad_size - len(self.required_positions)
+        )
+
+        self.demand: Dict[int, int] = {}
+        for slot_type in self.slot_types:
+            self.demand[slot_type] = self.demand.get(slot_type, 0) + 1
+
+        self.required_bits = 0
+        for position_id in self.required_positions:
+            self.required_bits |= 1 << position_id
+
+    def compatible_types(self, position_mask: int) -> List[int]:
+        """Slot types a card with this (projected) position mask can fill"""
+        return [
+            slot_type
+            for slot_type in self.demand
+            if slot_type == FREE_SLOT or position_mask & (1 << slot_type)
+        ]
+
+    def capacity(self, position_mask: int) -> int:
+        """Number of slots a card with this position mask can fill"""
+        return sum(self.demand[t] for t in self.compatible_types(position_mask))
+
+
+def position_classes(table: PlayerTable, layout: SlotLayout) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group cards by the required positions they can play
+
+    Args:
+        table: Columnar player pool
+        layout: Squad slots
+
+    Returns:
+        (class position masks, class index of every card)
+    """
+    masks, class_of = np.unique(table.position_mask & layout.required_bits, return_inverse=True)
+    return masks, class_of.reshape(-1)
+
+
+def max_slot_matching(
+    layout: SlotLayout, class_masks: Sequence[int], class_capacity: Sequence[int]
+) -> List[Optional[int]]:
+    """
+    Maximum bipartite matching of squad slots to position classes
+
+    Each class can fill up to class_capacity[c] slots (augmenting paths with
+    capacities; the graph has at most squad_size slots, so this is cheap even
+    with many classes).
+
+    Args:
+        layout: Squad slots
+        class_masks: Projected position mask of every class
+        class_capacity: Number of cards available in every class
+
+    Returns:
+        Class filling every slot, or None for slots that cannot be filled
+    """
+    options = [
+        [
+            c
+            for c, mask in enumerate(class_masks)
+            if class_capacity[c] > 0
+            and (slot_type == FREE_SLOT or int(mask) & (1 << slot_type))
+        ]
+        for slot_type in layout.slot_types
+    ]
+    assigned: List[Optional[int]] = [None] * len(options)
+    slots_of: Dict[int, List[int]] = {}
+
+    def augment(slot: int, visited: set) -> bool:
+        for c in options[slot]:
+            if c in visited:
+                continue
+            visited.add(c)
+            taken = slots_of.setdefault(c, [])
+            if len(taken) < class_capacity[c]:
+                taken.append(slot)
+                assigned[slot] = c
+                return True
+            # Class is full - try to move one of its slots to another class
+            for other in list(taken):
+                if augment(other, visited):
+                    taken.remove(other)
+                    taken.append(slot)
+                    assigned[slot] = c
+                    return True
+        return False
+
+    for slot in range(len(options)):
+        augment(slot, set())
+    return assigned
+
+
+def class_capacity_limits(table: PlayerTable, layout: SlotLayout) -> np.ndarray:
+    """
+    Most cards of each card's position class a squad can use
+
+    A selected card always fills a slot its positions allow, so a class can
+    never contribute more cards than it has compatible slots.
+
+    Args:
+        table: Columnar player pool
+        layout: Squad slots
+
+    Returns:
+        Per-card limit (0 for cards that cannot fill any slot)
+    """
+    masks, class_of = position_classes(table, layout)
+    limits = np.array([layout.capacity(int(mask)) for mask in masks], dtype=np.int64)
+    return limits[class_of] if len(table) else np.zeros(0, dtype=np.int64)
+
+
+def assign_slots(
+    table: PlayerTable, selected: Sequence[int], layout: SlotLayout
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Line up a selected squad
+
+    Args:
+        table: Columnar player pool
+        selected: Indices of the selected cards
+        layout: Squad slots
+
+    Returns:
+        (slot, card index) for every selected card ordered by slot, or None if
+        the cards cannot fill every slot
+    """
+    masks = [int(table.position_mask[i]) & layout.required_bits for i in selected]
+    assigned = max_slot_matching(layout, masks, [1] * len(masks))
+    if any(c is None for c in assigned) or len(selected) != layout.squad_size:
+        return None
+    return [(slot, int(selected[c])) for slot, c in enumerate(assigned)]
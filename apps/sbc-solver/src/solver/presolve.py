@@ -0,0 +1,321 @@
+"""
+Dominance-based candidate pool reduction
+Runs before model building to drop cards that can never improve a solution
+"""
+
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from .models import SBCRequirementSet
+from .objective import player_costs
+from .player_table import PlayerTable
+from .positions import SlotLayout, class_capacity_limits
+
+# Columns that must match for two cards of one player to be interchangeable
+# (everything the constraints and the objective read)
+DUPLICATE_COLUMNS = (
+    "player_id",
+    "ovr",
+    "club",
+    "league",
+    "country",
+    "quality",
+    "rarity",
+    "squad",
+    "position_mask",
+)
+
+
+class PoolReduction:
+    """Result of reducing a player pool"""
+
+    def __init__(self, kept: np.ndarray, original_size: int, num_classes: int):
+        """
+        Args:
+            kept: Indices (into the original table) of the cards that were kept
+            original_size: Number of cards before reduction
+            num_classes: Number of equivalence classes found
+        """
+        self.kept = kept
+        self.original_size = original_size
+        self.reduced_size = len(kept)
+        self.num_classes = num_classes
+
+    def summary(self) -> str:
+        """Human readable description of the reduction"""
+        removed = self.original_size - self.reduced_size
+        percent = 100.0 * removed / self.original_size if self.original_size else 0.0
+        return (
+            f"Pool reduced from {self.original_size} to {self.reduced_size} players "
+            f"({removed} removed, {percent:.0f}%) across {self.num_classes} equivalence classes"
+        )
+
+
+class DuplicateCollapse:
+    """Result of merging duplicate cards"""
+
+    def __init__(self, kept: np.ndarray, original_size: int, replacements: Dict[int, int]):
+        """
+        Args:
+            kept: Indices (into the original table) of the cards that were kept
+            original_size: Number of cards before merging
+            replacements: Card id of every dropped duplicate -> id of the kept card
+        """
+        self.kept = kept
+        self.original_size = original_size
+        self.replacements = replacements
+
+    def resolve(self, card_ids: Iterable[int]) -> List[int]:
+        """Map card ids onto the kept cards (e.g. for solution hints)"""
+        resolved: List[int] = []
+        for card_id in card_ids:
+            card_id = self.replacements.get(card_id, card_id)
+            if card_id not in resolved:
+                resolved.append(card_id)
+        return resolved
+
+    def summary(self) -> str:
+        """Human readable description of the merge"""
+        return (
+            f"Merged {len(self.replacements)} duplicate cards "
+            f"({self.original_size} -> {len(self.kept)} players)"
+        )
+
+
+def equivalence_keys(table: PlayerTable, requirements: SBCRequirementSet) -> np.ndarray:
+    """
+    Build a per-card key from the attributes the requirements actually reference
+
+    Two cards with the same key are interchangeable in every constraint, so they
+    only differ in objective cost. Attributes that are only filtered against a
+    fixed id list (e.g. "Min 2 from clubs [A, B]") contribute a membership bit
+    instead of the raw value, which keeps classes as coarse as possible.
+
+    Args:
+        table: Columnar player pool
+        requirements: Active SBC requirements
+
+    Returns:
+        Array of shape (n, k) - one row per card
+    """
+    columns: List[np.ndarray] = []
+
+    raw_needed = {"club": False, "league": False, "country": False}
+    id_filters = {"club": [], "league": [], "country": []}
+
+    for column, constraints, ids_attr in (
+        ("league", requirements.leagues, "league_ids"),
+        ("country", requirements.countries, "country_ids"),
+        ("club", requirements.clubs, "club_ids"),
+    ):
+        for constraint in constraints or []:
+            ids = getattr(constraint, ids_attr)
+            if ids:
+                id_filters[column].append(ids)
+            else:
+                raw_needed[column] = True
+
+    if requirements.chemistry:
+        raw_needed = {column: True for column in raw_needed}
+
+    for constraint in requirements.diversity or []:
+        raw_needed[{"clubs": "club", "leagues": "league", "countries": "country"}[
+            constraint.attribute
+        ]] = True
+
+    for column in ("club", "league", "country"):
+        if raw_needed[column]:
+            columns.append(table.column(column))
+        else:
+            for ids in id_filters[column]:
+                columns.append(table.isin(column, ids).astype(np.int64))
+
+    if requirements.quality:
+        columns.append(table.quality)
+
+    if requirements.rarity:
+        columns.append((table.rarity > 1).astype(np.int64))
+
+    if requirements.team_rating:
+        columns.append(table.ovr)
+
+    if requirements.required_positions:
+        required_bits = 0
+        for position_id in set(requirements.required_positions):
+            required_bits |= 1 << position_id
+        columns.append(table.position_mask & required_bits)
+
+    if not columns:
+        return np.zeros((len(table), 1), dtype=np.int64)
+    return np.stack(columns, axis=1)
+
+
+def reduce_pool(
+    table: PlayerTable,
+    requirements: SBCRequirementSet,
+    keep_per_class: Optional[int] = None,
+    headroom: int = 1,
+    slot_capacity: bool = True,
+    spare: int = 0,
+) -> PoolReduction:
+    """
+    Keep only the cheapest cards of every equivalence class
+
+    Within a class, cards differ only in cost, so a more expensive card is only
+    needed once `squad_size` cheaper ones (of different players) are used up.
+    Per class this keeps the cheapest card of every player, then the
+    `keep_per_class` cheapest of those.
+
+    Players with cards in more than one class are always kept (cheapest card per
+    class), because the one-card-per-player rule couples their classes and a
+    cheaper card of theirs may be blocked by a card selected elsewhere.
+
+    With required positions, a class is further capped at the number of slots
+    its positions can fill, and cards that fit no slot are dropped entirely
+    (unless slot_capacity is off). Such a pool is only valid while the
+    position requirement is enforced.
+
+    Args:
+        table: Columnar player pool
+        requirements: Active SBC requirements
+        keep_per_class: Cards to keep per class (default: squad size)
+        headroom: Keep this multiple of the cards a squad can use per class
+            (extra cards let a model template cover later, smaller pools)
+        slot_capacity: Cap classes at the slots their positions can fill; off
+            for pools also used without required_positions (conflict explanation)
+        spare: Extra cards to keep per class beyond what one squad can use
+            (alternative squads swap cards for others of the same class)
+
+    Returns:
+        Reduction result with the kept indices, in original order
+    """
+    keep = np.full(len(table), keep_per_class or requirements.squad_size, dtype=np.int64)
+    if requirements.required_positions and slot_capacity:
+        layout = SlotLayout(requirements.required_positions, requirements.squad_size)
+        keep = np.minimum(keep, class_capacity_limits(table, layout))
+    return _reduce(table, equivalence_keys(table, requirements), (keep + spare) * headroom)
+
+
+def reduce_batch_pool(
+    table: PlayerTable, requirement_sets: List[SBCRequirementSet]
+) -> PoolReduction:
+    """
+    Reduce a pool shared by several squads (see reduce_pool)
+
+    Cards are only interchangeable if they are for every requirement set, and
+    a class may have to supply every squad, so up to the combined squad size
+    is kept per class.
+
+    Args:
+        table: Columnar player pool
+        requirement_sets: Requirements of every squad
+
+    Returns:
+        Reduction result with the kept indices, in original order
+    """
+    keys = np.concatenate(
+        [equivalence_keys(table, requirements) for requirements in requirement_sets], axis=1
+    )
+    keep = np.full(len(table), sum(r.squad_size for r in requirement_sets), dtype=np.int64)
+
+    # Different cards of one player may be used in different squads
+    return _reduce(table, keys, keep, copies=len(requirement_sets))
+
+
+def _reduce(
+    table: PlayerTable, keys: np.ndarray, keep: np.ndarray, copies: int = 1
+) -> PoolReduction:
+    """
+    Keep the cheapest cards of every class of identical keys
+
+    keep[i] is the number of cards to keep of card i's class (equal within a
+    class); cards with a limit of 0 are never kept. At most `copies` cards of
+    one player are kept per class.
+    """
+    n = len(table)
+    if n == 0:
+        return PoolReduction(np.arange(0), 0, 0)
+
+    costs = player_costs(table)
+
+    _, class_ids = np.unique(keys, axis=0, return_inverse=True)
+    class_ids = class_ids.reshape(-1)
+    num_classes = int(class_ids.max()) + 1
+
+    # Cheapest cards of every (class, player) pair
+    # (ties broken by card id so the result does not depend on pool order)
+    order = np.lexsort((table.id, costs, table.player_id, class_ids))
+    representatives = order[_rank_in_groups(class_ids[order], table.player_id[order]) < copies]
+    representatives = representatives[keep[representatives] > 0]
+
+    # Players whose cards fall into more than one class
+    rep_players = table.player_id[representatives]
+    player_classes = np.unique(
+        np.stack([rep_players, class_ids[representatives]], axis=1), axis=0
+    )
+    unique_players, classes_per_player = np.unique(player_classes[:, 0], return_counts=True)
+    multi_class_players = unique_players[classes_per_player > 1]
+    shared = np.isin(rep_players, multi_class_players)
+
+    # Rank the remaining representatives by cost within their class
+    exclusive = representatives[~shared]
+    exclusive = exclusive[
+        np.lexsort((table.id[exclusive], costs[exclusive], class_ids[exclusive]))
+    ]
+    rank = _rank_in_groups(class_ids[exclusive])
+
+    kept = np.concatenate([exclusive[rank < keep[exclusive]], representatives[shared]])
+    return PoolReduction(np.sort(kept), n, num_classes)
+
+
+def collapse_duplicates(table: PlayerTable, copies: int = 1) -> DuplicateCollapse:
+    """
+    Merge duplicate cards of the same player
+
+    Cards of one player that agree on every solver-relevant column (see
+    DUPLICATE_COLUMNS) are fully symmetric: same constraints, same cost, and
+    the unique-player rule allows only one of them per squad. Only the lowest
+    card id of each group is kept (the `copies` lowest, for solves where one
+    player can appear in several squads), so the model has one variable per
+    group and every selected variable already is a concrete ClubPlayer id.
+
+    Args:
+        table: Columnar player pool
+        copies: Cards to keep per group of duplicates
+
+    Returns:
+        Kept indices (in original order) and the card each dropped card maps to
+    """
+    n = len(table)
+    if n == 0:
+        return DuplicateCollapse(np.arange(0), 0, {})
+
+    keys = np.stack([getattr(table, name).astype(np.int64) for name in DUPLICATE_COLUMNS], axis=1)
+    _, groups = np.unique(keys, axis=0, return_inverse=True)
+    groups = groups.reshape(-1)
+
+    order = np.lexsort((table.id, groups))
+    rank = _rank_in_groups(groups[order])
+    kept = order[rank < copies]
+
+    # Dropped duplicates map to the first card of their group
+    first_id = np.empty(int(groups.max()) + 1, dtype=np.int64)
+    first_id[groups[order[rank == 0]]] = table.id[order[rank == 0]]
+    dropped = order[rank >= copies]
+    replacements = dict(zip(table.id[dropped].tolist(), first_id[groups[dropped]].tolist()))
+
+    return DuplicateCollapse(np.sort(kept), n, replacements)
+
+
+def _rank_in_groups(*columns: np.ndarray) -> np.ndarray:
+    """
+    Position of every row within its run of equal values
+
+    Rows must already be sorted so equal (column, ...) tuples are adjacent.
+    """
+    n = len(columns[0])
+    boundary = np.zeros(n, dtype=bool)
+    boundary[:1] = True
+    for column in columns:
+        boundary[1:] |= column[1:] != column[:-1]
+    starts = np.maximum.accumulate(np.where(boundary, np.arange(n), 0))
+    return np.arange(n) - starts
@@ -0,0 +1,118 @@
+"""
+CPU-aware scheduling of CP-SAT search workers
+Shares a global core budget between all active solves
+"""
+
+import os
+from typing import Dict
+
+
+class CoreScheduler:
+    """
+    Allocates CP-SAT search workers from a global core budget
+
+    Each solve gets a share of the budget based on how many solves are running
+    or waiting, capped by the cores that are actually free. A solve always gets
+    at least `min_workers_per_solve`, so the budget can be exceeded briefly
+    under heavy load instead of blocking.
+
+    The allocation is fixed for the life of a solve: CP-SAT reads
+    num_search_workers once when the search starts, so a running solve cannot
+    give cores back. A solve admitted into an idle pool therefore takes up to
+    `max_workers_per_solve`, and one arriving while it runs gets only the
+    cores still free (at least `min_workers_per_solve`) until the first ends.
+    Queued solves are the exception: they are counted when a solve is
+    admitted, so a burst of requests is split evenly. Keeping
+    `max_workers_per_solve` below the budget leaves room for late arrivals.
+    """
+
+    def __init__(
+        self,
+        core_budget: int,
+        max_workers_per_solve: int = 8,
+        min_workers_per_solve: int = 1,
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            core_budget: Total number of cores shared by all solves
+            max_workers_per_solve: Upper bound on search workers for one solve
+            min_workers_per_solve: Lower bound on search workers for one solve
+        """
+        self.core_budget = core_budget
+        self.max_workers_per_solve = max_workers_per_solve
+        self.min_workers_per_solve = min_workers_per_solve
+        self._allocations: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "CoreScheduler":
+        """
+        Create scheduler configured from environment variables
+
+        SBC_SOLVER_CORE_BUDGET: cores shared by all solves (default: CPU count)
+        SBC_SOLVER_MAX_SEARCH_WORKERS: search workers for a single solve (default 8)
+        """
+        return cls(
+            core_budget=max(
+                1, int(os.environ.get("SBC_SOLVER_CORE_BUDGET") or os.cpu_count() or 1)
+            ),
+            max_workers_per_solve=max(
+                1, int(os.environ.get("SBC_SOLVER_MAX_SEARCH_WORKERS", "8"))
+            ),
+        )
+
+    @property
+    def allocated(self) -> int:
+        """Number of cores currently allocated"""
+        return sum(self._allocations.values())
+
+    @property
+    def free(self) -> int:
+        """Number of cores not allocated to any solve"""
+        return max(0, self.core_budget - self.allocated)
+
+    def acquire(self, solve_id: str, waiting: int = 0) -> int:
+        """
+        Allocate search workers for a solve that is about to start
+
+        The share is min(max_workers_per_solve, budget / (running + 1 +
+        waiting), free cores), at least min_workers_per_solve, and does not
+        change until release().
+
+        Args:
+            solve_id: Unique ID of the solve
+            waiting: Number of solves still waiting to start
+
+        Returns:
+            Number of search workers the solve should use
+        """
+        # Fair share across running solves, this one and the ones queued behind it
+        contenders = len(self._allocations) + 1 + waiting
+        fair_share = self.core_budget // contenders
+
+        workers = min(self.max_workers_per_solve, fair_share, self.free)
+        workers = max(self.min_workers_per_solve, workers)
+
+        self._allocations[solve_id] = workers
+        return workers
+
+    def release(self, solve_id: str) -> None:
+        """
+        Return a solve's cores to the budget
+
+        Args:
+            solve_id: Unique ID of the solve
+        """
+        self._allocations.pop(solve_id, None)
+
+    def stats(self) -> dict:
+        """Budget and current allocation"""
+        return {
+            "core_budget": self.core_budget,
+            "max_workers_per_solve": self.max_workers_per_solve,
+            "allocated": self.allocated,
+            "free": self.free,
+            "active_solves": len(self._allocations),
+            "allocations": dict(self._allocations),
+        }
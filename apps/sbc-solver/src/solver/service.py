@@ -0,0 +1,332 @@
+"""
+Solve service used by the API routes
+Prepares requests in the API process (feasibility check, pool reduction,
+fingerprinting, caching) and dispatches the actual search to the worker pool
+"""
+
+import asyncio
+import time
+from typing import Callable, Optional, Set
+from .cache import ResultCache, request_fingerprint, requirements_fingerprint
+from .capture import RequestCapture
+from .executor import SolverExecutor, solver_executor
+from .feasibility import check_batch_requirements, check_requirements, describe_violations
+from .hints import SolutionHintStore
+from .instrumentation import NESTED_STAGES, StageTimer, StatsAggregator
+from .metrics import solver_metrics
+from .models import (
+    SolveSBCRequest,
+    SolveSBCResponse,
+    SolveSBCBatchRequest,
+    SolveSBCBatchResponse,
+    SolveProgress,
+    SolveStats,
+)
+from .player_table import PlayerTable
+from .presolve import reduce_batch_pool, reduce_pool
+from .templates import model_templates
+
+
+class SolveService:
+    """Front door for solve requests"""
+
+    def __init__(
+        self,
+        executor: SolverExecutor,
+        cache: ResultCache,
+        hints: SolutionHintStore,
+        capture: Optional[RequestCapture] = None,
+    ):
+        """
+        Initialize service
+
+        Args:
+            executor: Worker pool that runs the CP-SAT search
+            cache: Cache of previous responses
+            hints: Last good selection per requirement set, used as warm starts
+            capture: Optional sampler writing solves to capture files for replay
+        """
+        self.executor = executor
+        self.cache = cache
+        self.hints = hints
+        self.capture = capture
+        self._capture_writes: Set[asyncio.Task] = set()
+        self._cancelled_jobs: Set[str] = set()
+        self.solve_stats = StatsAggregator()
+
+    async def solve(
+        self,
+        request: SolveSBCRequest,
+        table: Optional[PlayerTable] = None,
+        on_progress: Optional[Callable[[SolveProgress], None]] = None,
+        on_start: Optional[Callable[[], None]] = None,
+        received_at: Optional[float] = None,
+    ) -> SolveSBCResponse:
+        """
+        Solve a request, answering from the cache when possible
+
+        The pool is reduced here so the fingerprint ignores dominated cards and
+        the worker receives only the cards that matter. Misses are warm-started
+        with the last good selection for the same requirements, on top of any
+        hint ids the caller passed.
+
+        Args:
+            request: SBC solve request with players resolved
+            table: Prebuilt table of request.available_players (e.g. from a stored pool)
+            on_progress: Optional callback for every improving solution (not
+                called for cached responses)
+            on_start: Optional callback run once the solve leaves the worker queue
+            received_at: time.perf_counter() when the HTTP request arrived, for
+                the parse stage timing
+
+        Stage timings and model size are recorded for every solve that reaches
+        a worker and returned in the response if request.include_stats is set.
+        Sampled solves are also written to a capture file in the background.
+
+        Returns:
+            Solver response
+
+        Raises:
+            SolverBusyError: If the worker pool queue is full
+            DuplicateJobError: If request.job_id belongs to a solve still in progress
+        """
+        start = time.perf_counter()
+        response = await self._solve(request, table, on_progress, on_start, received_at)
+        solver_metrics.observe_solve("single", response.status, time.perf_counter() - start)
+        return response
+
+    async def _solve(
+        self,
+        request: SolveSBCRequest,
+        table: Optional[PlayerTable],
+        on_progress: Optional[Callable[[SolveProgress], None]],
+        on_start: Optional[Callable[[], None]],
+        received_at: Optional[float],
+    ) -> SolveSBCResponse:
+        timer = StageTimer()
+        if received_at is not None:
+            timer.add("parse", time.perf_counter() - received_at)
+        prepare_start = time.perf_counter()
+
+        deadline = None
+        if request.deadline is not None:
+            deadline = time.monotonic() + request.deadline
+
+        if table is None:
+            table = PlayerTable(request.available_players)
+        pool_size = len(table)
+
+        # Impossible requirements are answered here without a worker round trip
+        violations = check_requirements(table, request.requirements, request.quality_map)
+        if violations:
+            return SolveSBCResponse(
+                success=False,
+                status="INFEASIBLE",
+                solve_time=0.0,
+                message=describe_violations(violations),
+                violations=violations,
+                job_id=request.job_id,
+            )
+
+        if request.reduce_pool:
+            # Keep the cards a worker's model template is built over, and the
+            # cards beyond slot capacity a conflict explanation may need
+            headroom = model_templates.headroom if model_templates.enabled else 1
+            table = table.take(
+                reduce_pool(
+                    table,
+                    request.requirements,
+                    headroom=headroom,
+                    slot_capacity=False,
+                    spare=request.alternatives * request.min_difference,
+                ).kept
+            )
+
+        key = request_fingerprint(request, table)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.model_copy(update={"job_id": request.job_id})
+
+        requirements_key = requirements_fingerprint(request)
+        hint_ids = list(request.hint_player_ids or [])
+        hint_ids += [i for i in self.hints.lookup(requirements_key) if i not in hint_ids]
+
+        reduced_request = request.model_copy(
+            update={"available_players": table.players, "hint_player_ids": hint_ids or None}
+        )
+        submitted = time.perf_counter()
+        timer.add("prepare", submitted - prepare_start)
+        started: Optional[float] = None
+
+        capture_id = self.capture.sample() if self.capture is not None else None
+        model_path = self.capture.model_path(capture_id) if capture_id else None
+
+        def started_running() -> None:
+            nonlocal started
+            started = time.perf_counter()
+            if on_start is not None:
+                on_start()
+
+        try:
+            response = await self.executor.solve(
+                reduced_request, on_progress, started_running, deadline, model_path
+            )
+        except BaseException:
+            # No capture is written, so don't leave the exported model behind
+            if capture_id is not None:
+                self.capture.discard(capture_id)
+            raise
+        finally:
+            cancelled = request.job_id in self._cancelled_jobs
+            self._cancelled_jobs.discard(request.job_id)
+        response.job_id = request.job_id
+
+        if response.stats is not None and started is not None:
+            self._record_stats(response.stats, timer, submitted, started, pool_size)
+        if capture_id is not None:
+            self._write_capture(
+                capture_id, reduced_request, response, time.perf_counter() - prepare_start
+            )
+
+        # A cancelled search may have stopped early, so its answer is not reused
+        if not cancelled:
+            self.cache.put(key, response.model_copy(update={"stats": None}))
+        if not request.include_stats:
+            response.stats = None
+        if response.success:
+            self.hints.remember(requirements_key, response.selected_player_ids)
+        return response
+
+    async def solve_batch(
+        self,
+        request: SolveSBCBatchRequest,
+        table: Optional[PlayerTable] = None,
+        on_start: Optional[Callable[[], None]] = None,
+    ) -> SolveSBCBatchResponse:
+        """
+        Solve several SBCs jointly over one pool
+
+        Batches are reduced like single solves but are not cached or hinted.
+
+        Args:
+            request: Batch request with players resolved
+            table: Prebuilt table of request.available_players (e.g. from a stored pool)
+            on_start: Optional callback run once the solve leaves the worker queue
+
+        Returns:
+            Batch response
+
+        Raises:
+            SolverBusyError: If the worker pool queue is full
+            DuplicateJobError: If request.job_id belongs to a solve still in progress
+        """
+        start = time.perf_counter()
+        response = await self._solve_batch(request, table, on_start)
+        solver_metrics.observe_solve("batch", response.status, time.perf_counter() - start)
+        return response
+
+    async def _solve_batch(
+        self,
+        request: SolveSBCBatchRequest,
+        table: Optional[PlayerTable],
+        on_start: Optional[Callable[[], None]],
+    ) -> SolveSBCBatchResponse:
+        deadline = None
+        if request.deadline is not None:
+            deadline = time.monotonic() + request.deadline
+
+        if table is None:
+            table = PlayerTable(request.available_players)
+
+        violations = check_batch_requirements(table, request.squads, request.quality_map)
+        if violations:
+            return SolveSBCBatchResponse(
+                success=False,
+                status="INFEASIBLE",
+                solve_time=0.0,
+                message=describe_violations(violations),
+                violations=violations,
+                job_id=request.job_id,
+            )
+
+        if request.reduce_pool:
+            table = table.take(reduce_batch_pool(table, request.squads).kept)
+
+        reduced_request = request.model_copy(update={"available_players": table.players})
+        try:
+            response = await self.executor.solve(
+                reduced_request, on_start=on_start, deadline=deadline
+            )
+        finally:
+            self._cancelled_jobs.discard(request.job_id)
+        response.job_id = request.job_id
+        return response
+
+    def _record_stats(
+        self,
+        stats: SolveStats,
+        timer: StageTimer,
+        submitted: float,
+        started: float,
+        pool_size: int,
+    ) -> None:
+        """Add the API-side stages to a worker's stats and aggregate them"""
+        worker_time = sum(
+            seconds for name, seconds in stats.timings.items() if name not in NESTED_STAGES
+        )
+        timer.add("queue_wait", started - submitted)
+        timer.add("transfer", max(0.0, time.perf_counter() - started - worker_time))
+        stats.timings = {**timer.timings, **stats.timings}
+        stats.pool_size = pool_size
+        self.solve_stats.record(stats)
+        solver_metrics.observe_stats(stats)
+
+    def _write_capture(
+        self,
+        capture_id: str,
+        request: SolveSBCRequest,
+        response: SolveSBCResponse,
+        seconds: float,
+    ) -> None:
+        """Write a sampled solve's capture file off the event loop"""
+        task = asyncio.create_task(
+            asyncio.to_thread(
+                self.capture.write, capture_id, request, response.model_copy(), seconds
+            )
+        )
+        self._capture_writes.add(task)
+        task.add_done_callback(self._capture_writes.discard)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running solve
+
+        Args:
+            job_id: Job ID of the solve
+
+        Returns:
+            False if no solve with this job ID is in progress
+        """
+        if not self.executor.cancel(job_id):
+            return False
+        self._cancelled_jobs.add(job_id)
+        return True
+
+    def stats(self) -> dict:
+        """Cache, hint and per-stage solve statistics"""
+        return {
+            "cache": self.cache.stats(),
+            "hints": self.hints.stats(),
+            "solves": self.solve_stats.summary(),
+            **({"capture": self.capture.stats()} if self.capture is not None else {}),
+        }
+
+
+# Shared service used by the API routes
+solve_service = SolveService(
+    solver_executor,
+    ResultCache.from_env(),
+    SolutionHintStore.from_env(),
+    RequestCapture.from_env(),
+)
+solver_metrics.watch_executor(solver_executor)
@@ -0,0 +1,164 @@
+"""
+Compile-once model templates
+Repeat solves of the same requirement set reuse a model built once over a
+slightly larger pool: cards of the new pool are matched to template cards,
+every other template card is fixed to 0, and only the search runs again
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ortools.sat.python import cp_model
+from .player_table import PlayerTable
+from .presolve import DUPLICATE_COLUMNS
+
+Signature = Tuple[int, ...]
+
+
+def card_signatures(table: PlayerTable) -> List[Signature]:
+    """
+    Everything the model reads about each card (see DUPLICATE_COLUMNS)
+
+    Two cards with the same signature get identical constraints and objective
+    coefficients, so one can take the other's variable. Within a table whose
+    duplicates were collapsed, signatures are unique.
+    """
+    columns = np.stack(
+        [getattr(table, name).astype(np.int64) for name in DUPLICATE_COLUMNS], axis=1
+    )
+    return [tuple(row) for row in columns.tolist()]
+
+
+class ModelTemplate:
+    """A built model (requirements and objective, no hints) and the cards it covers"""
+
+    def __init__(self, model: cp_model.CpModel, player_vars, table: PlayerTable):
+        """
+        Args:
+            model: Model built over table; kept as is, solves work on clones
+            player_vars: Selection variable of every card of table
+            table: Cards the model was built for
+        """
+        self.model = model
+        self.var_indices = [var.Index() for var in player_vars]
+        self.positions: Dict[Signature, int] = {
+            signature: i for i, signature in enumerate(card_signatures(table))
+        }
+        self.size = len(table)
+
+    def instantiate(
+        self, table: PlayerTable
+    ) -> Optional[Tuple[cp_model.CpModel, List, int]]:
+        """
+        Model for a pool of cards covered by the template
+
+        The template's constraints and objective only depend on card
+        signatures, and every constraint is linear in the selection
+        variables, so fixing unmatched cards to 0 gives exactly the model that
+        would be built for table (variable bounds are patched in the proto;
+        objective coefficients follow from the signature and need no change).
+
+        Args:
+            table: Collapsed pool of the new request
+
+        Returns:
+            (model copy, selection variable of every card of table, number of
+            template cards fixed to 0), or None if the table has a card the
+            template does not cover
+        """
+        matched = []
+        for signature in card_signatures(table):
+            position = self.positions.get(signature)
+            if position is None:
+                return None
+            matched.append(position)
+
+        model = self.model.Clone()
+        used = np.zeros(self.size, dtype=bool)
+        used[matched] = True
+        variables = model.Proto().variables
+        for position in np.flatnonzero(~used).tolist():
+            variables[self.var_indices[position]].domain[:] = [0, 0]
+
+        player_vars = [model.GetBoolVarFromProtoIndex(self.var_indices[p]) for p in matched]
+        return model, player_vars, self.size - len(matched)
+
+
+class TemplateCache:
+    """
+    Model templates of recent requirement sets (per process, LRU)
+
+    Templates are built over `headroom` times the cards each equivalence class
+    needs, so a later pool that lost the cards of a submitted squad still
+    falls within the template.
+    """
+
+    def __init__(self, max_entries: int, headroom: int = 2):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum number of templates (0 disables templates)
+            headroom: Multiple of the needed cards per class a template covers
+        """
+        self.max_entries = max_entries
+        self.headroom = headroom
+        self._templates: "OrderedDict[str, ModelTemplate]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "TemplateCache":
+        """
+        Create cache configured from environment variables
+
+        SBC_SOLVER_TEMPLATE_ENTRIES: templates kept per worker (default 16, 0 disables)
+        SBC_SOLVER_TEMPLATE_HEADROOM: cards per class covered, as a multiple of
+            those needed (default 2)
+        """
+        return cls(
+            max_entries=max(0, int(os.environ.get("SBC_SOLVER_TEMPLATE_ENTRIES", "16"))),
+            headroom=max(1, int(os.environ.get("SBC_SOLVER_TEMPLATE_HEADROOM", "2"))),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def instantiate(
+        self, key: str, table: PlayerTable
+    ) -> Optional[Tuple[cp_model.CpModel, List, int]]:
+        """
+        Model for a pool from the template of a requirement set
+
+        Args:
+            key: Requirement fingerprint
+            table: Collapsed pool of the new request
+
+        Returns:
+            (model, selection variables, fixed card count) as in
+            ModelTemplate.instantiate, or None if there is no template
+            covering the pool
+        """
+        template = self._templates.get(key)
+        instance = template.instantiate(table) if template is not None else None
+        if instance is None:
+            self.misses += 1
+            return None
+        self._templates.move_to_end(key)
+        self.hits += 1
+        return instance
+
+    def put(self, key: str, template: ModelTemplate) -> None:
+        """Store (or replace) the template of a requirement set"""
+        if not self.enabled:
+            return
+        self._templates[key] = template
+        self._templates.move_to_end(key)
+        while len(self._templates) > self.max_entries:
+            self._templates.popitem(last=False)
+
+
+# Templates of the requirement sets solved in this process
+model_templates = TemplateCache.from_env()
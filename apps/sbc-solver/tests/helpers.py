@@ -0,0 +1,106 @@
+"""
+Shared test helpers
+Pools come from the benchmark generator, so tests run on reproducible,
+realistically shaped clubs
+"""
+
+import asyncio
+from typing import List, Optional, Sequence
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import QUALITY_IDS, generate_club
+from src.solver.models import SBCRequirementSet, SolveSBCRequest, SolveSBCResponse, SolverPlayer
+from src.solver.or_tools_solver import SBCSolver
+
+# A case that needs far longer than the stops in the tests to finish its search
+SLOW_CASE = "chemistry_high"
+
+
+def make_request(
+    requirements: SBCRequirementSet, players: List[SolverPlayer], **fields
+) -> SolveSBCRequest:
+    """Solve request over players (with the generator's quality IDs by default)"""
+    fields.setdefault("max_solve_time", 10)
+    fields.setdefault("quality_map", QUALITY_IDS)
+    return SolveSBCRequest(requirements=requirements, available_players=players, **fields)
+
+
+def slow_request(**fields) -> SolveSBCRequest:
+    """Request whose search runs until it is stopped (or for 30 seconds)"""
+    fields.setdefault("max_solve_time", 30)
+    fields.setdefault("no_improvement_time", 30)
+    return make_request(CORPUS[SLOW_CASE], generate_club(300, seed=5), **fields)
+
+
+def solve(requirements: SBCRequirementSet, players: List[SolverPlayer], **fields):
+    """Solve in this process with the given request fields"""
+    return SBCSolver(num_search_workers=4).solve(make_request(requirements, players, **fields))
+
+
+def make_player(
+    card_id: int,
+    player_id: Optional[int] = None,
+    ovr: int = 70,
+    club: int = 1,
+    league: int = 1,
+    country: int = 1,
+    quality: int = 3,
+    rarity: int = 1,
+    positions: Sequence[int] = (3,),
+    squad: bool = False,
+) -> SolverPlayer:
+    """Hand-built card (its own player unless player_id is given)"""
+    return SolverPlayer(
+        id=card_id,
+        player_id=card_id if player_id is None else player_id,
+        display_name=f"Player {card_id}",
+        full_name=f"Player {card_id}",
+        ovr=ovr,
+        rating1=ovr,
+        rating2=ovr,
+        rating3=ovr,
+        rating4=ovr,
+        rating5=ovr,
+        rating6=ovr,
+        quality_id=quality,
+        rarity_id=rarity,
+        country_id=country,
+        club_id=club,
+        league_id=league,
+        positions=list(positions),
+        sbc=False,
+        squad=squad,
+    )
+
+
+class RecordingExecutor:
+    """
+    Stand-in for SolverExecutor that answers every solve with a fixed squad
+
+    Records the requests the service dispatches. Solves block until
+    `release` is set (set by default).
+    """
+
+    def __init__(self, selected_ids: Sequence[int] = ()):
+        self.selected_ids = list(selected_ids)
+        self.requests: List[SolveSBCRequest] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def solve(self, request, on_progress=None, on_start=None, deadline=None, model_path=None):
+        self.requests.append(request)
+        await self.release.wait()
+        if on_start is not None:
+            on_start()
+        return SolveSBCResponse(
+            success=True,
+            status="OPTIMAL",
+            selected_player_ids=self.selected_ids,
+            solve_time=0.0,
+            job_id=request.job_id,
+        )
+
+    def check_capacity(self) -> None:
+        pass
+
+    def cancel(self, job_id: str) -> bool:
+        return False
@@ -0,0 +1,48 @@
+"""Alternative squads returned after the best one"""
+
+from itertools import combinations
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from src.solver.models import SBCRequirementSet
+from src.solver.objective import selection_cost
+from src.solver.player_table import PlayerTable
+from tests.helpers import make_player, solve
+
+
+def test_alternatives_differ_and_cost_more():
+    players = generate_club(300, seed=5)
+
+    response = solve(CORPUS["daily_gold_rating"], players, alternatives=3, min_difference=2)
+
+    assert response.success
+    assert len(response.alternatives) == 3
+    table = PlayerTable(players)
+    squads = [response.selected_player_ids] + [
+        alternative.selected_player_ids for alternative in response.alternatives
+    ]
+    for first, second in combinations(squads, 2):
+        assert len(set(first) - set(second)) >= 2
+    objectives = [response.objective] + [a.objective for a in response.alternatives]
+    assert objectives == sorted(objectives)
+    for alternative in response.alternatives:
+        assert len(alternative.selected_player_ids) == 11
+        assert alternative.objective == selection_cost(table, alternative.selected_player_ids)
+
+
+def test_fewer_alternatives_when_the_pool_runs_out():
+    # Three cards make only three different squads of two
+    players = [make_player(i, ovr=60 + i) for i in range(1, 4)]
+
+    response = solve(SBCRequirementSet(squad_size=2), players, alternatives=5)
+
+    assert len(response.alternatives) == 2
+    squads = {frozenset(response.selected_player_ids)} | {
+        frozenset(alternative.selected_player_ids) for alternative in response.alternatives
+    }
+    assert len(squads) == 3
+
+
+def test_no_alternatives_unless_requested():
+    response = solve(CORPUS["daily_bronze_upgrade"], generate_club(300, seed=5))
+
+    assert response.alternatives is None
@@ -0,0 +1,81 @@
+"""Joint solves of several squads over one pool"""
+
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import QUALITY_IDS, generate_club
+from src.solver.models import SBCRequirementSet, SolveSBCBatchRequest
+from src.solver.or_tools_solver import SBCSolver
+from tests.helpers import make_player
+
+
+def _solve_batch(squads, players, **fields):
+    request = SolveSBCBatchRequest(
+        squads=squads,
+        available_players=players,
+        max_solve_time=10,
+        quality_map=QUALITY_IDS,
+        **fields,
+    )
+    return SBCSolver(num_search_workers=4).solve_batch(request)
+
+
+def _assert_disjoint(response):
+    selected = [card for squad in response.squads for card in squad.selected_player_ids]
+    assert len(selected) == len(set(selected))
+
+
+def test_squads_use_disjoint_cards():
+    squads = [
+        CORPUS["daily_bronze_upgrade"],
+        CORPUS["daily_silver_upgrade"],
+        CORPUS["league_nation"],
+    ]
+
+    response = _solve_batch(squads, generate_club(300, seed=5))
+
+    assert response.success
+    assert [len(squad.selected_player_ids) for squad in response.squads] == [11, 11, 11]
+    _assert_disjoint(response)
+
+
+def test_squads_competing_for_the_same_cards_split_them():
+    players = [make_player(i) for i in range(1, 5)]
+    squads = [SBCRequirementSet(squad_size=2), SBCRequirementSet(squad_size=2)]
+
+    response = _solve_batch(squads, players, reduce_pool=False)
+
+    assert response.success
+    _assert_disjoint(response)
+    assert sorted(sum((s.selected_player_ids for s in response.squads), [])) == [1, 2, 3, 4]
+
+
+def test_copies_of_a_player_can_go_to_different_squads():
+    # Cards 1 and 4 are the same player, who may appear once per squad
+    players = [make_player(i) for i in range(1, 4)] + [make_player(4, player_id=1)]
+    squads = [SBCRequirementSet(squad_size=2), SBCRequirementSet(squad_size=2)]
+
+    response = _solve_batch(squads, players)
+
+    assert response.success
+    _assert_disjoint(response)
+    for squad in response.squads:
+        assert not {1, 4} <= set(squad.selected_player_ids)
+
+
+def test_too_few_cards_for_every_squad_is_infeasible():
+    players = [make_player(i) for i in range(1, 4)]
+    squads = [SBCRequirementSet(squad_size=2), SBCRequirementSet(squad_size=2)]
+
+    response = _solve_batch(squads, players)
+
+    assert not response.success
+    assert response.status == "INFEASIBLE"
+
+
+def test_violations_name_the_squad():
+    players = [make_player(i) for i in range(1, 4)]
+    squads = [SBCRequirementSet(squad_size=2), SBCRequirementSet(squad_size=4)]
+
+    response = _solve_batch(squads, players)
+
+    assert response.status == "INFEASIBLE"
+    assert [v.requirement for v in response.violations] == ["squads[1].squad_size"]
@@ -0,0 +1,39 @@
+"""Request fingerprints and the result cache"""
+
+from src.solver.cache import request_fingerprint, requirements_fingerprint
+from src.solver.models import ClubConstraint, LeagueConstraint, SBCRequirementSet
+from src.solver.player_table import PlayerTable
+from tests.helpers import make_player, make_request
+
+
+def _fingerprint(requirements: SBCRequirementSet, players) -> str:
+    return request_fingerprint(make_request(requirements, players), PlayerTable(players))
+
+
+def test_pool_and_id_list_order_do_not_change_the_fingerprint():
+    players = [make_player(i) for i in range(1, 6)]
+    first = SBCRequirementSet(
+        squad_size=3, leagues=[LeagueConstraint(type="min", count=1, league_ids=[1, 2])]
+    )
+    second = SBCRequirementSet(
+        squad_size=3, leagues=[LeagueConstraint(type="min", count=1, league_ids=[2, 1])]
+    )
+
+    assert _fingerprint(first, players) == _fingerprint(second, players[::-1])
+
+
+def test_requirement_order_changes_the_fingerprint():
+    # Responses name requirements by index, so a cached 'clubs[0]' must not
+    # be served for a request whose clubs[0] is a different constraint
+    players = [make_player(i) for i in range(1, 6)]
+    clubs = [
+        ClubConstraint(type="min", count=2, club_ids=[1]),
+        ClubConstraint(type="max", count=1, club_ids=[2]),
+    ]
+    first = SBCRequirementSet(squad_size=3, clubs=clubs)
+    second = SBCRequirementSet(squad_size=3, clubs=clubs[::-1])
+
+    assert _fingerprint(first, players) != _fingerprint(second, players)
+    assert requirements_fingerprint(make_request(first, players)) != requirements_fingerprint(
+        make_request(second, players)
+    )
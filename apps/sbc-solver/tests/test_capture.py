@@ -0,0 +1,106 @@
+"""Request capture and replay"""
+
+import asyncio
+import os
+import pytest
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from benchmarks.replay import main as replay_main, replay
+from src.solver.cache import ResultCache
+from src.solver.capture import Capture, RequestCapture
+from src.solver.hints import SolutionHintStore
+from src.solver.models import SBCRequirementSet
+from src.solver.or_tools_solver import SBCSolver
+from src.solver.service import SolveService
+from tests.helpers import RecordingExecutor, make_player, make_request
+
+
+def _solved_capture(directory, seconds=1.0):
+    """Capture of a real solve, with the model exported by the solver"""
+    capture = RequestCapture(str(directory), sample_rate=1.0)
+    capture_id = capture.sample()
+    request = make_request(CORPUS["daily_gold_rating"], generate_club(300, seed=5))
+    solver = SBCSolver(num_search_workers=4, model_path=capture.model_path(capture_id))
+    response = solver.solve(request)
+    return capture, capture.write(capture_id, request, response, seconds), request, response
+
+
+def test_capture_round_trip(tmp_path):
+    capture, path, request, response = _solved_capture(tmp_path)
+
+    captured = Capture(path)
+
+    assert captured.request == request
+    assert captured.outcome["status"] == response.status
+    assert captured.outcome["selected_player_ids"] == response.selected_player_ids
+    assert captured.outcome["latency"] == 1.0
+    assert captured.outcome["stats"]["num_variables"] == response.stats.num_variables
+    assert captured.model_proto
+    # Only the capture file is left behind
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    assert capture.stats()["captured"] == 1
+
+
+def test_fast_solves_are_not_kept(tmp_path):
+    capture = RequestCapture(str(tmp_path), sample_rate=1.0, min_seconds=5.0)
+    capture_id = capture.sample()
+    open(capture.model_path(capture_id), "wb").close()
+    request = make_request(SBCRequirementSet(squad_size=1), [make_player(1)])
+    response = SBCSolver(num_search_workers=1).solve(request)
+
+    assert capture.write(capture_id, request, response, seconds=0.1) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_sampling_can_be_disabled(tmp_path):
+    assert RequestCapture(str(tmp_path), sample_rate=0.0).sample() is None
+
+
+def test_replay_matches_the_capture(tmp_path):
+    _, path, _, response = _solved_capture(tmp_path)
+
+    result = replay(path, workers=2)
+
+    assert result["captured_status"] == result["status"] == response.status
+    assert result["objective"] == result["captured_objective"]
+    assert result["captured_latency"] is not None
+    assert replay_main([str(tmp_path), "--jobs", "1", "--workers", "2"]) == 0
+
+
+def _capturing_service(directory, executor):
+    capture = RequestCapture(str(directory), sample_rate=1.0)
+    return SolveService(executor, ResultCache(0, 60), SolutionHintStore(8), capture)
+
+
+def test_service_captures_the_request_sent_to_the_worker(tmp_path):
+    players = [make_player(i) for i in range(1, 7)]
+    service = _capturing_service(tmp_path, RecordingExecutor(selected_ids=[3, 4]))
+    requirements = SBCRequirementSet(squad_size=2)
+
+    async def main():
+        await service.solve(make_request(requirements, players))
+        await service.solve(make_request(requirements, players, hint_player_ids=[1]))
+        await asyncio.gather(*service._capture_writes)
+
+    asyncio.run(main())
+
+    captures = [Capture(os.path.join(tmp_path, name)) for name in sorted(os.listdir(tmp_path))]
+    hints = sorted(c.request.hint_player_ids or [] for c in captures)
+    assert hints == [[], [1, 3, 4]]
+
+
+def test_failed_solve_leaves_no_model_file(tmp_path):
+    class FailingExecutor(RecordingExecutor):
+        async def solve(
+            self, request, on_progress=None, on_start=None, deadline=None, model_path=None
+        ):
+            open(model_path, "wb").close()
+            raise RuntimeError("worker died")
+
+    players = [make_player(i) for i in range(1, 4)]
+    service = _capturing_service(tmp_path, FailingExecutor())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.solve(make_request(SBCRequirementSet(squad_size=2), players)))
+
+    assert os.listdir(tmp_path) == []
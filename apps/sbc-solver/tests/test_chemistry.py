@@ -0,0 +1,89 @@
+"""Chemistry encoding with shared group counts"""
+
+from collections import Counter
+from typing import List
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+from benchmarks.generator import generate_club
+from src.solver.constraint_builder import CHEMISTRY_BUCKETS, SBCConstraintBuilder, _bucket_tier
+from src.solver.models import ChemistryConstraint
+from src.solver.player_table import PlayerTable
+
+
+def _reference_chemistry(table: PlayerTable, selected: List[int]) -> int:
+    """Squad chemistry counted player by player"""
+    counts = {
+        column: Counter(getattr(table, column)[selected].tolist())
+        for column in ("club", "league", "country")
+    }
+    total = 0
+    for i in selected:
+        chemistry = sum(
+            _bucket_tier(
+                CHEMISTRY_BUCKETS[bucket], counts[column][int(getattr(table, column)[i])] - 1
+            )
+            for column, bucket in (("club", "club"), ("league", "league"), ("country", "nation"))
+        )
+        total += min(chemistry, 3)
+    return total
+
+
+def _feasible(table: PlayerTable, selected: List[int], constraint: ChemistryConstraint) -> bool:
+    """Whether the fixed selection meets the chemistry constraint in the model"""
+    model = cp_model.CpModel()
+    builder = SBCConstraintBuilder(model)
+    player_vars = builder.create_player_variables(len(table))
+    chosen = set(selected)
+    for i, var in enumerate(player_vars):
+        model.Add(var == (1 if i in chosen else 0))
+    builder.add_chemistry_constraint(player_vars, table, constraint, len(selected))
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 1
+    return solver.Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+@pytest.mark.parametrize(
+    "bucket, teammates, tier",
+    [
+        ("club", 0, 0),
+        ("club", 1, 0),
+        ("club", 2, 1),
+        ("club", 4, 2),
+        ("club", 7, 3),
+        ("league", 2, 0),
+        ("league", 3, 1),
+        ("league", 8, 3),
+        ("nation", 1, 0),
+        ("nation", 2, 1),
+        ("nation", 5, 2),
+        ("nation", 10, 3),
+    ],
+)
+def test_bucket_tier_boundaries(bucket, teammates, tier):
+    assert _bucket_tier(CHEMISTRY_BUCKETS[bucket], teammates) == tier
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_model_chemistry_matches_player_by_player_count(seed):
+    # Small, skewed clubs so selections share clubs, leagues and nations
+    table = PlayerTable(generate_club(60, seed=seed, num_leagues=4, clubs_per_league=3))
+    rng = np.random.default_rng(seed)
+    selected = sorted(rng.choice(len(table), size=11, replace=False).tolist())
+    chemistry = _reference_chemistry(table, selected)
+
+    assert _feasible(table, selected, ChemistryConstraint(type="exact", value=chemistry))
+    assert not _feasible(table, selected, ChemistryConstraint(type="min", value=chemistry + 1))
+    if chemistry > 0:
+        assert not _feasible(table, selected, ChemistryConstraint(type="max", value=chemistry - 1))
+
+
+def test_chemistry_is_capped_at_three_per_player():
+    # Eleven players sharing club, league and nation: 3 each, not 9
+    table = PlayerTable(
+        generate_club(11, seed=0, num_leagues=1, clubs_per_league=1, num_countries=1)
+    )
+    selected = list(range(11))
+
+    assert _reference_chemistry(table, selected) == 33
+    assert _feasible(table, selected, ChemistryConstraint(type="exact", value=33))
@@ -0,0 +1,138 @@
+"""Shared deadline scheduler"""
+
+import gc
+import threading
+import time
+import weakref
+from src.solver.deadlines import DeadlineScheduler
+from src.solver.or_tools_solver import SBCSolver
+from tests.helpers import slow_request
+
+
+def _recorder():
+    fired = []
+    done = threading.Event()
+
+    def record(name, last=False):
+        def callback():
+            fired.append((name, time.monotonic()))
+            if last:
+                done.set()
+
+        return callback
+
+    return fired, done, record
+
+
+def test_timers_fire_in_deadline_order():
+    scheduler = DeadlineScheduler()
+    fired, done, record = _recorder()
+    now = time.monotonic()
+
+    scheduler.call_at(now + 0.3, record("c", last=True))
+    scheduler.call_at(now + 0.1, record("a"))
+    scheduler.call_at(now + 0.2, record("b"))
+
+    assert done.wait(2)
+    assert [name for name, _ in fired] == ["a", "b", "c"]
+
+
+def test_earlier_timer_wakes_a_sleeping_scheduler():
+    scheduler = DeadlineScheduler()
+    fired, done, record = _recorder()
+
+    scheduler.call_later(5.0, record("late"))
+    time.sleep(0.05)  # scheduler thread now sleeps until the late timer
+    start = time.monotonic()
+    scheduler.call_later(0.1, record("early", last=True))
+
+    assert done.wait(2)
+    assert fired[0][0] == "early"
+    assert fired[0][1] - start < 0.5
+
+
+def test_cancelled_timers_do_not_fire():
+    scheduler = DeadlineScheduler()
+    fired, done, record = _recorder()
+
+    scheduler.call_later(0.05, record("cancelled")).cancel()
+    scheduler.call_later(0.1, record("kept", last=True))
+
+    assert done.wait(2)
+    time.sleep(0.1)
+    assert [name for name, _ in fired] == ["kept"]
+    assert scheduler.pending() == 0
+
+
+def test_cancel_releases_the_callback():
+    class Solve:
+        def stop(self):
+            pass
+
+    scheduler = DeadlineScheduler()
+    solve = Solve()
+    ref = weakref.ref(solve)
+    timers = [scheduler.call_later(60, solve.stop) for _ in range(3)]
+    del solve
+
+    timers[0].cancel()
+    assert scheduler.pending() == 2
+    for timer in timers[1:]:
+        timer.cancel()
+    assert scheduler.pending() == 0
+
+    gc.collect()
+    assert ref() is None
+
+
+def test_interval_timers_repeat_until_cancelled():
+    scheduler = DeadlineScheduler()
+    fired, _, record = _recorder()
+
+    timer = scheduler.call_later(0.02, record("tick"), interval=0.02)
+    time.sleep(0.2)
+    timer.cancel()
+    count = len(fired)
+    time.sleep(0.1)
+
+    assert count >= 3
+    assert len(fired) == count
+
+
+def test_failing_callback_does_not_stop_the_scheduler():
+    scheduler = DeadlineScheduler()
+    fired, done, record = _recorder()
+
+    def fail():
+        raise RuntimeError("callback failed")
+
+    scheduler.call_later(0.01, fail)
+    scheduler.call_later(0.05, record("after", last=True))
+
+    assert done.wait(2)
+    assert [name for name, _ in fired] == ["after"]
+
+
+def test_search_stops_at_the_deadline():
+    request = slow_request()
+    start = time.monotonic()
+    solver = SBCSolver(num_search_workers=4, deadline=start + 1.0)
+
+    response = solver.solve(request)
+
+    assert time.monotonic() - start < 5
+    assert response.status in ("FEASIBLE", "TIMEOUT")
+
+
+def test_search_stops_when_cancelled():
+    request = slow_request()
+    cancel_event = threading.Event()
+    solver = SBCSolver(num_search_workers=4, cancel_event=cancel_event)
+    threading.Timer(1.0, cancel_event.set).start()
+
+    start = time.monotonic()
+    response = solver.solve(request)
+
+    assert time.monotonic() - start < 5
+    assert solver.cancelled
+    assert response.status in ("FEASIBLE", "CANCELLED")
@@ -0,0 +1,47 @@
+"""Gap and target-objective early termination"""
+
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from tests.helpers import solve
+
+# Needs a few improving solutions (and seconds) to prove its optimum
+MEDIUM_CASE = "chemistry_positions"
+
+
+def test_target_objective_stops_at_the_first_good_enough_squad():
+    response = solve(CORPUS[MEDIUM_CASE], generate_club(300, seed=5), target_objective=10**9)
+
+    assert response.status == "FEASIBLE"
+    assert response.stats.improvements == 1
+    assert "target objective reached" in response.message
+
+
+def test_unreachable_target_searches_to_optimality():
+    players = generate_club(300, seed=5)
+    plain = solve(CORPUS["daily_gold_rating"], players)
+
+    response = solve(CORPUS["daily_gold_rating"], players, target_objective=0)
+
+    assert response.status == plain.status == "OPTIMAL"
+    assert response.objective == plain.objective
+    assert response.objective_gap == 0
+    assert "stopped" not in response.message
+
+
+def test_relative_gap_stops_within_the_gap():
+    response = solve(CORPUS[MEDIUM_CASE], generate_club(300, seed=5), relative_gap=0.5)
+
+    assert response.success
+    assert response.objective_gap <= 0.5
+    # A stop short of the optimum is not reported as OPTIMAL
+    if response.status == "OPTIMAL":
+        assert response.objective_gap == 0
+    else:
+        assert "within the requested gap" in response.message
+
+
+def test_zero_gap_is_proven_optimal():
+    response = solve(CORPUS["league_nation"], generate_club(300, seed=5), relative_gap=0)
+
+    assert response.status == "OPTIMAL"
+    assert response.objective_gap == 0
@@ -0,0 +1,186 @@
+"""Worker pool plumbing"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import pytest
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from src.api import routes
+from src.solver.cache import ResultCache
+from src.solver.executor import (
+    DuplicateJobError,
+    SolverBusyError,
+    SolverExecutor,
+    _relay_progress,
+)
+from src.solver.hints import SolutionHintStore
+from src.solver.scheduler import CoreScheduler
+from src.solver.service import SolveService
+from tests.helpers import make_request, slow_request
+
+
+def _with_executor(test, max_workers=1, max_queue=0):
+    """Run test(executor) on a started executor, stopping its workers afterwards"""
+
+    async def main():
+        executor = SolverExecutor(max_workers, max_queue, CoreScheduler(core_budget=2))
+        await executor.start()
+        try:
+            return await test(executor)
+        finally:
+            executor.shutdown()
+
+    return asyncio.run(main())
+
+
+async def _start_slow_solve(executor, job_id, **fields):
+    """Submit a search that runs until cancelled; returns once it holds a worker"""
+    started = asyncio.Event()
+    task = asyncio.create_task(
+        executor.solve(slow_request(job_id=job_id, **fields), on_start=started.set)
+    )
+    await asyncio.wait_for(started.wait(), 5)
+    return task
+
+
+def test_progress_relay_uses_its_own_threads():
+    progress_queue = queue.Queue()
+    received = []
+    threads = set()
+
+    def on_progress(event):
+        received.append(event)
+
+    def get():
+        # Record the thread each blocking read runs on
+        threads.add(threading.current_thread().name)
+        return progress_queue.get()
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="relay-test") as pool:
+            relay = asyncio.create_task(
+                _relay_progress(SimpleNamespace(get=get), on_progress, pool)
+            )
+            for event in ("first", "second", None):
+                progress_queue.put(event)
+            await asyncio.wait_for(relay, 2)
+
+    asyncio.run(main())
+
+    assert received == ["first", "second"]
+    assert threads == {"relay-test_0"}
+
+
+def test_solves_run_off_the_event_loop():
+    request = make_request(CORPUS["daily_gold_rating"], generate_club(300, seed=5))
+
+    async def test(executor):
+        ticks = 0
+        solve = asyncio.create_task(executor.solve(slow_request(max_solve_time=2)))
+        while not solve.done():
+            await asyncio.sleep(0.05)
+            ticks += 1
+        return ticks, solve.result(), await executor.solve(request)
+
+    ticks, slow, fast = _with_executor(test)
+
+    # The loop kept running while a worker searched for about 2 seconds
+    assert ticks >= 20
+    assert slow.status in ("FEASIBLE", "TIMEOUT")
+    assert fast.success
+
+
+def test_full_queue_rejects_solves():
+    async def test(executor):
+        running = await _start_slow_solve(executor, "running")
+        try:
+            with pytest.raises(SolverBusyError):
+                await executor.solve(slow_request(job_id="rejected"))
+            assert executor.stats()["active"] == 1
+        finally:
+            executor.cancel("running")
+            await running
+
+    _with_executor(test)
+
+
+def test_job_ids_in_progress_are_rejected():
+    async def test(executor):
+        running = await _start_slow_solve(executor, "job")
+        try:
+            with pytest.raises(DuplicateJobError):
+                await executor.solve(slow_request(job_id="job"))
+        finally:
+            executor.cancel("job")
+            await running
+
+    _with_executor(test, max_queue=1)
+
+
+def test_cancelled_queued_solve_returns_cancelled():
+    async def test(executor):
+        running = await _start_slow_solve(executor, "running")
+        queued = asyncio.create_task(executor.solve(slow_request(job_id="queued")))
+        await asyncio.sleep(0.1)
+        assert executor.stats()["queued"] == 1
+
+        assert executor.cancel("queued")
+        response = await asyncio.wait_for(queued, 1)
+        executor.cancel("running")
+        await running
+        return response
+
+    response = _with_executor(test, max_queue=1)
+
+    assert response.status == "CANCELLED"
+    assert response.job_id == "queued"
+
+
+def test_cancelled_running_solve_stops_its_search():
+    async def test(executor):
+        running = await _start_slow_solve(executor, "running")
+        await asyncio.sleep(0.5)
+        start = time.monotonic()
+        assert executor.cancel("running")
+        response = await running
+        return response, time.monotonic() - start
+
+    response, stop_time = _with_executor(test)
+
+    assert stop_time < 2
+    assert response.status in ("FEASIBLE", "CANCELLED")
+    assert response.success == (response.status == "FEASIBLE")
+
+
+def test_cancelling_an_unknown_job_does_nothing():
+    async def test(executor):
+        return executor.cancel("unknown")
+
+    assert not _with_executor(test)
+
+
+def test_client_disconnect_cancels_the_solve(monkeypatch):
+    async def test(executor):
+        service = SolveService(executor, ResultCache(0, 60), SolutionHintStore(0))
+        monkeypatch.setattr(routes, "solve_service", service)
+        disconnect_at = time.monotonic() + 0.5
+
+        async def is_disconnected():
+            return time.monotonic() >= disconnect_at
+
+        request = slow_request(job_id="disconnected")
+        response = await routes._cancel_on_disconnect(
+            SimpleNamespace(is_disconnected=is_disconnected),
+            request.job_id,
+            service.solve(request),
+        )
+        return response, time.monotonic() - disconnect_at
+
+    response, stop_time = _with_executor(test)
+
+    assert stop_time < 2
+    assert response.status in ("FEASIBLE", "CANCELLED")
@@ -0,0 +1,99 @@
+"""Conflicting requirement sets of infeasible requests"""
+
+import threading
+import time
+from benchmarks.generator import generate_club
+from src.solver.models import (
+    ClubConstraint,
+    DiversityConstraint,
+    QualityConstraint,
+    RatingConstraint,
+    SBCRequirementSet,
+)
+from src.solver.or_tools_solver import SBCSolver
+from src.solver.player_table import PlayerTable
+from src.solver.presolve import reduce_pool
+from tests.helpers import make_player, make_request, solve
+
+# Slots whose capacity prunes the pool, with a club count only they block
+POSITIONS = [1, 2, 3, 3, 4, 6, 6, 5, 10, 12, 11]
+
+
+def _requirements(**fields) -> SBCRequirementSet:
+    fields.setdefault("required_positions", POSITIONS)
+    fields.setdefault("clubs", [ClubConstraint(type="min", count=2)])
+    return SBCRequirementSet(squad_size=11, **fields)
+
+
+def test_explanation_names_positions_when_pool_is_reduced():
+    players = generate_club(300, seed=0)
+
+    for reduce in (True, False):
+        response = solve(_requirements(), players, reduce_pool=reduce)
+        assert response.status == "INFEASIBLE"
+        assert response.conflicting_requirements == ["required_positions", "clubs[0]"]
+
+
+def test_explanation_members_are_jointly_needed():
+    players = generate_club(300, seed=0)
+
+    assert solve(_requirements(required_positions=None), players).success
+    assert solve(_requirements(clubs=None), players).success
+
+
+def test_service_reduction_keeps_cards_beyond_slot_capacity():
+    # The service reduces pools before they reach a worker
+    players = generate_club(300, seed=0)
+    table = PlayerTable(players)
+    kept = reduce_pool(table, _requirements(), slot_capacity=False).kept
+    reduced = [players[i] for i in kept.tolist()]
+
+    response = solve(_requirements(), reduced)
+    assert response.conflicting_requirements == ["required_positions", "clubs[0]"]
+
+
+def test_deletion_filter_drops_requirements_outside_the_conflict():
+    # All-bronze squads rate 60, gold ones 85: bronze count and rating clash
+    players = [make_player(i, ovr=60, quality=1, club=i % 4) for i in range(1, 16)]
+    players += [make_player(i, ovr=85, quality=3, club=i % 4) for i in range(16, 31)]
+    requirements = SBCRequirementSet(
+        squad_size=11,
+        quality=[
+            QualityConstraint(type="max", count=11, quality="gold"),
+            QualityConstraint(type="min", count=8, quality="bronze"),
+        ],
+        team_rating=RatingConstraint(type="min", value=80),
+        diversity=[DiversityConstraint(type="min", count=2, attribute="clubs")],
+        clubs=[ClubConstraint(type="max", count=5)],
+    )
+
+    response = SBCSolver(num_search_workers=4).solve(
+        make_request(requirements, players, quality_map=None)
+    )
+
+    assert response.status == "INFEASIBLE"
+    assert sorted(response.conflicting_requirements) == ["quality[1]", "team_rating"]
+
+
+def _explain(solver: SBCSolver, time_left: float = 10.0):
+    players = generate_club(300, seed=0)
+    request = make_request(_requirements(), players)
+    return solver._explain_infeasibility(request, PlayerTable(players), time_left)
+
+
+def test_explanation_stops_without_time_left():
+    assert _explain(SBCSolver(num_search_workers=4), time_left=0.0) is None
+
+
+def test_explanation_stops_at_request_deadline():
+    solver = SBCSolver(num_search_workers=4, deadline=time.monotonic() - 1)
+    assert _explain(solver) is None
+
+
+def test_explanation_stops_when_cancelled():
+    cancel_event = threading.Event()
+    cancel_event.set()
+    solver = SBCSolver(num_search_workers=4, cancel_event=cancel_event)
+
+    assert _explain(solver) is None
+    assert solver.cancelled
@@ -0,0 +1,154 @@
+"""Combinatorial pre-feasibility check"""
+
+import pytest
+from ortools.sat.python import cp_model
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import QUALITY_IDS, generate_club
+from src.solver.constraint_builder import SBCConstraintBuilder
+from src.solver.feasibility import check_requirements
+from src.solver.models import (
+    ChemistryConstraint,
+    ClubConstraint,
+    DiversityConstraint,
+    LeagueConstraint,
+    QualityConstraint,
+    RatingConstraint,
+    SBCRequirementSet,
+)
+from src.solver.or_tools_solver import SBCSolver
+from src.solver.player_table import PlayerTable
+from tests.helpers import make_player
+
+
+def _violations(players, **fields):
+    """Violations by requirement path; any violation must be a real infeasibility"""
+    fields.setdefault("squad_size", 3)
+    table = PlayerTable(players)
+    requirements = SBCRequirementSet(**fields)
+    violations = {
+        v.requirement: (v.required, v.available)
+        for v in check_requirements(table, requirements)
+    }
+    if violations:
+        assert not _model_feasible(table, requirements)
+    return violations
+
+
+def _model_feasible(
+    table: PlayerTable, requirements: SBCRequirementSet, quality_map=None
+) -> bool:
+    """Whether the full model has a solution (no precheck involved)"""
+    model = cp_model.CpModel()
+    builder = SBCConstraintBuilder(model)
+    player_vars = builder.create_player_variables(len(table))
+    SBCSolver()._add_requirements(builder, player_vars, table, requirements, quality_map)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 4
+    solver.parameters.max_time_in_seconds = 20
+    status = solver.Solve(model)
+    assert status != cp_model.UNKNOWN
+    return status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+def test_squad_size_counts_distinct_players():
+    # Four cards, but only two players
+    players = [make_player(i, player_id=1 + i % 2) for i in range(1, 5)]
+    assert _violations(players) == {"squad_size": (3, 2)}
+
+
+def test_required_positions_per_position():
+    players = [make_player(i, positions=[3]) for i in range(1, 4)]
+    violations = _violations(players, required_positions=[1, 3, 3])
+    assert violations == {"required_positions(position_id=1)": (1, 0)}
+
+
+def test_required_positions_slot_matching():
+    # One LB/RB card cannot fill both full-back slots
+    players = [make_player(1, positions=[2, 4]), make_player(2, positions=[3])]
+    players += [make_player(3, positions=[4])]
+    assert _violations(players, required_positions=[2, 4, 3]) == {}
+
+    players[2] = make_player(3, positions=[3])
+    violations = _violations(players, required_positions=[2, 4, 3])
+    assert violations == {"required_positions": (3, 2)}
+
+
+def test_club_ids_min_and_max():
+    players = [make_player(i, club=1 if i <= 2 else 2) for i in range(1, 6)]
+
+    assert _violations(players, clubs=[ClubConstraint(type="min", count=3, club_ids=[1])]) == {
+        "clubs[0]": (3, 2)
+    }
+    # At most 0 from club 2 leaves only two players for three slots
+    assert _violations(players, clubs=[ClubConstraint(type="max", count=0, club_ids=[2])]) == {
+        "clubs[0]": (3, 2)
+    }
+
+
+def test_max_per_club_cap():
+    players = [make_player(i, club=1 if i <= 4 else 2) for i in range(1, 6)]
+    violations = _violations(players, clubs=[ClubConstraint(type="max", count=1)])
+    assert violations == {"clubs[0]": (3, 2)}
+
+
+def test_same_league_needs_a_large_enough_league():
+    players = [make_player(i, league=1 + i % 2) for i in range(1, 5)]
+
+    violations = _violations(players, leagues=[LeagueConstraint(type="min", count=3)])
+    assert violations == {"leagues[0]": (3, 2)}
+    violations = _violations(players, leagues=[LeagueConstraint(type="exact", count=2)])
+    assert violations == {"leagues[0]": (2, 3)}
+
+
+def test_quality_count():
+    players = [make_player(i, quality=3 if i == 1 else 2) for i in range(1, 5)]
+    requirements = [QualityConstraint(type="min", count=2, quality="gold")]
+
+    assert _violations(players, quality=requirements) == {"quality[0]": (2, 1)}
+
+
+def test_team_rating_bounds():
+    players = [make_player(i, ovr=70 + i) for i in range(1, 5)]
+
+    # Best squad: 74 + 73 + 72 = 219
+    assert _violations(players, team_rating=RatingConstraint(type="min", value=73)) == {}
+    assert _violations(players, team_rating=RatingConstraint(type="min", value=74)) == {
+        "team_rating": (222, 219)
+    }
+    # Worst squad: 71 + 72 + 73 = 216
+    assert _violations(players, team_rating=RatingConstraint(type="max", value=71)) == {
+        "team_rating": (213, 216)
+    }
+
+
+def test_team_rating_uses_one_card_per_player():
+    # Player 1's two cards cannot both count towards the best squad
+    players = [make_player(1, player_id=1, ovr=90), make_player(2, player_id=1, ovr=90)]
+    players += [make_player(i, ovr=60) for i in range(3, 5)]
+    assert _violations(players, team_rating=RatingConstraint(type="min", value=80)) == {
+        "team_rating": (240, 210)
+    }
+
+
+def test_chemistry_above_maximum():
+    players = [make_player(i) for i in range(1, 5)]
+    violations = _violations(players, chemistry=ChemistryConstraint(type="min", value=10))
+    assert violations == {"chemistry": (10, 9)}
+
+
+def test_diversity_min_and_max():
+    players = [make_player(i, club=1 if i <= 2 else i) for i in range(1, 5)]
+
+    diversity = [DiversityConstraint(type="min", count=4, attribute="clubs")]
+    assert _violations(players, diversity=diversity) == {"diversity[0]": (4, 3)}
+
+    players = [make_player(i, club=i) for i in range(1, 5)]
+    diversity = [DiversityConstraint(type="max", count=2, attribute="clubs")]
+    assert _violations(players, diversity=diversity) == {"diversity[0]": (3, 2)}
+
+
+@pytest.mark.parametrize("case", sorted(CORPUS))
+def test_no_violations_for_feasible_corpus_requests(case):
+    table = PlayerTable(generate_club(120, seed=0))
+    if check_requirements(table, CORPUS[case], QUALITY_IDS):
+        assert not _model_feasible(table, CORPUS[case], QUALITY_IDS)
@@ -0,0 +1,82 @@
+"""Warm starts from remembered solutions"""
+
+import asyncio
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from src.solver.cache import ResultCache
+from src.solver.hints import SolutionHintStore
+from src.solver.models import SBCRequirementSet
+from src.solver.or_tools_solver import SBCSolver
+from src.solver.service import SolveService
+from tests.helpers import RecordingExecutor, make_player, make_request
+
+
+def test_hint_store_keeps_the_latest_selections():
+    hints = SolutionHintStore(max_entries=2)
+    hints.remember("a", [1, 2])
+    hints.remember("b", [3])
+    hints.lookup("a")
+    hints.remember("c", [4])
+    hints.remember("d", [])
+
+    assert hints.lookup("a") == [1, 2]
+    assert hints.lookup("b") == []
+    assert hints.lookup("c") == [4]
+    assert hints.lookup("d") == []
+    assert hints.stats() == {"size": 2, "max_entries": 2, "hits": 3, "misses": 2}
+
+
+def test_disabled_hint_store_remembers_nothing():
+    hints = SolutionHintStore(max_entries=0)
+    hints.remember("a", [1])
+
+    assert hints.lookup("a") == []
+
+
+def test_service_adds_remembered_hints_to_the_client_hints():
+    players = [make_player(i) for i in range(1, 7)]
+    executor = RecordingExecutor(selected_ids=[3, 4, 5])
+    service = SolveService(executor, ResultCache(0, 60), SolutionHintStore(8))
+    requirements = SBCRequirementSet(squad_size=3)
+
+    async def main():
+        await service.solve(make_request(requirements, players, hint_player_ids=[1, 2]))
+        await service.solve(make_request(requirements, players, hint_player_ids=[1, 3]))
+        await service.solve(make_request(SBCRequirementSet(squad_size=2), players))
+
+    asyncio.run(main())
+
+    first, second, other = (request.hint_player_ids for request in executor.requests)
+    assert first == [1, 2]
+    assert second == [1, 3, 4, 5]
+    # Hints are remembered per requirement set
+    assert other is None
+
+
+def test_valid_hint_is_kept_as_a_fallback_solution():
+    requirements = CORPUS["daily_gold_rating"]
+    players = generate_club(300, seed=5)
+    best = SBCSolver(num_search_workers=4).solve(make_request(requirements, players))
+
+    messages = []
+    hinted = SBCSolver(log_callback=messages.append, num_search_workers=4).solve(
+        make_request(requirements, players, hint_player_ids=best.selected_player_ids)
+    )
+
+    assert any("kept as fallback solution" in message for message in messages)
+    assert hinted.objective == best.objective
+
+
+def test_invalid_hint_is_repaired_by_the_search():
+    requirements = CORPUS["daily_gold_rating"]
+    players = generate_club(300, seed=5)
+    best = SBCSolver(num_search_workers=4).solve(make_request(requirements, players))
+
+    messages = []
+    hinted = SBCSolver(log_callback=messages.append, num_search_workers=4).solve(
+        make_request(requirements, players, hint_player_ids=best.selected_player_ids[:3])
+    )
+
+    assert any("Added solution hint with 3 of 3" in message for message in messages)
+    assert not any("kept as fallback solution" in message for message in messages)
+    assert hinted.objective == best.objective
@@ -0,0 +1,104 @@
+"""Per-stage timings and model statistics"""
+
+import asyncio
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from src.solver.cache import ResultCache
+from src.solver.hints import SolutionHintStore
+from src.solver.instrumentation import PresolveClock, StageTimer, StatsAggregator
+from src.solver.models import SBCRequirementSet, SolveStats
+from src.solver.service import SolveService
+from tests.helpers import RecordingExecutor, make_player, make_request, solve
+
+WORKER_STAGES = {
+    "table",
+    "feasibility",
+    "presolve",
+    "model_build",
+    "cpsat_presolve",
+    "search",
+    "response",
+}
+
+
+def test_solver_reports_stages_and_model_size():
+    response = solve(CORPUS["league_nation"], generate_club(300, seed=5))
+
+    stats = response.stats
+    assert response.success
+    assert set(stats.timings) == WORKER_STAGES
+    assert all(seconds >= 0 for seconds in stats.timings.values())
+    assert set(stats.requirement_times) == {
+        "required_positions",
+        "leagues[0]",
+        "countries[0]",
+        "team_rating",
+    }
+    assert stats.pool_size == 300
+    assert stats.pool_size >= stats.collapsed_pool_size >= stats.reduced_pool_size > 0
+    assert stats.num_variables >= stats.reduced_pool_size
+    assert stats.num_constraints > 0 and stats.num_linear_terms > 0
+    assert stats.first_solution_time is not None
+    assert stats.improvements >= 1
+
+
+class _StatsExecutor(RecordingExecutor):
+    """Answers with the stats a worker would attach"""
+
+    async def solve(self, request, *args, **kwargs):
+        response = await super().solve(request, *args, **kwargs)
+        response.stats = SolveStats(timings={"search": 0.0}, reduced_pool_size=4)
+        return response
+
+
+def test_service_adds_api_stages_and_aggregates():
+    players = [make_player(i) for i in range(1, 5)]
+    service = SolveService(_StatsExecutor([1, 2]), ResultCache(0, 60), SolutionHintStore(0))
+    requirements = SBCRequirementSet(squad_size=2)
+
+    async def main():
+        with_stats = await service.solve(make_request(requirements, players, include_stats=True))
+        without = await service.solve(make_request(requirements, players))
+        return with_stats, without
+
+    with_stats, without = asyncio.run(main())
+
+    assert set(with_stats.stats.timings) == {"prepare", "queue_wait", "transfer", "search"}
+    assert with_stats.stats.pool_size == 4
+    assert without.stats is None
+    summary = service.stats()["solves"]
+    assert summary["solves"] == 2
+    assert summary["stages"]["search"]["count"] == 2
+    assert summary["avg_model"]["reduced_pool_size"] == 4
+
+
+def test_stage_timer_adds_up_repeated_stages():
+    timer = StageTimer()
+    timer.add("search", 0.5)
+    with timer.stage("search"):
+        pass
+    timer.add("response", 0.25)
+
+    assert set(timer.timings) == {"search", "response"}
+    assert timer.timings["search"] >= 0.5
+
+
+def test_presolve_clock_reads_the_search_start():
+    clock = PresolveClock()
+    for line in ("Starting presolve at 0.00s", "Starting search at 0.19s", "Starting search at 9s"):
+        clock(line)
+
+    assert clock.presolve_time == 0.19
+
+
+def test_stats_aggregator_summary():
+    aggregator = StatsAggregator()
+    aggregator.record(SolveStats(timings={"search": 1.0}, num_variables=10))
+    aggregator.record(SolveStats(timings={"search": 3.0, "explain": 0.5}, num_variables=30))
+
+    summary = aggregator.summary()
+
+    assert summary["solves"] == 2
+    assert summary["stages"]["search"] == {"count": 2, "avg": 2.0, "max": 3.0}
+    assert summary["stages"]["explain"]["count"] == 1
+    assert summary["avg_model"]["num_variables"] == 20
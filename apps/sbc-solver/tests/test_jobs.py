@@ -0,0 +1,140 @@
+"""Asynchronous solve jobs and priority dispatch"""
+
+import asyncio
+import pytest
+from src.solver.cache import ResultCache
+from src.solver.executor import SolverBusyError, _PrioritySlots
+from src.solver.hints import SolutionHintStore
+from src.solver.jobs import SolveJobConflictError, SolveJobManager, SolveJobNotFoundError
+from src.solver.models import SBCRequirementSet
+from src.solver.service import SolveService
+from tests.helpers import RecordingExecutor, make_player, make_request
+
+
+def _manager(executor, max_jobs=10, retention_seconds=60):
+    service = SolveService(executor, ResultCache(0, 60), SolutionHintStore(0))
+    return SolveJobManager(service, max_jobs=max_jobs, retention_seconds=retention_seconds)
+
+
+def _request(job_id, **fields):
+    players = [make_player(i) for i in range(1, 5)]
+    return make_request(SBCRequirementSet(squad_size=2), players, job_id=job_id, **fields)
+
+
+def test_job_lifecycle():
+    executor = RecordingExecutor(selected_ids=[1, 2])
+    executor.release.clear()
+    manager = _manager(executor)
+
+    async def main():
+        submitted = manager.submit(_request("job"))
+        with pytest.raises(SolveJobConflictError):
+            manager.submit(_request("job"))
+        await asyncio.sleep(0)
+        queued = manager.get("job").info()
+
+        executor.release.set()
+        await manager.get("job").task
+        return submitted, queued, manager.get("job")
+
+    submitted, queued, job = asyncio.run(main())
+
+    assert submitted.status == queued.status == "queued"
+    assert queued.queue_wait is None
+    assert job.status == "completed"
+    assert job.response.selected_player_ids == [1, 2]
+    info = job.info()
+    assert info.result_status == "OPTIMAL"
+    assert info.queue_wait >= 0 and info.run_time >= 0
+    assert manager.stats()["by_status"] == {"completed": 1}
+
+
+def test_failed_job_records_the_error():
+    class FailingExecutor(RecordingExecutor):
+        async def solve(self, request, *args, **kwargs):
+            raise RuntimeError("worker died")
+
+    manager = _manager(FailingExecutor())
+
+    async def main():
+        manager.submit(_request("job"))
+        await manager.get("job").task
+
+    asyncio.run(main())
+
+    job = manager.get("job")
+    assert job.status == "failed"
+    assert job.error == "worker died"
+
+
+def test_finished_jobs_expire():
+    manager = _manager(RecordingExecutor(), retention_seconds=0.05)
+
+    async def main():
+        manager.submit(_request("job"))
+        await manager.get("job").task
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+
+    with pytest.raises(SolveJobNotFoundError):
+        manager.get("job")
+
+
+def test_full_store_drops_finished_jobs_then_rejects():
+    executor = RecordingExecutor()
+    manager = _manager(executor, max_jobs=2)
+
+    async def main():
+        manager.submit(_request("finished"))
+        await manager.get("finished").task
+        executor.release.clear()
+        manager.submit(_request("first"))
+        manager.submit(_request("second"))
+        with pytest.raises(SolverBusyError):
+            manager.submit(_request("third"))
+        stored = manager.stats()["jobs"]
+        executor.release.set()
+        await asyncio.gather(manager.get("first").task, manager.get("second").task)
+        return stored
+
+    assert asyncio.run(main()) == 2
+    with pytest.raises(SolveJobNotFoundError):
+        manager.get("finished")
+
+
+def test_interactive_solves_leave_the_queue_first():
+    async def main():
+        slots = _PrioritySlots(1)
+        await slots.acquire(rank=1)
+        order = []
+
+        async def wait(name, rank):
+            await slots.acquire(rank)
+            order.append(name)
+            slots.release()
+
+        waiters = []
+        for name, rank in (("bulk 1", 1), ("interactive", 0), ("bulk 2", 1)):
+            waiters.append(asyncio.create_task(wait(name, rank)))
+            await asyncio.sleep(0)
+        slots.release()
+        await asyncio.gather(*waiters)
+        return order
+
+    assert asyncio.run(main()) == ["interactive", "bulk 1", "bulk 2"]
+
+
+def test_cancelled_waiter_passes_its_slot_on():
+    async def main():
+        slots = _PrioritySlots(1)
+        await slots.acquire(rank=0)
+        cancelled = asyncio.create_task(slots.acquire(rank=0))
+        waiting = asyncio.create_task(slots.acquire(rank=1))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        slots.release()
+        await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(main())
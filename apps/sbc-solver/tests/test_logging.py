@@ -0,0 +1,75 @@
+"""Queued, leveled solver logging"""
+
+import json
+import logging
+from src.solver.log_config import (
+    SOLVER_LOGGER,
+    JsonFormatter,
+    configure_logging,
+    shutdown_logging,
+)
+
+
+def _log_lines(capsys, monkeypatch, log, **env):
+    """stderr lines written while configured with the given environment"""
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    configure_logging()
+    try:
+        log(logging.getLogger(f"{SOLVER_LOGGER}.test"))
+    finally:
+        # Stopping the listener writes out everything still queued
+        shutdown_logging()
+    return capsys.readouterr().err.splitlines()
+
+
+def test_records_below_the_level_are_dropped(capsys, monkeypatch):
+    def log(logger):
+        logger.debug("Dropped %d", 1)
+        logger.info("Kept %d", 2)
+
+    lines = _log_lines(capsys, monkeypatch, log, SBC_SOLVER_LOG_LEVEL="info")
+
+    assert len(lines) == 1
+    assert lines[0].endswith("INFO [MainProcess] src.solver.test: Kept 2")
+
+
+def test_json_format(capsys, monkeypatch):
+    def log(logger):
+        logger.debug("Model has %d variables", 42)
+        try:
+            raise ValueError("bad pool")
+        except ValueError:
+            logger.exception("Solve failed")
+
+    lines = _log_lines(
+        capsys, monkeypatch, log, SBC_SOLVER_LOG_LEVEL="DEBUG", SBC_SOLVER_LOG_FORMAT="json"
+    )
+
+    first, second = (json.loads(line) for line in lines)
+    assert first["level"] == "DEBUG"
+    assert first["logger"] == "src.solver.test"
+    assert first["message"] == "Model has 42 variables"
+    assert "exception" not in first
+    assert second["level"] == "ERROR"
+    assert "ValueError: bad pool" in second["exception"]
+
+
+def test_shutdown_restores_propagation():
+    configure_logging()
+    logger = logging.getLogger(SOLVER_LOGGER)
+    assert not logger.propagate
+
+    shutdown_logging()
+
+    assert logger.propagate
+    assert not [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+
+def test_json_formatter_keeps_one_record_per_line():
+    record = logging.LogRecord("src.solver.x", logging.INFO, __file__, 1, "a\nb", None, None)
+
+    line = JsonFormatter().format(record)
+
+    assert "\n" not in line
+    assert json.loads(line)["message"] == "a\nb"
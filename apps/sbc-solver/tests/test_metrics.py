@@ -0,0 +1,105 @@
+"""Prometheus metrics exposition"""
+
+import re
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from src.main import app
+from src.solver.metrics import CONTENT_TYPE, Counter, Histogram, SolverMetrics
+from src.solver.models import SolveStats
+
+# Sample line: metric name, optional {label="value",...}, value
+SAMPLE_PATTERN = re.compile(
+    r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? '
+    r"(-?[0-9.e+-]+|\+Inf|-Inf|NaN)$"
+)
+
+
+def _assert_valid_exposition(text: str):
+    assert text.endswith("\n")
+    declared = set()
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert kind in ("counter", "gauge", "histogram")
+            declared.add(name)
+            continue
+        assert SAMPLE_PATTERN.match(line), line
+        name = re.match(r"[a-zA-Z0-9_:]+", line).group()
+        assert re.sub(r"_(bucket|sum|count)$", "", name) in declared or name in declared
+
+
+def test_counter_samples_per_label_set():
+    counter = Counter("requests_total", "Requests", ("handler", "status"))
+    counter.inc(handler="solve", status="200")
+    counter.inc(2, handler="solve", status="200")
+    counter.inc(handler="health", status="200")
+
+    assert counter.render() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{handler="health",status="200"} 1',
+        'requests_total{handler="solve",status="200"} 3',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", (1.0, 0.1))
+    for value in (0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 2.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("errors_total", "Errors", ("message",))
+    counter.inc(message='bad "pool"\n\\')
+
+    assert counter.render()[-1] == 'errors_total{message="bad \\"pool\\"\\n\\\\"} 1'
+
+
+def test_registry_renders_every_family():
+    metrics = SolverMetrics()
+    metrics.watch_executor(
+        SimpleNamespace(
+            stats=lambda: {"active": 1, "queued": 3, "workers": 2, "busy_seconds": 12.5}
+        )
+    )
+    metrics.observe_solve("single", "OPTIMAL", 0.3)
+    metrics.observe_stats(
+        SolveStats(timings={"model_build": 0.02}, first_solution_time=0.1, improvements=4)
+    )
+
+    text = metrics.render()
+
+    _assert_valid_exposition(text)
+    lines = text.splitlines()
+    assert "sbc_solver_worker_utilization 0.5" in lines
+    assert "# TYPE sbc_solver_worker_busy_seconds_total counter" in lines
+    assert 'sbc_solver_solve_duration_seconds_count{kind="single",status="OPTIMAL"} 1' in lines
+    assert "sbc_solver_solution_improvements_sum 4" in lines
+    assert "sbc_solver_model_build_seconds_count 1" in lines
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+    client.get("/api/v1/health")
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"] == CONTENT_TYPE
+    _assert_valid_exposition(response.text)
+    requests = [
+        line for line in response.text.splitlines()
+        if line.startswith("sbc_solver_http_requests_total{")
+    ]
+    assert any('handler="health_check",method="GET",status="200"' in line for line in requests)
+    assert any('handler="unmatched",method="GET",status="404"' in line for line in requests)
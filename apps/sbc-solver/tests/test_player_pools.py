@@ -0,0 +1,163 @@
+"""Server-side player pools and deltas"""
+
+import time
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from src.solver.models import PlayerPoolDelta, SBCRequirementSet
+from src.solver.player_pools import (
+    PlayerPoolNotFoundError,
+    PlayerPoolStore,
+    PlayerPoolVersionError,
+)
+from src.solver.player_table import ARRAY_COLUMNS, PlayerTable
+from tests.helpers import make_player, make_request
+
+
+def _assert_same_table(table: PlayerTable, players):
+    expected = PlayerTable(players)
+    assert [p.id for p in table.players] == [p.id for p in expected.players]
+    for name in ARRAY_COLUMNS:
+        assert np.array_equal(getattr(table, name), getattr(expected, name)), name
+
+
+def _store_with_pool(count=5):
+    store = PlayerPoolStore(max_pools=4, ttl_seconds=60)
+    info = store.create([make_player(i) for i in range(1, count + 1)])
+    return store, info.pool_id
+
+
+def test_delta_patches_the_cached_table():
+    store, pool_id = _store_with_pool()
+    pool = store.get(pool_id)
+    before = pool.table()
+
+    delta = PlayerPoolDelta(
+        remove=[2],
+        update=[make_player(4, ovr=85, club=7, positions=(5, 7))],
+        add=[make_player(9, quality=1), make_player(3, ovr=60)],
+    )
+    store.apply_delta(pool_id, delta)
+
+    _assert_same_table(pool.table(), list(pool.players.values()))
+    # The previous table is what in-flight solves hold, so it is not modified
+    _assert_same_table(before, [make_player(i) for i in range(1, 6)])
+
+
+def test_delta_on_a_pool_without_a_table_builds_it_later():
+    store, pool_id = _store_with_pool()
+    pool = store.get(pool_id)
+
+    store.apply_delta(pool_id, PlayerPoolDelta(remove=[1], add=[make_player(6)]))
+
+    assert pool._table is None
+    _assert_same_table(pool.table(), [make_player(i) for i in range(2, 7)])
+
+
+def test_removed_then_added_card_moves_to_the_end():
+    store, pool_id = _store_with_pool(3)
+    pool = store.get(pool_id)
+    pool.table()
+
+    store.apply_delta(
+        pool_id, PlayerPoolDelta(remove=[1], add=[make_player(1, ovr=90), make_player(4)])
+    )
+
+    assert [p.id for p in pool.table().players] == [2, 3, 1, 4]
+    _assert_same_table(pool.table(), list(pool.players.values()))
+
+
+def test_delta_reports_missing_ids():
+    store, pool_id = _store_with_pool(3)
+
+    info = store.apply_delta(
+        pool_id, PlayerPoolDelta(remove=[1, 8], update=[make_player(9)])
+    )
+
+    assert info.size == 2
+    assert sorted(info.missing_ids) == [8, 9]
+
+
+def test_delta_versions():
+    store, pool_id = _store_with_pool(3)
+
+    assert store.apply_delta(pool_id, PlayerPoolDelta(base_version=1, remove=[1])).version == 2
+    with pytest.raises(PlayerPoolVersionError):
+        store.apply_delta(pool_id, PlayerPoolDelta(base_version=1, remove=[2]))
+    # Rejected deltas change nothing
+    assert len(store.get(pool_id).players) == 2
+    assert store.apply_delta(pool_id, PlayerPoolDelta(remove=[2])).version == 3
+
+
+def test_create_get_and_delete():
+    store, pool_id = _store_with_pool(3)
+
+    pool = store.get(pool_id)
+    assert pool.info().version == 1
+    assert sorted(pool.players) == [1, 2, 3]
+
+    store.delete(pool_id)
+    with pytest.raises(PlayerPoolNotFoundError):
+        store.get(pool_id)
+    with pytest.raises(PlayerPoolNotFoundError):
+        store.delete(pool_id)
+
+
+def test_least_recently_used_pool_is_evicted():
+    store = PlayerPoolStore(max_pools=2, ttl_seconds=60)
+    first = store.create([make_player(1)]).pool_id
+    second = store.create([make_player(2)]).pool_id
+    store.get(first)
+
+    store.create([make_player(3)])
+
+    store.get(first)
+    with pytest.raises(PlayerPoolNotFoundError):
+        store.get(second)
+
+
+def test_idle_pools_expire():
+    store = PlayerPoolStore(max_pools=2, ttl_seconds=0.05)
+    pool_id = store.create([make_player(1)]).pool_id
+    time.sleep(0.1)
+
+    with pytest.raises(PlayerPoolNotFoundError):
+        store.get(pool_id)
+    assert store.stats()["pools"] == 0
+
+
+def test_pool_routes():
+    client = TestClient(app)
+    players = [make_player(i).model_dump(by_alias=True) for i in range(1, 4)]
+
+    created = client.post("/api/v1/pools", json={"players": players}).json()
+    pool_url = f"/api/v1/pools/{created['pool_id']}"
+    assert created["version"] == 1
+    assert created["size"] == 3
+
+    patched = client.patch(pool_url, json={"remove": [1, 7], "baseVersion": 1})
+    assert patched.json()["version"] == 2
+    assert patched.json()["missing_ids"] == [7]
+    assert client.patch(pool_url, json={"remove": [2], "baseVersion": 1}).status_code == 409
+    assert client.get(pool_url).json()["size"] == 2
+
+    assert client.delete(pool_url).status_code == 200
+    assert client.get(pool_url).status_code == 404
+    assert client.patch(pool_url, json={"remove": [2]}).status_code == 404
+
+
+def test_solve_rejects_bad_pool_references():
+    client = TestClient(app)
+    players = [make_player(i) for i in range(1, 4)]
+    pool_id = client.post(
+        "/api/v1/pools", json={"players": [p.model_dump(by_alias=True) for p in players]}
+    ).json()["pool_id"]
+    request = make_request(SBCRequirementSet(squad_size=2), players, pool_id=pool_id)
+
+    response = client.post("/api/v1/solve", json=request.model_dump(by_alias=True))
+
+    assert response.status_code == 400
+    unknown = request.model_copy(update={"available_players": [], "pool_id": "unknown"})
+    response = client.post("/api/v1/solve", json=unknown.model_dump(by_alias=True))
+    assert response.status_code == 404
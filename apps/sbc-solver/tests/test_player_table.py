@@ -0,0 +1,69 @@
+"""Columnar player table"""
+
+import numpy as np
+import pytest
+from src.solver.models import MAX_POSITION_ID
+from src.solver.player_table import ARRAY_COLUMNS, PlayerTable
+from tests.helpers import make_player
+
+
+def _players():
+    return [
+        make_player(1, player_id=10, ovr=80, club=5, league=2, positions=(3, 7), squad=True),
+        make_player(2, player_id=20, ovr=65, club=6, league=2, positions=(0,)),
+        make_player(3, player_id=10, ovr=82, club=5, league=3, positions=(MAX_POSITION_ID,)),
+    ]
+
+
+def test_columns_follow_player_order():
+    table = PlayerTable(_players())
+
+    assert len(table) == 3
+    assert table.id.tolist() == [1, 2, 3]
+    assert table.player_id.tolist() == [10, 20, 10]
+    assert table.ovr.tolist() == [80, 65, 82]
+    assert table.squad.tolist() == [True, False, False]
+    assert table.position_mask.tolist() == [(1 << 3) | (1 << 7), 1, 1 << MAX_POSITION_ID]
+
+
+def test_take_keeps_the_given_rows_in_order():
+    table = PlayerTable(_players())
+
+    subset = table.take(np.array([2, 0]))
+
+    assert [p.id for p in subset.players] == [3, 1]
+    for name in ARRAY_COLUMNS:
+        assert getattr(subset, name).tolist() == getattr(table, name)[[2, 0]].tolist()
+
+
+def test_group_indices():
+    table = PlayerTable(_players())
+
+    groups = table.group_indices("club")
+
+    assert {club: rows.tolist() for club, rows in groups.items()} == {5: [0, 2], 6: [1]}
+    assert table.group_indices("club") is groups
+    with pytest.raises(ValueError):
+        table.group_indices("positions")
+
+
+def test_filters():
+    table = PlayerTable(_players())
+
+    assert table.isin("league", [2, 9]).tolist() == [True, True, False]
+    assert table.has_position(7).tolist() == [True, False, False]
+    assert table.has_position(MAX_POSITION_ID).tolist() == [False, False, True]
+    assert not table.has_position(MAX_POSITION_ID + 1).any()
+
+
+def test_positions_outside_the_bitmask_are_rejected():
+    with pytest.raises(ValueError):
+        PlayerTable([make_player(1, positions=(MAX_POSITION_ID + 1,))])
+
+
+def test_empty_pool():
+    table = PlayerTable([])
+
+    assert len(table) == 0
+    assert table.group_indices("league") == {}
+    assert len(table.take(np.array([], dtype=np.int64))) == 0
@@ -0,0 +1,102 @@
+"""Slot matching for required positions"""
+
+import pytest
+from pydantic import ValidationError
+from benchmarks.corpus import CORPUS, FORMATION_442
+from benchmarks.generator import generate_club
+from src.solver.models import SBCRequirementSet
+from src.solver.player_table import PlayerTable
+from src.solver.positions import (
+    FREE_SLOT,
+    SlotLayout,
+    assign_slots,
+    class_capacity_limits,
+    max_slot_matching,
+)
+from src.solver.presolve import reduce_pool
+from tests.helpers import make_player, solve
+
+GK, LB, CB, RB = 1, 2, 3, 4
+
+
+def _mask(*positions: int) -> int:
+    return sum(1 << p for p in positions)
+
+
+@pytest.mark.parametrize("position_id", [-1, 63, 1000])
+def test_required_positions_outside_the_bitmask_are_rejected(position_id):
+    with pytest.raises(ValidationError):
+        SBCRequirementSet(squad_size=2, required_positions=[CB, position_id])
+
+
+def test_layout_adds_free_slots_up_to_squad_size():
+    layout = SlotLayout([GK, CB, CB], squad_size=5)
+
+    assert layout.slot_types == [GK, CB, CB, FREE_SLOT, FREE_SLOT]
+    assert layout.demand == {GK: 1, CB: 2, FREE_SLOT: 2}
+    assert layout.capacity(_mask(CB)) == 4
+    assert layout.capacity(_mask(GK, CB)) == 5
+    assert layout.capacity(0) == 2
+
+
+def test_matching_moves_earlier_slots_to_fill_later_ones():
+    # The LB/RB class is tried first for LB, but is the only class for RB
+    layout = SlotLayout([LB, RB])
+    assigned = max_slot_matching(layout, [_mask(LB, RB), _mask(LB)], [1, 1])
+    assert assigned == [1, 0]
+
+
+def test_matching_respects_class_capacity():
+    layout = SlotLayout([CB, CB, CB])
+
+    assert max_slot_matching(layout, [_mask(CB)], [2]) == [0, 0, None]
+    assigned = max_slot_matching(layout, [_mask(CB), _mask(CB, LB)], [2, 1])
+    assert sorted(assigned) == [0, 0, 1]
+
+
+def test_class_capacity_limits_per_card():
+    players = [
+        make_player(1, positions=[CB]),
+        make_player(2, positions=[CB, LB]),
+        make_player(3, positions=[GK]),
+        make_player(4, positions=[9]),
+    ]
+    layout = SlotLayout([LB, CB, CB])
+
+    # Card 4's position is not required, so it fills no slot
+    assert class_capacity_limits(PlayerTable(players), layout).tolist() == [2, 3, 0, 0]
+
+
+def test_assign_slots_lines_up_a_squad():
+    players = [make_player(1, positions=[LB, CB]), make_player(2, positions=[LB])]
+    table = PlayerTable(players)
+    layout = SlotLayout([CB, LB])
+
+    assert assign_slots(table, [0, 1], layout) == [(0, 0), (1, 1)]
+    assert assign_slots(table, [1], layout) is None
+
+
+def test_slot_capacity_drops_cards_without_a_slot():
+    # Goalkeepers fill no slot of an all-CB squad
+    players = [make_player(i, positions=[CB]) for i in range(1, 4)]
+    players += [make_player(i, positions=[GK]) for i in range(4, 7)]
+    requirements = SBCRequirementSet(squad_size=2, required_positions=[CB, CB])
+    table = PlayerTable(players)
+
+    kept = reduce_pool(table, requirements).kept
+    assert table.id[kept].tolist() == [1, 2]
+    kept = reduce_pool(table, requirements, slot_capacity=False).kept
+    assert table.id[kept].tolist() == [1, 2, 4, 5]
+
+
+def test_solved_squads_fill_every_slot_with_a_matching_player():
+    players = generate_club(300, seed=5)
+    positions = {p.id: set(p.positions) for p in players}
+
+    response = solve(CORPUS["league_nation"], players)
+
+    assert response.success
+    assert [a.slot for a in response.slot_assignments] == list(range(11))
+    for assignment in response.slot_assignments:
+        assert assignment.position_id == FORMATION_442[assignment.slot]
+        assert assignment.position_id in positions[assignment.player_id]
@@ -0,0 +1,110 @@
+"""Pool reduction before model building"""
+
+import pytest
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from src.solver.models import QualityConstraint, SBCRequirementSet
+from src.solver.objective import selection_cost
+from src.solver.player_table import PlayerTable
+from src.solver.presolve import collapse_duplicates, reduce_pool
+from tests.helpers import make_player, solve
+
+# Corpus cases that reach a proven result on a small pool in well under a second
+FAST_CASES = [
+    "daily_bronze_upgrade",
+    "daily_silver_upgrade",
+    "daily_gold_rating",
+    "league_nation",
+    "same_league_same_club",
+    "diversity_min",
+    "diversity_max_chemistry",
+]
+
+
+def _kept_ids(players, requirements, **kwargs):
+    table = PlayerTable(players)
+    return sorted(table.id[reduce_pool(table, requirements, **kwargs).kept].tolist())
+
+
+@pytest.mark.parametrize("case", FAST_CASES)
+def test_reduction_keeps_the_optimal_objective(case):
+    players = generate_club(300, seed=5)
+    table = PlayerTable(players)
+
+    reduced = solve(CORPUS[case], players, reduce_pool=True)
+    full = solve(CORPUS[case], players, reduce_pool=False)
+
+    assert reduced.status == full.status
+    assert reduced.status in ("OPTIMAL", "INFEASIBLE")
+    if full.success:
+        assert selection_cost(table, reduced.selected_player_ids) == selection_cost(
+            table, full.selected_player_ids
+        )
+
+
+def test_keeps_cheapest_cards_of_a_class():
+    players = [make_player(i, ovr=60 + i) for i in range(1, 11)]
+    requirements = SBCRequirementSet(squad_size=3)
+
+    assert _kept_ids(players, requirements) == [1, 2, 3]
+    assert _kept_ids(players, requirements, keep_per_class=5) == [1, 2, 3, 4, 5]
+    assert _kept_ids(players, requirements, headroom=2) == [1, 2, 3, 4, 5, 6]
+    assert _kept_ids(players, requirements, spare=1, headroom=2) == list(range(1, 9))
+
+
+def test_keeps_players_with_cards_in_several_classes():
+    # Player 100 has an expensive gold and silver card; the quality
+    # requirement puts them in different classes
+    players = [make_player(i, ovr=60, quality=3) for i in range(1, 6)]
+    players += [make_player(i, ovr=60, quality=2) for i in range(6, 11)]
+    players += [
+        make_player(11, player_id=100, ovr=90, quality=3),
+        make_player(12, player_id=100, ovr=90, quality=2),
+    ]
+    requirements = SBCRequirementSet(
+        squad_size=2, quality=[QualityConstraint(type="min", count=1, quality="gold")]
+    )
+
+    kept = _kept_ids(players, requirements)
+    assert {11, 12} <= set(kept)
+    assert len(kept) == 2 + 2 + 2
+
+
+
+def test_collapse_keeps_lowest_card_of_identical_duplicates():
+    players = [
+        make_player(5, player_id=1),
+        make_player(2, player_id=1),
+        make_player(9, player_id=1),
+        make_player(3, player_id=1, ovr=80),  # better card of the same player
+        make_player(4, player_id=2),  # same attributes, other player
+    ]
+    table = PlayerTable(players)
+
+    duplicates = collapse_duplicates(table)
+    assert sorted(table.id[duplicates.kept].tolist()) == [2, 3, 4]
+    assert duplicates.replacements == {5: 2, 9: 2}
+    assert duplicates.resolve([9, 5, 3]) == [2, 3]
+
+    duplicates = collapse_duplicates(table, copies=2)
+    assert sorted(table.id[duplicates.kept].tolist()) == [2, 3, 4, 5]
+    assert duplicates.replacements == {9: 2}
+
+
+def test_duplicate_copies_do_not_change_the_solution():
+    players = generate_club(200, seed=2)
+    copies = [
+        player.model_copy(update={"id": player.id + 10_000 * copy})
+        for player in players
+        for copy in (1, 2)
+    ]
+
+    original = solve(CORPUS["league_nation"], players)
+    duplicated = solve(CORPUS["league_nation"], players + copies)
+
+    table = PlayerTable(players)
+    assert duplicated.status == original.status == "OPTIMAL"
+    assert selection_cost(table, duplicated.selected_player_ids) == selection_cost(
+        table, original.selected_player_ids
+    )
+    assert duplicated.stats.reduced_pool_size == original.stats.reduced_pool_size
@@ -0,0 +1,48 @@
+"""Core budget shared between concurrent solves"""
+
+from src.solver.scheduler import CoreScheduler
+
+
+def test_lone_solve_takes_up_to_the_per_solve_cap():
+    assert CoreScheduler(core_budget=8, max_workers_per_solve=8).acquire("a") == 8
+    assert CoreScheduler(core_budget=16, max_workers_per_solve=8).acquire("a") == 8
+
+
+def test_queued_solves_split_the_budget_at_admission():
+    scheduler = CoreScheduler(core_budget=8, max_workers_per_solve=8)
+
+    # Three more solves are waiting when the first is admitted
+    assert scheduler.acquire("a", waiting=3) == 2
+    assert scheduler.acquire("b", waiting=2) == 2
+    assert scheduler.acquire("c", waiting=1) == 2
+    assert scheduler.acquire("d") == 2
+    assert scheduler.free == 0
+
+
+def test_allocations_stay_fixed_while_solves_run():
+    scheduler = CoreScheduler(core_budget=8, max_workers_per_solve=8)
+
+    assert scheduler.acquire("a") == 8
+    # Only the minimum is left for a solve arriving while the first runs
+    assert scheduler.acquire("b") == 1
+    assert scheduler.stats()["allocations"] == {"a": 8, "b": 1}
+    assert scheduler.allocated == 9
+
+
+def test_per_solve_cap_leaves_room_for_late_arrivals():
+    scheduler = CoreScheduler(core_budget=8, max_workers_per_solve=4)
+
+    assert scheduler.acquire("a") == 4
+    assert scheduler.acquire("b") == 4
+
+
+def test_released_cores_go_to_the_next_solve():
+    scheduler = CoreScheduler(core_budget=8, max_workers_per_solve=8)
+    scheduler.acquire("a")
+    scheduler.acquire("b")
+
+    scheduler.release("a")
+    assert scheduler.free == 7
+    assert scheduler.acquire("c") == 4  # fair share with b still running
+    scheduler.release("unknown")
+    assert scheduler.stats()["active_solves"] == 2
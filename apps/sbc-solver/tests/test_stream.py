@@ -0,0 +1,62 @@
+"""Solve progress over Server-Sent Events"""
+
+import json
+import pytest
+from fastapi.testclient import TestClient
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from src.main import app
+from tests.helpers import make_request
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Runs the app's lifespan, starting the solver worker pool
+    with TestClient(app) as client:
+        yield client
+
+
+def _events(client, request):
+    """(event, data) pairs of a /solve/stream response"""
+    events = []
+    with client.stream(
+        "POST", "/api/v1/solve/stream", json=request.model_dump(by_alias=True)
+    ) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        for block in response.read().decode().split("\n\n"):
+            if block:
+                event, data = block.split("\n")
+                events.append((event.removeprefix("event: "), json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_reports_the_job_solutions_and_result(client):
+    request = make_request(
+        CORPUS["chemistry_positions"], generate_club(300, seed=7), job_id="stream-test"
+    )
+
+    events = _events(client, request)
+
+    names = [event for event, _ in events]
+    assert names[0] == "job"
+    assert events[0][1] == {"job_id": "stream-test"}
+    assert names[-1] == "result"
+    assert set(names[1:-1]) == {"solution"}
+
+    solutions = [data for event, data in events if event == "solution"]
+    result = events[-1][1]
+    assert result["success"]
+    assert result["job_id"] == "stream-test"
+    # Every solution improves on the previous one, and the last one is the result
+    objectives = [solution["objective"] for solution in solutions]
+    assert objectives == sorted(objectives, reverse=True)
+    assert solutions[-1]["selected_player_ids"] == result["selected_player_ids"]
+
+
+def test_stream_reports_infeasible_requests_as_a_result(client):
+    request = make_request(CORPUS["daily_bronze_upgrade"], generate_club(5, seed=7))
+
+    events = _events(client, request)
+
+    assert [event for event, _ in events] == ["job", "result"]
+    assert events[-1][1]["status"] == "INFEASIBLE"
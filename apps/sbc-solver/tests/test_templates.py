@@ -0,0 +1,107 @@
+"""Compile-once model templates"""
+
+import pytest
+from ortools.sat.python import cp_model
+from benchmarks.corpus import CORPUS
+from benchmarks.generator import generate_club
+from src.solver.constraint_builder import SBCConstraintBuilder
+from src.solver.models import SBCRequirementSet
+from src.solver.objective import selection_cost
+from src.solver.or_tools_solver import SBCSolver
+from src.solver.player_table import PlayerTable
+from src.solver.presolve import reduce_pool
+from src.solver.templates import ModelTemplate, TemplateCache
+from tests.helpers import make_player, make_request
+from tests.test_presolve import FAST_CASES
+
+
+def _template(players) -> ModelTemplate:
+    table = PlayerTable(players)
+    model = cp_model.CpModel()
+    player_vars = SBCConstraintBuilder(model).create_player_variables(len(table))
+    return ModelTemplate(model, player_vars, table)
+
+
+def test_instantiate_fixes_cards_missing_from_the_pool():
+    players = [make_player(i, ovr=60 + i) for i in range(1, 6)]
+    template = _template(players)
+
+    model, player_vars, fixed = template.instantiate(PlayerTable([players[3], players[1]]))
+
+    variables = model.Proto().variables
+    assert [var.Index() for var in player_vars] == [3, 1]
+    assert [list(variables[i].domain) for i in (0, 2, 4)] == [[0, 0]] * 3
+    assert list(variables[1].domain) == [0, 1]
+    assert fixed == 3
+    # The template itself is left untouched
+    assert all(list(v.domain) == [0, 1] for v in template.model.Proto().variables)
+
+
+def test_instantiate_rejects_uncovered_cards():
+    players = [make_player(i) for i in range(1, 4)]
+    template = _template(players)
+
+    assert template.instantiate(PlayerTable([make_player(9, ovr=90)])) is None
+
+
+def test_cache_evicts_least_recently_used():
+    players = [make_player(i) for i in range(1, 3)]
+    table = PlayerTable(players)
+    cache = TemplateCache(max_entries=2)
+
+    for key in ("a", "b"):
+        cache.put(key, _template(players))
+    assert cache.instantiate("a", table) is not None
+    cache.put("c", _template(players))
+
+    assert cache.instantiate("b", table) is None
+    assert cache.instantiate("a", table) is not None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disabled_cache_stores_nothing():
+    players = [make_player(1)]
+    cache = TemplateCache(max_entries=0)
+    cache.put("a", _template(players))
+
+    assert not cache.enabled
+    assert cache.instantiate("a", PlayerTable(players)) is None
+
+
+@pytest.mark.parametrize("case", FAST_CASES)
+def test_templates_keep_objectives_as_cards_are_used_up(case):
+    requirements: SBCRequirementSet = CORPUS[case]
+    players = generate_club(300, seed=3)
+    templates = TemplateCache(max_entries=4, headroom=2)
+    hits = []
+
+    for _ in range(3):
+        # The service sends the pool reduced with the template headroom
+        table = PlayerTable(players)
+        kept = reduce_pool(table, requirements, headroom=2, slot_capacity=False).kept
+        pool = [players[i] for i in kept.tolist()]
+
+        cached = SBCSolver(num_search_workers=4, templates=templates).solve(
+            make_request(requirements, pool)
+        )
+        fresh = SBCSolver(num_search_workers=4).solve(make_request(requirements, pool))
+
+        assert cached.status == fresh.status
+        if not fresh.success:
+            break
+        assert selection_cost(table, cached.selected_player_ids) == selection_cost(
+            table, fresh.selected_player_ids
+        )
+        hits.append(cached.stats.template_hit)
+        # Template cards missing from the pool are reported, not hidden
+        padding = cached.stats.num_variables - fresh.stats.num_variables
+        assert padding >= cached.stats.fixed_variables
+        assert cached.stats.fixed_variables > 0 or not cached.stats.template_hit
+        assert fresh.stats.fixed_variables == 0
+
+        used = set(cached.selected_player_ids)
+        players = [p for p in players if p.id not in used]
+
+    # The first solve builds the template, the next one reuses it
+    if hits:
+        assert hits[:2] == [False, True]
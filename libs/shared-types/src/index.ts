@@ -58,7 +58,13 @@ export type QualityType = 'bronze' | 'silver' | 'gold' | 'special';
 /**
  * Solver status codes
  */
-export type SolverStatus = 'OPTIMAL' | 'FEASIBLE' | 'INFEASIBLE' | 'MODEL_INVALID' | 'TIMEOUT';
+export type SolverStatus =
+  | 'OPTIMAL'
+  | 'FEASIBLE'
+  | 'INFEASIBLE'
+  | 'MODEL_INVALID'
+  | 'TIMEOUT'
+  | 'CANCELLED';
 
 /**
  * League constraint for SBC requirements